@@ -1,31 +1,34 @@
-from langchain_community.tools import DuckDuckGoSearchRun
 from langchain_core.prompts import ChatPromptTemplate, HumanMessagePromptTemplate
-from unittest import result
 from app.core.logger import get_logger
 from fastapi import FastAPI, Body
 from pydantic import BaseModel, Field
 import json
+from functools import cached_property
 from langchain_core.prompts import ChatPromptTemplate, SystemMessagePromptTemplate, HumanMessagePromptTemplate
-from langchain.chat_models import init_chat_model
-from langchain_core.globals import set_debug
 import os
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_perplexity import ChatPerplexity
 from app.ai import output_schema, input_schema, prompt
 from dotenv import load_dotenv
-from app.services.ExecutionAgentService import ExecutionAgentService
+from app.services.ExecutionAgentService import get_execution_agent_service
 from app.api.schemas.mcp_schema import ChatRequest
+from app.core.telemetry import span
+from app.ai.llm import chat_model, web_search
 
 load_dotenv()
-set_debug(True)
 
 class AI():
     def __init__(self):
         # self.model = init_chat_model("gemini-2.5-flash", model_provider="google_genai", temperature=0.1, top_p = 0.5)
-        self.llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash")
-        self.perplexity_llm = ChatPerplexity(temperature=0, model="sonar", timeout=1800)
         self.logger = get_logger(__name__)
 
+    # An AI is created per request; only build the clients an agent actually uses
+    @cached_property
+    def llm(self):
+        return chat_model("gemini-2.5-flash")
+
+    @cached_property
+    def perplexity_llm(self):
+        return chat_model("sonar", provider="perplexity", temperature=0, timeout=1800)
+
     def parse_json_like_content(self, input_text):
         """
         Parse a JSON-like string that may contain code block markers or a `json` prefix.
@@ -46,17 +49,18 @@ class AI():
             input_text = input_text[4:].strip()
 
         # Step 3: Parse the JSON content
-        try:
-            return json.loads(input_text)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON content: {e}")
+        with span("json.parse", chars=len(input_text)):
+            try:
+                return json.loads(input_text)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON content: {e}")
 
 
 
 # {user_prompt} (user's problem description)
 # {history} (list of conversation turns)
     def clarify_agent(self, context: input_schema.ClarifyingContext, user_prompt: str|None ):
-        self.logger.info("Clarify Agent Invoked with context:", extra={"context": context.model_dump()})
+        self.logger.info("Clarify Agent Invoked with context:", extra={"context": context})
         try:
             clarify_prompt = ChatPromptTemplate.from_messages([
                 # SystemMessagePromptTemplate.from_template(prompt.ClarifyingAgentPrompt),
@@ -81,7 +85,7 @@ class AI():
 # {history} (list of conversation turns)
 # {allowed_domains} (list of strings)
     def classify_agent(self, context: input_schema.ClassifyingContext):
-        self.logger.info("Classify Agent Invoked with context:", extra={"context": context.model_dump()})
+        self.logger.info("Classify Agent Invoked with context:", extra={"context": context})
         try:
             classify_prompt = ChatPromptTemplate.from_messages([
                 # SystemMessagePromptTemplate.from_template(prompt.ClarifyingAgentPrompt),
@@ -160,7 +164,7 @@ class AI():
         return result_text
     
     def automation_agent(self, context: input_schema.TaskContext, user_prompt: str|None):
-        self.logger.info("Automation Agent Invoked with context:", extra={"context": context.model_dump()})
+        self.logger.info("Automation Agent Invoked with context:", extra={"context": context})
         try:
             automation_prompt = ChatPromptTemplate.from_messages([
                 HumanMessagePromptTemplate.from_template(prompt.AutomationAgentPrompt)
@@ -186,7 +190,7 @@ class AI():
         return result_text
     
     def clarify_automation_agent(self, context: input_schema.TaskClarificationContext, user_prompt: str|None):
-        self.logger.info("Clarify Automation Agent Invoked with context:", extra={"context": context.model_dump()})
+        self.logger.info("Clarify Automation Agent Invoked with context:", extra={"context": context})
         try:
             clarify_automation_prompt = ChatPromptTemplate.from_messages([
                 HumanMessagePromptTemplate.from_template(prompt.ClarifyAutomationAgentPrompt)
@@ -209,13 +213,13 @@ class AI():
         return result_text
     
     async def execution_agent(self, context: input_schema.ExecutionContext, user_prompt: str|None):
-        agent_service = ExecutionAgentService()
+        agent_service = get_execution_agent_service()
         response = await agent_service.run_agent(context, user_prompt)
         return response
 
     
     def user_memory_agent(self, context: input_schema.UserMemoryContext, user_prompt: str|None):
-        self.logger.info("User Memory Agent Invoked with context:", extra={"context": context.model_dump()})
+        self.logger.info("User Memory Agent Invoked with context:", extra={"context": context})
         try:
             kb_prompt = ChatPromptTemplate.from_messages([
                 HumanMessagePromptTemplate.from_template(prompt.UserMemoryAgentPrompt)
@@ -239,7 +243,7 @@ class AI():
         return validated
     
     def venting_agent(self, context: input_schema.VentingContext, user_prompt: str|None):
-        self.logger.info("Venting Agent Invoked with context:", extra={"context": context.model_dump()})
+        self.logger.info("Venting Agent Invoked with context:", extra={"context": context})
         try:
             venting_prompt = ChatPromptTemplate.from_messages([
                 HumanMessagePromptTemplate.from_template(prompt.VentingAgentPrompt)
@@ -360,7 +364,7 @@ class AI():
         ExpanderAgentOutput.
         """
 
-        self.logger.info("Expander Agent Invoked", extra={"context": context.model_dump(), "user_prompt": user_prompt})
+        self.logger.info("Expander Agent Invoked", extra={"context": context, "user_prompt": user_prompt})
         try:
             # Prepare dynamic search queries based on task name/description and user prompt
             queries = []
@@ -380,7 +384,7 @@ class AI():
                     unique_queries.append(qn)
             unique_queries = unique_queries[:4]
 
-            search_tool = DuckDuckGoSearchRun()
+            search_tool = web_search()
             search_results = []
             for q in unique_queries:
                 try:
@@ -0,0 +1,208 @@
+"""
+LangChain callback that turns LLM calls, prompt rendering and agent tool
+calls into telemetry spans, with token counts from the model's usage metadata.
+Token counts also feed the per-agent/model/user usage ledger.
+
+`install_llm_tracing()` registers the handler as a global LangChain configure
+hook, so every chain, chat model and MCP agent picks it up without passing
+callbacks around.
+
+`DebugCallbackHandler` replaces LangChain's global `set_debug(True)`: it logs
+every chain, model and tool step (inputs, outputs, errors) to the structured
+logger, but only for runs inside `llm_debug()`, e.g. one sampled or
+header-selected request.
+"""
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.tracers.context import register_configure_hook
+
+from app.core.telemetry import Span, current_span, record_tokens, start_span
+from app.services.usage_service import usage_ledger
+
+
+def _model_name(serialized: Optional[dict], kwargs: dict) -> str:
+    params = kwargs.get("invocation_params") or {}
+    name = params.get("model") or params.get("model_name")
+    if not name and serialized:
+        name = (serialized.get("kwargs") or {}).get("model") or (serialized.get("id") or ["unknown"])[-1]
+    return str(name or "unknown")
+
+
+def _usage(response: LLMResult) -> tuple[int, int]:
+    """Sum input/output tokens from message usage_metadata (or provider llm_output)."""
+    input_tokens = output_tokens = 0
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+            input_tokens += usage.get("input_tokens", 0)
+            output_tokens += usage.get("output_tokens", 0)
+    if not (input_tokens or output_tokens) and response.llm_output:
+        usage = response.llm_output.get("token_usage") or response.llm_output.get("usage_metadata") or {}
+        input_tokens = usage.get("prompt_tokens", usage.get("input_tokens", 0))
+        output_tokens = usage.get("completion_tokens", usage.get("output_tokens", 0))
+    return input_tokens, output_tokens
+
+
+class TelemetryCallbackHandler(BaseCallbackHandler):
+    """Open a span per LLM/prompt/tool run and close it when the run ends."""
+
+    # Run in the caller's context so spans nest under the current request span
+    run_inline = True
+
+    def __init__(self):
+        self._spans: dict[UUID, Span] = {}
+
+    def _start(self, run_id: UUID, name: str, attributes: dict) -> None:
+        self._spans[run_id] = start_span(name, attributes)
+
+    def _end(self, run_id: UUID, error: Optional[BaseException] = None) -> Optional[Span]:
+        current = self._spans.pop(run_id, None)
+        if current is not None:
+            current.end(error=error)
+        return current
+
+    def on_chat_model_start(self, serialized: dict, messages: list, *, run_id: UUID, **kwargs: Any) -> None:
+        self._start(run_id, "llm.call", {"model": _model_name(serialized, kwargs)})
+
+    def on_llm_start(self, serialized: dict, prompts: list[str], *, run_id: UUID, **kwargs: Any) -> None:
+        self._start(run_id, "llm.call", {"model": _model_name(serialized, kwargs)})
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        current = self._spans.get(run_id)
+        if current is not None:
+            input_tokens, output_tokens = _usage(response)
+            current.set_attribute("llm.input_tokens", input_tokens)
+            current.set_attribute("llm.output_tokens", output_tokens)
+            model = current.attributes.get("model", "unknown")
+            record_tokens(model, input_tokens, output_tokens)
+            usage_ledger.record(model, input_tokens, output_tokens)
+        self._end(run_id)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error)
+
+    def on_chain_start(self, serialized: Optional[dict], inputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        name = kwargs.get("name") or ((serialized or {}).get("id") or [""])[-1]
+        if name.endswith("PromptTemplate"):
+            self._start(run_id, "prompt.render", {"template": name})
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error)
+
+    def on_tool_start(self, serialized: dict, input_str: str, *, run_id: UUID, **kwargs: Any) -> None:
+        self._start(run_id, "agent.tool", {"tool": kwargs.get("name") or (serialized or {}).get("name", "unknown")})
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error)
+
+
+class DebugCallbackHandler(BaseCallbackHandler):
+    """
+    Log each LangChain step to `app.ai.debug` with its payload as `extra=` fields.
+
+    Payloads are passed as-is; the log writer thread serializes, redacts and
+    size-caps them, so the request only pays for enqueueing the records.
+    """
+
+    run_inline = True
+
+    def __init__(self, reason: str = "debug"):
+        self.reason = reason
+        self.logger = logging.getLogger("app.ai.debug")
+
+    def _log(self, event: str, run_id: UUID, parent_run_id: Optional[UUID], level: int = logging.INFO,
+             **payload: Any) -> None:
+        current = current_span()
+        self.logger.log(level, f"🪲 {event}", extra={
+            "run_id": str(run_id),
+            "parent_run_id": str(parent_run_id) if parent_run_id else None,
+            "trace_id": current.trace_id if current is not None else None,
+            "debug_reason": self.reason,
+            **payload,
+        })
+
+    def on_chain_start(self, serialized: Optional[dict], inputs: Any, *, run_id: UUID,
+                       parent_run_id: Optional[UUID] = None, **kwargs: Any) -> None:
+        name = kwargs.get("name") or ((serialized or {}).get("id") or ["chain"])[-1]
+        self._log(f"chain start: {name}", run_id, parent_run_id, inputs=inputs)
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, parent_run_id: Optional[UUID] = None,
+                     **kwargs: Any) -> None:
+        self._log("chain end", run_id, parent_run_id, outputs=outputs)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, parent_run_id: Optional[UUID] = None,
+                       **kwargs: Any) -> None:
+        self._log(f"chain error: {error!r}", run_id, parent_run_id, logging.WARNING)
+
+    def on_chat_model_start(self, serialized: dict, messages: list, *, run_id: UUID,
+                            parent_run_id: Optional[UUID] = None, **kwargs: Any) -> None:
+        self._log(f"llm start: {_model_name(serialized, kwargs)}", run_id, parent_run_id, messages=messages)
+
+    def on_llm_start(self, serialized: dict, prompts: list[str], *, run_id: UUID,
+                     parent_run_id: Optional[UUID] = None, **kwargs: Any) -> None:
+        self._log(f"llm start: {_model_name(serialized, kwargs)}", run_id, parent_run_id, prompts=prompts)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, parent_run_id: Optional[UUID] = None,
+                   **kwargs: Any) -> None:
+        self._log("llm end", run_id, parent_run_id, generations=response.generations,
+                  llm_output=response.llm_output)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, parent_run_id: Optional[UUID] = None,
+                     **kwargs: Any) -> None:
+        self._log(f"llm error: {error!r}", run_id, parent_run_id, logging.WARNING)
+
+    def on_tool_start(self, serialized: dict, input_str: str, *, run_id: UUID,
+                      parent_run_id: Optional[UUID] = None, **kwargs: Any) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name", "unknown")
+        self._log(f"tool start: {name}", run_id, parent_run_id, tool_input=input_str)
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, parent_run_id: Optional[UUID] = None,
+                    **kwargs: Any) -> None:
+        self._log("tool end", run_id, parent_run_id, tool_output=output)
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, parent_run_id: Optional[UUID] = None,
+                      **kwargs: Any) -> None:
+        self._log(f"tool error: {error!r}", run_id, parent_run_id, logging.WARNING)
+
+
+# A context-var default (rather than .set()) makes the handler visible in every task and thread
+_telemetry_handler: ContextVar[Optional[TelemetryCallbackHandler]] = ContextVar(
+    "telemetry_handler", default=TelemetryCallbackHandler()
+)
+# Unset by default: debug logging costs nothing unless a request opts in
+_debug_handler: ContextVar[Optional[DebugCallbackHandler]] = ContextVar("debug_handler", default=None)
+_installed = False
+
+
+@contextmanager
+def llm_debug(reason: str = "debug") -> Iterator[DebugCallbackHandler]:
+    """Log every LangChain step run inside this block (and tasks started from it)."""
+    handler = DebugCallbackHandler(reason)
+    token = _debug_handler.set(handler)
+    try:
+        yield handler
+    finally:
+        _debug_handler.reset(token)
+
+
+def install_llm_tracing() -> None:
+    """Attach the telemetry handler (and, inside `llm_debug()`, the debug handler) to every LangChain run."""
+    global _installed
+    if _installed:
+        return
+    register_configure_hook(_telemetry_handler, inheritable=True)
+    register_configure_hook(_debug_handler, inheritable=True)
+    _installed = True
@@ -0,0 +1,111 @@
+"""
+Deterministic stand-ins for the LLMs and web search, selected with FAKE_LLM=true
+(see `app.ai.llm`). They sleep for a sampled latency and never touch the network,
+so the service can be load tested offline.
+"""
+
+import asyncio
+import itertools
+import json
+import random
+import time
+from typing import Any, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import RunnableLambda
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import ConfigDict, PrivateAttr
+
+from app.core.fakes import Latency, sample_value
+
+# Free-form answer: shaped like the expander's output, so the expander endpoint
+# exercises both direct dispatch (slack) and the MCP agent (google-docs)
+DEFAULT_RESPONSE = json.dumps([
+    {"toolType": "slack", "response": {"channel": "#status", "message": "Weekly dashboard is ready."}},
+    {"toolType": "google-docs", "response": {"title": "Weekly status", "contents": "KPIs and blockers"}},
+])
+# Tools the fake agent prefers to call, by name prefix
+PREFERRED_TOOL_PREFIXES = ("create-", "send-", "update-")
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _pick_tool(tools: list[dict]) -> dict:
+    functions = [tool["function"] for tool in tools]
+    return next((f for f in functions if f["name"].startswith(PREFERRED_TOOL_PREFIXES)), functions[0])
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Chat model returning schema-valid structured output, a canned free-form
+    answer, or (when tools are bound) one tool call followed by a final answer.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    model: str = "fake-chat"
+    latency: Latency = Latency("0")
+    response_text: str = DEFAULT_RESPONSE
+    seed: int = 0
+    _rng: random.Random = PrivateAttr(default=None)
+    _call_ids: Any = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        self._rng = random.Random(self.seed)
+        self._call_ids = itertools.count(1)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"model": self.model}
+
+    def _message(self, messages: list[BaseMessage], tools: Optional[list[dict]]) -> AIMessage:
+        prompt = "".join(str(m.content) for m in messages)
+        if tools and not isinstance(messages[-1], ToolMessage):
+            function = _pick_tool(tools)
+            arguments = sample_value(function.get("parameters") or {"type": "object"}, self._rng)
+            call = {"name": function["name"], "args": arguments, "id": f"call_{next(self._call_ids)}"}
+            content, tool_calls = "", [call]
+        else:
+            content, tool_calls = self.response_text, []
+        input_tokens = _estimate_tokens(prompt)
+        output_tokens = _estimate_tokens(content or json.dumps(tool_calls))
+        return AIMessage(
+            content=content,
+            tool_calls=tool_calls,
+            usage_metadata={"input_tokens": input_tokens, "output_tokens": output_tokens,
+                            "total_tokens": input_tokens + output_tokens},
+        )
+
+    def _generate(self, messages: list[BaseMessage], stop: Optional[list[str]] = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        time.sleep(self.latency.sample())
+        return ChatResult(generations=[ChatGeneration(message=self._message(messages, kwargs.get("tools")))])
+
+    async def _agenerate(self, messages: list[BaseMessage], stop: Optional[list[str]] = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self.latency.sample())
+        return ChatResult(generations=[ChatGeneration(message=self._message(messages, kwargs.get("tools")))])
+
+    def bind_tools(self, tools: list, *, tool_choice: Any = None, **kwargs: Any):
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+
+    def with_structured_output(self, schema: Any, **kwargs: Any):
+        # The model call still runs (latency, callbacks, token usage); the output is sampled from the schema
+        return self | RunnableLambda(lambda _message: sample_value(schema, self._rng))
+
+
+class FakeSearch:
+    """Drop-in for DuckDuckGoSearchRun."""
+
+    def __init__(self, latency: Latency):
+        self.latency = latency
+
+    def run(self, query: str) -> str:
+        time.sleep(self.latency.sample())
+        return f"Snippets about {query}."
@@ -1,9 +1,6 @@
-from token import OP
 from pydantic import BaseModel, Field
 import json
 from typing import Any, Dict, List, Optional, Union, Literal
-from regex import T
-from sqlalchemy import Enum
 from pydantic import BaseModel, Field, field_validator 
 
 AllowedDomains = ["finance", "personal", "professional"]
@@ -0,0 +1,46 @@
+"""
+Factories for the chat models and web search used across the service.
+
+With FAKE_LLM=true they return the offline stand-ins from `app.ai.fake_llm`
+instead of Gemini/Perplexity and DuckDuckGo, e.g. for load testing.
+
+Provider packages are imported on first use: importing this module (and so
+the app) does not load google-genai, Perplexity or langchain_community.
+"""
+
+import itertools
+
+from langchain_core.language_models import BaseChatModel
+
+from app.core.config import settings
+from app.core.fakes import Latency
+
+# Each fake gets its own seed so runs are reproducible but instances differ
+_fake_seeds = itertools.count()
+
+
+def chat_model(model: str = "gemini-2.5-flash", provider: str = "google", **kwargs) -> BaseChatModel:
+    """Create a chat model; `provider` is "google" (Gemini) or "perplexity"."""
+    if settings.FAKE_LLM:
+        from app.ai.fake_llm import FakeChatModel
+
+        seed = next(_fake_seeds)
+        return FakeChatModel(model=model, latency=Latency(settings.FAKE_LLM_LATENCY, seed), seed=seed)
+    if provider == "perplexity":
+        from langchain_perplexity import ChatPerplexity
+
+        return ChatPerplexity(model=model, **kwargs)
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    return ChatGoogleGenerativeAI(model=model, **kwargs)
+
+
+def web_search():
+    """Create the web search tool used by the expander agent."""
+    if settings.FAKE_LLM:
+        from app.ai.fake_llm import FakeSearch
+
+        return FakeSearch(Latency(settings.FAKE_SEARCH_LATENCY, next(_fake_seeds)))
+    from langchain_community.tools import DuckDuckGoSearchRun
+
+    return DuckDuckGoSearchRun()
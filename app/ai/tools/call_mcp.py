@@ -1,5 +1,5 @@
 from openai import chat
-from app.services.ExecutionAgentService import ExecutionAgentService
+from app.services.ExecutionAgentService import get_execution_agent_service
 from app.core.logger import get_logger
 from langchain.tools import tool
 from app.api.schemas.mcp_schema import ChatRequest
@@ -13,6 +13,6 @@ def call_mcp_tool(llm, prompt: ChatRequest):
     """
     Call MCP tool using the ExecutionAgentService.
     """
-    agent_service = ExecutionAgentService()
+    agent_service = get_execution_agent_service()
     response =  agent_service.run_agent(prompt)
     return response
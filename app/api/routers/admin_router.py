@@ -0,0 +1,68 @@
+import asyncio
+import secrets
+import time
+from pathlib import Path
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import FileResponse
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.profiler import DEFAULT_INTERVAL, PROFILE_FORMATS, SamplingProfiler
+
+logger = get_logger(__name__)
+
+# One process-wide profile at a time (including X-Profile requests); overlapping samplers would skew each other
+profile_lock = asyncio.Lock()
+
+
+def is_admin(token: Optional[str]) -> bool:
+    """Admin endpoints are disabled unless ADMIN_TOKEN is set."""
+    # Compare bytes: compare_digest raises TypeError on non-ASCII str
+    return bool(settings.ADMIN_TOKEN) and token is not None and secrets.compare_digest(
+        token.encode(), settings.ADMIN_TOKEN.encode()
+    )
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(default=None)):
+    if not is_admin(x_admin_token):
+        raise HTTPException(status_code=403, detail="Admin token required.")
+
+
+def profile_name(prefix: str) -> str:
+    return f"{prefix}-{time.strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(3)}"
+
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+@router.post("/profile")
+async def profile(seconds: float = 10.0, interval_ms: float = DEFAULT_INTERVAL * 1000,
+                  format: str = "speedscope", include_idle: bool = False):
+    """
+    Sample every thread's stack for `seconds` and write a speedscope or
+    collapsed-stack file under PROFILE_DIR. Returns the file name and where
+    time went by app package (app.ai, app.services, app.mcp, ...).
+    """
+    if format not in PROFILE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {list(PROFILE_FORMATS)}")
+    if not 0 < seconds <= settings.PROFILE_MAX_SECONDS:
+        raise HTTPException(status_code=400, detail=f"seconds must be in (0, {settings.PROFILE_MAX_SECONDS}]")
+    if profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already running.")
+    async with profile_lock:
+        logger.info(f"🔬 Profiling process for {seconds:.1f}s")
+        profiler = SamplingProfiler(interval=max(interval_ms, 1.0) / 1000, include_idle=include_idle)
+        await asyncio.to_thread(profiler.run, seconds)
+        path = await asyncio.to_thread(profiler.write, Path(settings.PROFILE_DIR), profile_name("process"), format)
+    return {"file": path.name, "download": f"/admin/profiles/{path.name}", **profiler.summary()}
+
+
+@router.get("/profiles/{name}")
+async def download_profile(name: str):
+    directory = Path(settings.PROFILE_DIR).resolve()
+    path = (directory / name).resolve()
+    if path.parent != directory or not path.is_file():
+        raise HTTPException(status_code=404, detail="Profile not found.")
+    return FileResponse(path, filename=name)
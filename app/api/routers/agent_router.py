@@ -1,21 +1,15 @@
-from fastapi import APIRouter
-from app.services.ExecutionAgentService import ExecutionAgentService
+from fastapi import APIRouter, Depends
+from app.services.ExecutionAgentService import get_execution_agent_service
 from app.core.logger import get_logger
 from app.api.schemas.agent_schema import AgentMessage
 from app.api.schemas.mcp_schema import ExpanderResponseSchema
-from langchain_google_genai import ChatGoogleGenerativeAI
 
 from app.services.ExpanderAgentService import run_expander_agent
+from app.api.tracing import TracedRoute
+from app.api.routers.usage_router import track_caller
 
-llm = ChatGoogleGenerativeAI(
-                model="gemini-2.5-flash",
-                temperature=0,
-                max_tokens=None,
-                timeout=300,
-            )
-
-router = APIRouter()
-agent_service = ExecutionAgentService()
+router = APIRouter(route_class=TracedRoute, dependencies=[Depends(track_caller)])
+agent_service = get_execution_agent_service()
 logger = get_logger(__name__)
 
 
@@ -42,12 +36,12 @@ async def expander_agent(payload: AgentMessage):
         tasks = payload.tasks
         output = []
         for task in tasks:
-            logger.info(f"Task: {task}")
+            logger.info("Expander task", extra={"task": task})
             response, userPrompt = await run_expander_agent(str(task))
             # response can be a list or dict
             if isinstance(response, list):
                 for item in response:
-                    logger.info(f"Expander Agent response list: {item}")
+                    logger.info("Expander Agent response list item", extra={"item": item})
                     if isinstance(item, dict):
                         print("check the type", item.get("toolType"))
                         if item.get("toolType") == "none":
@@ -64,7 +58,7 @@ async def expander_agent(payload: AgentMessage):
                                 toolType=raw_tool,
                             )
                         except Exception as e:
-                            logger.error(f"Invalid expander item schema: {e}; item: {item}")
+                            logger.error(f"Invalid expander item schema: {e}", extra={"item": item})
                             output.append({"error": "Invalid expander item schema", "details": str(e), "item": item})
                             continue
                         executionAgent = await agent_service.run_agent(messageRequest=expander_item, userprompt=userPrompt)
@@ -73,7 +67,7 @@ async def expander_agent(payload: AgentMessage):
                         logger.error(f"Unexpected item type inside list: {type(item)}")
                         output.append({"error": "Unexpected item type from expander agent list", "itemType": str(type(item))})
             elif isinstance(response, dict):
-                logger.info(f"Expander Agent response dict: {response}")
+                logger.info("Expander Agent response dict", extra={"response": response})
                 print("check the type", response.get("toolType"))
                 if response.get("toolType") == "none":
                     output.append(response)
@@ -89,7 +83,7 @@ async def expander_agent(payload: AgentMessage):
                             toolType=raw_tool,
                         )
                     except Exception as e:
-                        logger.error(f"Invalid expander response schema: {e}; response: {response}")
+                        logger.error(f"Invalid expander response schema: {e}", extra={"response": response})
                         output.append({"error": "Invalid expander response schema", "details": str(e), "item": response})
                         continue
                     executionAgent = await agent_service.run_agent(messageRequest=expander_item, userprompt=userPrompt)
@@ -1,12 +1,16 @@
-from fastapi import APIRouter, Body, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException
 from typing import List
 from app.core.logger import get_logger
 from app.ai import input_schema as schema
 from app.ai.ai import AI
+from app.api.tracing import TracedRoute
+from app.api.routers.usage_router import track_caller
+from app.core.telemetry import annotate
+from app.services.usage_service import tag_usage
 
 logger = get_logger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=TracedRoute, dependencies=[Depends(track_caller)])
 @router.post("/invoke")
 async def ai(request: schema.AnyAgentRequest = Body(..., discriminator='agent_name')):
     """
@@ -15,9 +19,11 @@ async def ai(request: schema.AnyAgentRequest = Body(..., discriminator='agent_na
     the AI output against the corresponding response model before returning.
     """
     ai_instance = AI()
-    logger.info(f"🤣Received request for agent: {request.agent_name}", extra={"request": request.model_dump()})
+    logger.info(f"🤣Received request for agent: {request.agent_name}", extra={"request": request})
     
     agent_name = request.agent_name
+    annotate(agent=agent_name)
+    tag_usage(agent=agent_name)
     context = request.context
     user_prompt = request.user_prompt
     
@@ -29,7 +35,7 @@ async def ai(request: schema.AnyAgentRequest = Body(..., discriminator='agent_na
                 context=context,  # type: ignore[arg-type]
                 user_prompt=user_prompt,
             )
-            logger.info(f"Clarifying agent result: {result}")
+            logger.info("Clarifying agent result", extra={"result": result})
             return result
             # Validate AI output against response model
             
@@ -40,7 +46,7 @@ async def ai(request: schema.AnyAgentRequest = Body(..., discriminator='agent_na
             result = ai_instance.classify_agent(
                 context=context,  # type: ignore[arg-type]
             )
-            logger.info(f"Classifying agent result: {result}")
+            logger.info("Classifying agent result", extra={"result": result})
             return result
 
         elif agent_name == "domain":
@@ -48,7 +54,7 @@ async def ai(request: schema.AnyAgentRequest = Body(..., discriminator='agent_na
                 context=context,  # type: ignore[arg-type]
                 user_prompt=user_prompt,
             )
-            logger.info(f"Domain agent result: {result}")
+            logger.info("Domain agent result", extra={"result": result})
             return result
 
         elif agent_name == "tasks":
@@ -56,7 +62,7 @@ async def ai(request: schema.AnyAgentRequest = Body(..., discriminator='agent_na
                 context=context,  # type: ignore[arg-type]
                 user_prompt=user_prompt,
             )
-            logger.info(f"Tasks agent result: {result}")
+            logger.info("Tasks agent result", extra={"result": result})
             return result
         
         elif agent_name == "automation":
@@ -64,7 +70,7 @@ async def ai(request: schema.AnyAgentRequest = Body(..., discriminator='agent_na
                 context=context,  # type: ignore[arg-type]
                 user_prompt=user_prompt,
             )
-            logger.info(f"Automation agent result: {result}")
+            logger.info("Automation agent result", extra={"result": result})
             return result
         
         elif agent_name == "clarify_automation":
@@ -72,7 +78,7 @@ async def ai(request: schema.AnyAgentRequest = Body(..., discriminator='agent_na
                 context=context,  # type: ignore[arg-type]
                 user_prompt=user_prompt,
             )
-            logger.info(f"Clarify Automation agent result: {result}")
+            logger.info("Clarify Automation agent result", extra={"result": result})
             return result
 
         elif agent_name == "user_memory":
@@ -80,7 +86,7 @@ async def ai(request: schema.AnyAgentRequest = Body(..., discriminator='agent_na
                 context=context,  # type: ignore[arg-type]
                 user_prompt=user_prompt,
             )
-            logger.info(f"Knowledge Base agent result: {result}")
+            logger.info("Knowledge Base agent result", extra={"result": result})
             return result
         
         elif agent_name == "venting":
@@ -88,7 +94,7 @@ async def ai(request: schema.AnyAgentRequest = Body(..., discriminator='agent_na
                 context=context,  # type: ignore[arg-type]
                 user_prompt=user_prompt,
             )
-            logger.info(f"Venting agent result: {result}")
+            logger.info("Venting agent result", extra={"result": result})
             return result
         
         elif agent_name == "execution":
@@ -96,7 +102,7 @@ async def ai(request: schema.AnyAgentRequest = Body(..., discriminator='agent_na
                 context=context,  # type: ignore[arg-type]
                 user_prompt=user_prompt,
             )
-            logger.info(f"Execution agent result: {result}")
+            logger.info("Execution agent result", extra={"result": result})
             return result
 
         elif agent_name == "problem_space":
@@ -104,7 +110,7 @@ async def ai(request: schema.AnyAgentRequest = Body(..., discriminator='agent_na
                 classify_context=context,  # type: ignore[arg-type]
                 user_prompt=user_prompt,
             )
-            logger.info(f"Problem Space agent result: {result}")
+            logger.info("Problem Space agent result", extra={"result": result})
             return result
 
         elif agent_name == "expander":
@@ -112,7 +118,7 @@ async def ai(request: schema.AnyAgentRequest = Body(..., discriminator='agent_na
                 context=context,  # type: ignore[arg-type]
                 user_prompt=user_prompt,
             )
-            logger.info(f"Expander agent result: {result}")
+            logger.info("Expander agent result", extra={"result": result})
             return result
 
         else:
@@ -0,0 +1,55 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+
+from app.api.routers.admin_router import require_admin
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.services.usage_service import ANONYMOUS_USER, GROUP_FIELDS, tag_usage, usage_ledger
+
+logger = get_logger(__name__)
+
+router = APIRouter()
+
+
+async def track_caller(x_user_id: Optional[str] = Header(default=None)):
+    """
+    Attribute this request's LLM usage to the caller (X-User-Id header) and
+    reject callers that have spent their daily budget.
+
+    Must stay async: FastAPI runs sync dependencies in a thread, where the
+    usage tags would not reach the endpoint.
+    """
+    user = x_user_id or ANONYMOUS_USER
+    tag_usage(user=user)
+    budget = settings.USER_DAILY_BUDGET_USD
+    if budget > 0:
+        spent = usage_ledger.spent_today(user)
+        if spent >= budget:
+            logger.warning(f"💸 User {user} is over the daily LLM budget ({spent:.4f} >= {budget:.4f} USD)")
+            raise HTTPException(status_code=429, detail="Daily LLM budget exceeded.")
+
+
+@router.get("/", dependencies=[Depends(require_admin)])
+async def usage(
+    group_by: List[str] = Query(default=list(GROUP_FIELDS)),
+    user: Optional[str] = None,
+):
+    """
+    LLM token usage and estimated cost since the service started, grouped by
+    any of agent/model/user. Older usage is in the usage table.
+    """
+    invalid = [field for field in group_by if field not in GROUP_FIELDS]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Invalid group_by fields: {invalid}; use {list(GROUP_FIELDS)}")
+    groups = usage_ledger.summary(group_by, user=user)
+    return {
+        "since": usage_ledger.started_at.isoformat(),
+        "groups": groups,
+        "total": {
+            "calls": sum(g["calls"] for g in groups),
+            "input_tokens": sum(g["input_tokens"] for g in groups),
+            "output_tokens": sum(g["output_tokens"] for g in groups),
+            "cost_usd": round(sum(g["cost_usd"] for g in groups), 6),
+        },
+    }
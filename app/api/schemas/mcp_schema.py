@@ -115,10 +115,15 @@ class SSEEvent(BaseModel):
 # --- HTTP Response Schemas ---
 class HealthCheckResponse(BaseModel):
     """Schema for health check endpoint response."""
-    status: Literal["healthy"] = "healthy"
+    status: Literal["healthy", "degraded"] = "healthy"
     app_name: str
     version: str = "1.0.0"
     mcp_status: Literal["connected", "disconnected", "error"] = "connected"
+    mcp_servers: Dict[str, Literal["connected", "disconnected", "error"]] = Field(
+        default_factory=dict,
+        description="Per-server session state; 'disconnected' servers start on first use",
+    )
+    mcp_errors: Dict[str, str] = Field(default_factory=dict, description="Last startup error per failed server")
 
 class ErrorResponse(BaseModel):
     """Schema for error responses."""
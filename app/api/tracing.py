@@ -0,0 +1,62 @@
+import functools
+import inspect
+import time
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from app.core.telemetry import span, start_span
+
+# Set by the route handler; the wrapped endpoint records when it was entered
+_endpoint_entered: ContextVar[Optional[dict]] = ContextVar("endpoint_entered", default=None)
+
+
+def _mark_entered() -> None:
+    marker = _endpoint_entered.get()
+    if marker is not None:
+        marker["at"] = time.time_ns()
+
+
+class TracedRoute(APIRoute):
+    """APIRoute that splits request handling into validation and endpoint spans.
+
+    "request.validation" covers reading the body, parsing and dependency
+    resolution (everything before the endpoint function runs); "endpoint"
+    covers the endpoint function itself.
+    """
+
+    def get_route_handler(self) -> Callable:
+        route = self.path
+        endpoint = self.dependant.call
+        if not getattr(endpoint, "_traced_endpoint", False):
+            if inspect.iscoroutinefunction(endpoint):
+                @functools.wraps(endpoint)
+                async def traced_endpoint(*args, **kwargs):
+                    _mark_entered()
+                    with span("endpoint", route=route):
+                        return await endpoint(*args, **kwargs)
+            else:
+                @functools.wraps(endpoint)
+                def traced_endpoint(*args, **kwargs):
+                    _mark_entered()
+                    with span("endpoint", route=route):
+                        return endpoint(*args, **kwargs)
+            traced_endpoint._traced_endpoint = True
+            self.dependant.call = traced_endpoint
+
+        handler = super().get_route_handler()
+
+        async def traced_handler(request: Request) -> Response:
+            started = time.time_ns()
+            marker: dict = {}
+            token = _endpoint_entered.set(marker)
+            try:
+                return await handler(request)
+            finally:
+                _endpoint_entered.reset(token)
+                # Without an entry mark the request failed validation before reaching the endpoint
+                start_span("request.validation", {"route": route}, start_ns=started).end(end_ns=marker.get("at"))
+
+        return traced_handler
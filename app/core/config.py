@@ -5,6 +5,39 @@ from functools import lru_cache
 class Settings(BaseSettings):
     GOOGLE_API_KEY: str
     mcp_config_path: str = "app/mcp/config/mcp_config.json"
+    # Seconds to wait for one MCP server to start (a server's "startupTimeout" in the config wins)
+    MCP_SESSION_TIMEOUT: float = 30.0
+    # After a server fails to start, requests fail fast for this long before a retry; doubles per failure
+    MCP_RETRY_BACKOFF: float = 5.0
+    MCP_RETRY_BACKOFF_MAX: float = 300.0
+    # Comma-separated servers to start at boot; "*" starts all, others start on first use
+    MCP_EAGER_SERVERS: str = "*"
+    # Call the MCP tool directly when the expander payload fully specifies it
+    MCP_DIRECT_DISPATCH: bool = True
+    # LLM usage accounting: seconds between batched flushes to USAGE_TABLE
+    USAGE_FLUSH_INTERVAL: float = 60.0
+    USAGE_TABLE: str = "llm_usage"
+    # Daily (UTC) LLM spend allowed per caller in USD; 0 disables the check
+    USER_DAILY_BUDGET_USD: float = 0.0
+    # Event-loop watchdog: log the stack of anything blocking the loop longer than the threshold (seconds)
+    LOOP_WATCHDOG: bool = False
+    LOOP_WATCHDOG_THRESHOLD: float = 0.1
+    LOOP_WATCHDOG_INTERVAL: float = 0.02
+    # LangChain step-by-step debug logging (app.ai.debug): always, for a sampled fraction of
+    # requests, or per request with "X-LLM-Debug: 1" plus X-Admin-Token
+    LLM_DEBUG: bool = False
+    LLM_DEBUG_SAMPLE_RATE: float = 0.0
+    # Admin endpoints (/admin/*, X-Profile and X-LLM-Debug headers) require X-Admin-Token; disabled while empty
+    ADMIN_TOKEN: str = ""
+    PROFILE_DIR: str = "app/logs/profiles"
+    PROFILE_MAX_SECONDS: float = 60.0
+    # Offline stand-ins for load testing (app/ai/fake_llm.py, app/mcp/fake_mcp).
+    # Latencies are distributions such as "0.2", "uniform:0.1,0.5" or "lognormal:0.8,0.4" (seconds)
+    FAKE_LLM: bool = False
+    FAKE_LLM_LATENCY: str = "0"
+    FAKE_SEARCH_LATENCY: str = "0"
+    FAKE_MCP: bool = False
+    FAKE_MCP_LATENCY: str = "0"
     PPLX_API_KEY: str
     GOOGLE_CREDENTIALS_PATH: str
     GOOGLE_TOKEN_PATH: str
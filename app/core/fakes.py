@@ -0,0 +1,101 @@
+"""
+Building blocks for the load-testing stand-ins (`app.ai.fake_llm`,
+`app.mcp.fake_mcp`): latency distributions and schema-valid sample data.
+"""
+
+import math
+import random
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+
+class Latency:
+    """
+    Latency distribution parsed from a spec string:
+
+        "0.2"                     fixed 200 ms
+        "uniform:0.1,0.5"         uniform between 100 and 500 ms
+        "normal:0.3,0.05"         normal (mean, stddev), clipped at 0
+        "lognormal:0.8,0.4"       lognormal with the given median and sigma
+        "exp:0.25"                exponential with the given mean
+    """
+
+    def __init__(self, spec: str = "0", seed: Optional[int] = None):
+        self.spec = spec
+        kind, _, params = spec.partition(":")
+        if not params:
+            kind, params = "fixed", kind
+        self.kind = kind
+        self.params = [float(p) for p in params.split(",") if p.strip()]
+        self._rng = random.Random(seed)
+        if self.kind not in {"fixed", "uniform", "normal", "lognormal", "exp"}:
+            raise ValueError(f"Unknown latency distribution: {spec}")
+
+    def sample(self) -> float:
+        p = self.params
+        if self.kind == "fixed":
+            return p[0] if p else 0.0
+        if self.kind == "uniform":
+            return self._rng.uniform(p[0], p[1])
+        if self.kind == "normal":
+            return max(0.0, self._rng.gauss(p[0], p[1]))
+        if self.kind == "lognormal":
+            return self._rng.lognormvariate(math.log(p[0]), p[1])
+        return self._rng.expovariate(1.0 / p[0])
+
+    def __repr__(self) -> str:
+        return f"Latency({self.spec!r})"
+
+
+# --- Schema-valid sample data for structured output ---
+
+def _sample(schema: dict, defs: dict, rng: random.Random, name: str, depth: int) -> Any:
+    if "$ref" in schema:
+        return _sample(defs[schema["$ref"].rsplit("/", 1)[-1]], defs, rng, name, depth)
+    if "const" in schema:
+        return schema["const"]
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+    for key in ("anyOf", "oneOf", "allOf"):
+        if key in schema:
+            options = [option for option in schema[key] if option.get("type") != "null"] or schema[key]
+            return _sample(options[0], defs, rng, name, depth)
+    kind = schema.get("type", "object")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), "null")
+    if kind == "object":
+        if depth > 6:
+            return {}
+        properties = schema.get("properties", {})
+        return {key: _sample(value, defs, rng, key, depth + 1) for key, value in properties.items()}
+    if kind == "array":
+        count = max(schema.get("minItems", 0), min(2, schema.get("maxItems", 2)))
+        return [_sample(schema.get("items", {}), defs, rng, name, depth + 1) for _ in range(count)]
+    if kind == "string":
+        if schema.get("format") == "date-time":
+            return "2025-01-06T09:00:00Z"
+        if schema.get("format") == "date":
+            return "2025-01-06"
+        text = f"{name} {rng.randint(1, 999)}"
+        text = text.ljust(schema.get("minLength", 0), "x")
+        return text[:schema["maxLength"]] if "maxLength" in schema else text
+    if kind in ("integer", "number"):
+        low = schema.get("minimum", schema.get("exclusiveMinimum", 0))
+        high = schema.get("maximum", schema.get("exclusiveMaximum", low + 10))
+        value = rng.uniform(low, high)
+        if kind == "integer":
+            value = min(max(math.ceil(value), math.ceil(low)), math.floor(high))
+        return value
+    if kind == "boolean":
+        return rng.random() < 0.5
+    return None
+
+
+def sample_value(schema: Any, rng: Optional[random.Random] = None) -> Any:
+    """Build an instance of a pydantic model (or a JSON-schema dict) filled with sample values."""
+    rng = rng or random.Random(0)
+    if isinstance(schema, type) and issubclass(schema, BaseModel):
+        json_schema = schema.model_json_schema()
+        return schema.model_validate(_sample(json_schema, json_schema.get("$defs", {}), rng, "value", 0))
+    return _sample(schema, schema.get("$defs", {}), rng, "value", 0)
@@ -1,7 +1,17 @@
+import copy
+import hashlib
 import logging
 import logging.config
+import os
+import queue
+import random
+import re
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional
+
+import orjson
 
 # Define a log directory
 LOG_DIR = Path(__file__).resolve().parent.parent / "logs"
@@ -9,6 +19,276 @@ LOG_DIR.mkdir(parents=True, exist_ok=True)
 
 LOG_FILE = LOG_DIR / "app.log"
 
+# Console output: "text" (default) or "json"; the file is always JSON lines
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "text").lower()
+# Per-logger sampling of records below WARNING, e.g. "app.ai=0.1,langchain=0.01"
+LOG_SAMPLING = os.environ.get("LOG_SAMPLING", "")
+# Records waiting for the writer thread; beyond this they are dropped, never waited on
+LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE", "10000"))
+
+# Redact/hash PII and cap payload size before anything is written (runs in the writer thread)
+LOG_REDACT = os.environ.get("LOG_REDACT", "true").lower() not in ("0", "false", "no")
+# Serialized size cap per `extra=` field and for the message itself
+LOG_FIELD_MAX_CHARS = int(os.environ.get("LOG_FIELD_MAX_CHARS", "2000"))
+LOG_MESSAGE_MAX_CHARS = int(os.environ.get("LOG_MESSAGE_MAX_CHARS", "4000"))
+
+# Field names (case-insensitive, at any depth) whose values never reach the logs
+SECRET_FIELDS = frozenset({
+    "token", "access_token", "refresh_token", "id_token", "api_key", "apikey",
+    "authorization", "password", "secret", "client_secret", "cookie",
+})
+# Personal data: values are replaced by a short hash so records can still be correlated
+HASHED_FIELDS = frozenset({"email", "emails", "to", "cc", "bcc", "recipient", "phone"})
+# User memory: only the shape is logged
+PRIVATE_FIELDS = frozenset({"user_memory", "user_memory_summary", "memory", "memories", "facts"})
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_SECRET_PATTERNS = re.compile(
+    r"(?i:bearer\s+)[\w\-.~+/=]{8,}"
+    r"|\bsk-[\w-]{16,}"  # OpenAI-style keys
+    r"|\bAIza[\w-]{35}"  # Google API keys
+    r"|\bxox[abpr]-[\w-]{10,}"  # Slack tokens
+    r"|\bgh[pousr]_\w{30,}"  # GitHub tokens
+    r"|\bey[\w-]{10,}\.ey[\w-]{10,}\.[\w-]+"  # JWTs
+)
+
+# Attributes every LogRecord has; anything else on a record came from `extra=`
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize extras lazily, in the writer thread: pydantic models, callables, sets, ..."""
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if callable(value):
+        return value()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with `extra=` fields serialized as structured values."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        # RotatingFileHandler formats each record twice (size check, then write)
+        cached = getattr(record, "_json", None)
+        if cached is not None:
+            return cached
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "func": record.funcName,
+            "line": record.lineno,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        record._json = orjson.dumps(entry, default=_json_default, option=orjson.OPT_NON_STR_KEYS).decode()
+        return record._json
+
+
+def _hash(value: Any) -> Any:
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [_hash(v) for v in value]
+    if value is None:
+        return None
+    return "sha256:" + hashlib.sha256(str(value).encode()).hexdigest()[:12]
+
+
+def _shape(value: Any) -> str:
+    size = f" x{len(value)}" if hasattr(value, "__len__") else ""
+    return f"[redacted {type(value).__name__}{size}]"
+
+
+def scrub(text: str) -> str:
+    """Hash email addresses and drop bearer tokens / API keys found in free text."""
+    text = _SECRET_PATTERNS.sub("[redacted]", text)
+    return _EMAIL.sub(lambda m: _hash(m.group()), text)
+
+
+def redact(value: Any, field: Optional[str] = None) -> Any:
+    """
+    Return a JSON-ready copy of `value` with secrets removed, personal data hashed
+    and user memory reduced to its shape. Pydantic models are dumped here, so the
+    cost is only paid for records that are actually written.
+    """
+    if field is not None:
+        name = field.lower()
+        if name in SECRET_FIELDS:
+            return "[redacted]"
+        if name in PRIVATE_FIELDS:
+            return _shape(value)
+    if hasattr(value, "model_dump"):
+        value = value.model_dump(mode="json")
+    elif callable(value):
+        value = value()
+    if field is not None and field.lower() in HASHED_FIELDS:
+        return _hash(value)
+    if isinstance(value, dict):
+        return {k: redact(v, str(k)) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [redact(v) for v in value]
+    if isinstance(value, str):
+        return scrub(value)
+    return value
+
+
+def _truncate(text: str, limit: int) -> str:
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}… [truncated {len(text) - limit} chars]"
+
+
+class RedactingFilter(logging.Filter):
+    """
+    Redact and size-cap a record's message and `extra=` fields.
+
+    Attached to the sink, so it runs in the writer thread on the per-handler copy
+    of the record. Fields whose serialized form exceeds LOG_FIELD_MAX_CHARS are
+    replaced by a truncated JSON string, and fields that fail to redact or
+    serialize by a truncated repr. With `extras=False` (text formatters,
+    which never render them) only the message is processed.
+    """
+
+    def __init__(self, field_max: int = LOG_FIELD_MAX_CHARS, message_max: int = LOG_MESSAGE_MAX_CHARS,
+                 extras: bool = True):
+        super().__init__()
+        self.field_max = field_max
+        self.message_max = message_max
+        self.extras = extras
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.msg = _truncate(scrub(record.getMessage()), self.message_max)
+        record.args = None
+        if not self.extras:
+            return True
+        for key in [k for k in record.__dict__ if k not in _RECORD_ATTRS and not k.startswith("_")]:
+            setattr(record, key, self._field(key, getattr(record, key)))
+        return True
+
+    def _field(self, key: str, value: Any) -> Any:
+        # An exception here would kill the listener thread and stall every later
+        # record, so one bad field is replaced instead of failing the record
+        try:
+            value = redact(value, key)
+        except Exception as e:
+            # The raw value was never redacted, so don't fall back to its repr
+            return scrub(f"[unloggable {type(value).__name__}: {type(e).__name__}: {e}]")
+        if isinstance(value, (bool, float, type(None))):
+            return value
+        try:
+            text = orjson.dumps(value, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+        except Exception as e:
+            try:
+                text = repr(value).encode()
+            except Exception:
+                text = f"[unloggable {type(value).__name__}: {type(e).__name__}: {e}]".encode()
+            return _truncate(scrub(text.decode()), self.field_max)
+        if len(text) > self.field_max:
+            return _truncate(text.decode(), self.field_max)
+        return value
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of sub-WARNING records for the configured logger prefixes."""
+
+    def __init__(self, rates: str = LOG_SAMPLING):
+        super().__init__()
+        self.rates: Dict[str, float] = {}
+        for item in rates.split(","):
+            name, _, rate = item.partition("=")
+            if name.strip() and rate.strip():
+                self.rates[name.strip()] = float(rate)
+        # Longest prefix wins
+        self._prefixes = sorted(self.rates, key=len, reverse=True)
+
+    def _rate(self, name: str) -> float:
+        for prefix in self._prefixes:
+            if name == prefix or name.startswith(prefix + "."):
+                return self.rates[prefix]
+        return 1.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        return random.random() < self._rate(record.name)
+
+
+class LogQueueHandler(QueueHandler):
+    """
+    Hand records to a background thread that formats and writes them to `sink`.
+
+    Only the message itself is resolved on the calling thread; formatting,
+    serialization of `extra=` payloads and file/console I/O happen in the
+    listener thread. When the queue is full, records are dropped and counted
+    rather than blocking the caller. Unless LOG_REDACT is off, the sink also
+    redacts and size-caps each record (see RedactingFilter) before writing it.
+    """
+
+    def __init__(self, sink: logging.Handler, maxsize: int = LOG_QUEUE_SIZE):
+        super().__init__(queue.Queue(maxsize))
+        self.sink = sink
+        self.dropped = 0
+        self._closed = False
+        self.redactor: Optional[RedactingFilter] = None
+        if LOG_REDACT:
+            self.redactor = RedactingFilter()
+            sink.addFilter(self.redactor)
+        self.listener = QueueListener(self.queue, sink, respect_handler_level=True)
+        self.listener.start()
+
+    def setFormatter(self, fmt: Optional[logging.Formatter]) -> None:
+        # dictConfig sets the formatter on this handler; the sink is what formats
+        super().setFormatter(fmt)
+        self.sink.setFormatter(fmt)
+        if self.redactor is not None:
+            self.redactor.extras = isinstance(fmt, JsonFormatter)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Shallow copy: the same record goes to every handler, each with its own writer thread
+        record = copy.copy(record)
+        # Resolve %-args now (they may change later); everything else stays lazy
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if self.dropped:
+                self.queue.put_nowait(logging.makeLogRecord({
+                    "name": __name__, "levelno": logging.WARNING, "levelname": "WARNING",
+                    "msg": f"⚠️ Dropped {self.dropped} log records: logging queue full",
+                }))
+                self.dropped = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self) -> None:
+        # Drains the queue before returning; dictConfig and logging.shutdown may both close us
+        if not self._closed:
+            self._closed = True
+            self.listener.stop()
+            self.sink.close()
+        super().close()
+
+
+def queued_handler(sink_class: str, **sink_kwargs: Any) -> LogQueueHandler:
+    """dictConfig factory: build `sink_class(**sink_kwargs)` and put it behind a LogQueueHandler."""
+    module, _, name = sink_class.rpartition(".")
+    factory: Callable[..., logging.Handler] = getattr(__import__(module, fromlist=[name]), name)
+    return LogQueueHandler(factory(**sink_kwargs))
+
+
 # Logging configuration dictionary
 LOGGING_CONFIG: Dict[str, Any] = {
     "version": 1,
@@ -20,21 +300,35 @@ LOGGING_CONFIG: Dict[str, Any] = {
                       "%(name)s:%(funcName)s:%(lineno)d | %(message)s",
             "datefmt": "%Y-%m-%d %H:%M:%S",
         },
+        "json": {
+            "()": JsonFormatter,
+        },
         "access": {
             "format": '%(asctime)s - %(levelname)s - %(client_addr)s - "%(request_line)s" - %(status_code)s',
             "datefmt": "%Y-%m-%d %H:%M:%S",
         },
     },
 
+    "filters": {
+        "sampling": {
+            "()": SamplingFilter,
+        },
+    },
+
+    # Both handlers only enqueue; the real StreamHandler / RotatingFileHandler run in a writer thread
     "handlers": {
         "console": {
-            "class": "logging.StreamHandler",
-            "formatter": "standard",
+            "()": queued_handler,
+            "sink_class": "logging.StreamHandler",
+            "formatter": "json" if LOG_FORMAT == "json" else "standard",
+            "filters": ["sampling"],
             "level": "DEBUG",
         },
         "file": {
-            "class": "logging.handlers.RotatingFileHandler",
-            "formatter": "standard",
+            "()": queued_handler,
+            "sink_class": "logging.handlers.RotatingFileHandler",
+            "formatter": "json",
+            "filters": ["sampling"],
             "filename": str(LOG_FILE),
             "maxBytes": 10 * 1024 * 1024,  # 10 MB per file
             "backupCount": 5,
@@ -0,0 +1,110 @@
+"""
+Event-loop blocking detector.
+
+A heartbeat task on the event loop records when it last ran and how late it
+woke up (event-loop lag). A watcher thread checks the heartbeat; when the loop
+has not run for LOOP_WATCHDOG_THRESHOLD seconds it snapshots the loop thread's
+stack, so the log names the blocking call and the app function that made it
+(e.g. a sync `.invoke()` or SDK call inside an `async def`). Enable with
+LOOP_WATCHDOG=true, e.g. in staging.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from types import FrameType
+from typing import Optional
+
+from app.core.telemetry import metrics
+
+logger = logging.getLogger(__name__)
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+STACK_LIMIT = 30
+
+metrics.describe("app_event_loop_lag_seconds", "histogram", "How late the event loop woke a sleeping heartbeat")
+metrics.describe("app_event_loop_blocks_total", "counter", "Event-loop stalls over the watchdog threshold, by culprit")
+
+
+def _location(frame: FrameType) -> str:
+    module = frame.f_globals.get("__name__", Path(frame.f_code.co_filename).stem)
+    return f"{module}.{frame.f_code.co_name}:{frame.f_lineno}"
+
+
+def _culprit(frame: FrameType) -> str:
+    """Innermost app frame (who made the blocking call) plus the innermost frame (what blocked)."""
+    innermost = frame
+    current: Optional[FrameType] = frame
+    while current is not None:
+        filename = current.f_code.co_filename
+        if filename.startswith(str(APP_ROOT)) and filename != __file__:
+            if current is innermost:
+                return _location(current)
+            return f"{_location(current)} -> {_location(innermost)}"
+        current = current.f_back
+    return _location(innermost)
+
+
+class LoopWatchdog:
+    """Measure event-loop lag and log the stack of whatever blocks the loop past `threshold`."""
+
+    def __init__(self, threshold: float, interval: float):
+        self.threshold = threshold
+        self.interval = interval
+        self._beat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+        logger.info(f"🐕 Event-loop watchdog started (threshold {self.threshold * 1000:.0f} ms)")
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _heartbeat(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            metrics.observe("app_event_loop_lag_seconds", max(0.0, loop.time() - expected))
+            self._beat = time.monotonic()
+
+    def _watch(self) -> None:
+        stalled_since: Optional[float] = None
+        culprit = ""
+        while not self._stop.wait(self.interval):
+            beat = self._beat
+            # The heartbeat is due every `interval`; anything beyond that is the loop not running
+            blocked = time.monotonic() - beat - self.interval
+            if blocked >= self.threshold and stalled_since != beat:
+                stalled_since = beat
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is None:
+                    continue
+                culprit = _culprit(frame)
+                stack = "".join(traceback.format_stack(frame, limit=STACK_LIMIT))
+                logger.warning(f"🐢 Event loop blocked for {blocked * 1000:.0f} ms in {culprit}\n{stack}")
+            elif stalled_since is not None and beat != stalled_since:
+                total = beat - stalled_since - self.interval
+                logger.warning(f"🐢 Event loop resumed after {total * 1000:.0f} ms blocked in {culprit}")
+                metrics.inc("app_event_loop_blocks_total", 1, {"culprit": culprit.split(" -> ")[0].rsplit(":", 1)[0]})
+                stalled_since = None
@@ -0,0 +1,177 @@
+"""
+In-process sampling profiler.
+
+A background thread snapshots every thread's Python stack with
+`sys._current_frames()` at a fixed interval. The samples are written as
+collapsed stacks (flamegraph.pl / speedscope import) or as a speedscope
+JSON file, with a summary attributing time to the app's packages
+(app.ai, app.services, app.mcp, ...). No restart or external tool is needed,
+so it can be triggered on a live worker.
+"""
+
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import Optional
+
+PROFILE_FORMATS = ("speedscope", "collapsed")
+DEFAULT_INTERVAL = 0.005
+# Innermost frames of threads that are just waiting (event loop select, idle pools)
+IDLE_FRAMES = frozenset({
+    "selectors:select",
+    "threading:wait",
+    "threading:_wait_for_tstate_lock",
+    "queue:get",
+    "concurrent.futures.thread:_worker",
+    "socket:accept",
+})
+EXTERNAL = "external"
+
+
+def _frame_key(frame: FrameType) -> tuple[str, str, int]:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__") or Path(code.co_filename).stem
+    return f"{module}:{code.co_name}", code.co_filename, code.co_firstlineno
+
+
+def _package(frame_name: str) -> Optional[str]:
+    """app.ai.ai:clarify_agent -> app.ai; None for code outside the app."""
+    module = frame_name.split(":", 1)[0]
+    parts = module.split(".")
+    if parts[0] != "app":
+        return None
+    return ".".join(parts[:2])
+
+
+class SamplingProfiler:
+    """Collect stack samples from all threads until stopped (or for a fixed duration via `run`)."""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, include_idle: bool = False):
+        self.interval = interval
+        self.include_idle = include_idle
+        # (thread name, frame index, ...) -> sample count
+        self.stacks: Counter = Counter()
+        self.frames: list[tuple[str, str, int]] = []
+        self._frame_index: dict[tuple[str, str, int], int] = {}
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _index(self, key: tuple[str, str, int]) -> int:
+        index = self._frame_index.get(key)
+        if index is None:
+            index = self._frame_index[key] = len(self.frames)
+            self.frames.append(key)
+        return index
+
+    def sample(self) -> None:
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            keys = []
+            current: Optional[FrameType] = frame
+            while current is not None:
+                keys.append(_frame_key(current))
+                current = current.f_back
+            if not keys or (not self.include_idle and keys[0][0] in IDLE_FRAMES):
+                continue
+            keys.reverse()
+            self.stacks[(names.get(thread_id, str(thread_id)),) + tuple(self._index(k) for k in keys)] += 1
+        self.samples += 1
+
+    def _loop(self, deadline: Optional[float]) -> None:
+        while not self._stop.is_set() and (deadline is None or time.monotonic() < deadline):
+            self.sample()
+            self._stop.wait(self.interval)
+
+    def start(self, seconds: Optional[float] = None) -> None:
+        self.started_at = time.monotonic()
+        deadline = self.started_at + seconds if seconds is not None else None
+        self._thread = threading.Thread(target=self._loop, args=(deadline,), name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self.started_at is not None:
+            self.duration = time.monotonic() - self.started_at
+
+    def run(self, seconds: float) -> "SamplingProfiler":
+        """Profile for `seconds`, blocking the calling thread (use asyncio.to_thread from async code)."""
+        self.start(seconds)
+        self._thread.join()
+        self.stop()
+        return self
+
+    # --- Output ---
+
+    def collapsed(self) -> str:
+        lines = []
+        for (thread, *stack), count in sorted(self.stacks.items(), key=lambda item: -item[1]):
+            lines.append(";".join([thread] + [self.frames[i][0] for i in stack]) + f" {count}")
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self, name: str) -> dict:
+        by_thread: dict[str, list[tuple[list[int], int]]] = {}
+        for (thread, *stack), count in self.stacks.items():
+            by_thread.setdefault(thread, []).append((list(stack), count))
+        profiles = []
+        for thread, samples in sorted(by_thread.items()):
+            total = sum(count for _, count in samples) * self.interval
+            profiles.append({
+                "type": "sampled",
+                "name": thread,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": total,
+                "samples": [stack for stack, _ in samples],
+                "weights": [count * self.interval for _, count in samples],
+            })
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "app.core.profiler",
+            "shared": {"frames": [{"name": n, "file": f, "line": line} for n, f, line in self.frames]},
+            "profiles": profiles,
+        }
+
+    def summary(self, top: int = 15) -> dict:
+        """Self time by app package and inclusive time of the hottest app functions."""
+        packages: Counter = Counter()
+        functions: Counter = Counter()
+        for (_thread, *stack), count in self.stacks.items():
+            names = [self.frames[i][0] for i in stack]
+            owner = next((p for p in map(_package, reversed(names)) if p), EXTERNAL)
+            packages[owner] += count
+            for frame_name in set(names):
+                if _package(frame_name):
+                    functions[frame_name] += count
+        total = sum(packages.values()) or 1
+        return {
+            "samples": self.samples,
+            "seconds": round(self.duration, 3),
+            "interval_ms": self.interval * 1000,
+            "packages": {p: round(c / total, 3) for p, c in packages.most_common()},
+            "top_functions": [{"function": f, "share": round(c / total, 3)} for f, c in functions.most_common(top)],
+        }
+
+    def write(self, directory: Path, name: str, fmt: str = "speedscope") -> Path:
+        if fmt not in PROFILE_FORMATS:
+            raise ValueError(f"Unknown profile format: {fmt}; use one of {PROFILE_FORMATS}")
+        directory.mkdir(parents=True, exist_ok=True)
+        if fmt == "collapsed":
+            path = directory / f"{name}.collapsed.txt"
+            path.write_text(self.collapsed(), encoding="utf-8")
+        else:
+            path = directory / f"{name}.speedscope.json"
+            path.write_text(json.dumps(self.speedscope(name)), encoding="utf-8")
+        return path
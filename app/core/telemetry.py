@@ -0,0 +1,305 @@
+"""
+Lightweight tracing and metrics for the request pipeline.
+
+Spans are timed sections of work (HTTP request, LLM call, MCP tool call, DB
+query, ...) linked into a per-request trace through a context variable, so
+they nest correctly across ``await`` and thread-pool hops. Every finished span
+feeds a duration histogram rendered in Prometheus text format at ``/metrics``
+and, when ``OTEL_EXPORTER_OTLP_ENDPOINT`` is set, is batched to an
+OpenTelemetry collector as OTLP/HTTP JSON.
+"""
+
+import functools
+import inspect
+import logging
+import math
+import os
+import queue
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = os.environ.get("OTEL_SERVICE_NAME", "project-x-ai-service")
+OTLP_ENDPOINT = os.environ.get("OTEL_EXPORTER_OTLP_ENDPOINT", "").rstrip("/")
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, math.inf)
+# Span attributes that become Prometheus labels; everything else stays on the span only
+METRIC_LABELS = ("route", "agent", "model", "server", "tool", "status")
+
+
+class Span:
+    """One timed operation within a trace."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Optional[dict] = None,
+                 start_ns: Optional[int] = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = start_ns if start_ns is not None else time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: dict[str, Any] = dict(attributes or {})
+        self.error: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e9
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def end(self, error: Optional[BaseException] = None, end_ns: Optional[int] = None) -> None:
+        if self.end_ns is not None:
+            return
+        self.end_ns = end_ns if end_ns is not None else time.time_ns()
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        _finish(self)
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def start_span(name: str, attributes: Optional[dict] = None, parent: Optional[Span] = None,
+               start_ns: Optional[int] = None) -> Span:
+    """Start a span under ``parent`` (default: the current span) without making it current."""
+    parent = parent if parent is not None else _current_span.get()
+    trace_id = parent.trace_id if parent is not None else secrets.token_hex(16)
+    return Span(name, trace_id, parent.span_id if parent is not None else None, attributes, start_ns)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span]:
+    """Time the enclosed block as a child of the current span."""
+    current = start_span(name, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.end(error=e)
+        raise
+    else:
+        current.end()
+    finally:
+        _current_span.reset(token)
+
+
+def annotate(**attributes: Any) -> None:
+    """Add attributes to the current span, if any (e.g. which agent a request selected)."""
+    current = _current_span.get()
+    if current is not None:
+        current.attributes.update(attributes)
+
+
+def traced(name: Optional[str] = None, **attributes: Any) -> Callable:
+    """Decorator form of `span` for sync and async functions."""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name, **attributes):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name, **attributes):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# --- Metrics ---
+
+class MetricsRegistry:
+    """Counters and histograms keyed by (metric name, label set), rendered as Prometheus text."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[tuple[str, tuple], float] = {}
+        self._histograms: dict[tuple[str, tuple], list] = {}
+        self._help: dict[str, tuple[str, str]] = {}
+
+    def describe(self, name: str, kind: str, help_text: str) -> None:
+        self._help[name] = (kind, help_text)
+
+    def inc(self, name: str, value: float = 1.0, labels: Optional[dict] = None) -> None:
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, labels: Optional[dict] = None) -> None:
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            entry = self._histograms.get(key)
+            if entry is None:
+                entry = self._histograms[key] = [[0] * len(DURATION_BUCKETS), 0.0, 0]
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if value <= bound:
+                    entry[0][i] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def render(self) -> str:
+        lines: list[str] = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items(), key=lambda item: item[0])
+        seen: set[str] = set()
+
+        def header(name: str, default_kind: str) -> None:
+            if name in seen:
+                return
+            seen.add(name)
+            kind, help_text = self._help.get(name, (default_kind, ""))
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), value in counters:
+            header(name, "counter")
+            lines.append(f"{name}{_labels(labels)} {value:g}")
+        for (name, labels), (buckets, total, count) in histograms:
+            header(name, "histogram")
+            for bound, bucket_count in zip(DURATION_BUCKETS, buckets):
+                le = "+Inf" if math.isinf(bound) else f"{bound:g}"
+                lines.append(f"{name}_bucket{_labels(labels + (('le', le),))} {bucket_count}")
+            lines.append(f"{name}_sum{_labels(labels)} {total:.6f}")
+            lines.append(f"{name}_count{_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def _labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+metrics = MetricsRegistry()
+metrics.describe("app_span_duration_seconds", "histogram", "Duration of traced pipeline stages")
+metrics.describe("app_span_errors_total", "counter", "Traced pipeline stages that raised")
+metrics.describe("app_llm_tokens_total", "counter", "LLM tokens by model and direction")
+
+
+# --- OTLP export ---
+
+class OtlpHttpExporter:
+    """Batch finished spans to an OTLP/HTTP collector (JSON encoding) from a daemon thread."""
+
+    def __init__(self, endpoint: str, max_queue: int = 2048, batch_size: int = 256, interval: float = 2.0):
+        self.url = f"{endpoint}/v1/traces"
+        self.batch_size = batch_size
+        self.interval = interval
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="otlp-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, finished: Span) -> None:
+        try:
+            self._queue.put_nowait(finished)
+        except queue.Full:
+            # Tracing must never slow the request path; drop instead of blocking
+            pass
+
+    def _run(self) -> None:
+        import httpx
+
+        with httpx.Client(timeout=5.0) as client:
+            while True:
+                batch = [self._queue.get()]
+                deadline = time.monotonic() + self.interval
+                while len(batch) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(self._queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+                try:
+                    client.post(self.url, json=_otlp_payload(batch)).raise_for_status()
+                except Exception as e:
+                    logger.warning(f"Dropped {len(batch)} spans; OTLP export failed: {e}")
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_payload(spans: list[Span]) -> dict:
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+            "scopeSpans": [{
+                "scope": {"name": "app.core.telemetry"},
+                "spans": [
+                    {
+                        "traceId": s.trace_id,
+                        "spanId": s.span_id,
+                        **({"parentSpanId": s.parent_id} if s.parent_id else {}),
+                        "name": s.name,
+                        "kind": 1,
+                        "startTimeUnixNano": str(s.start_ns),
+                        "endTimeUnixNano": str(s.end_ns),
+                        "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in s.attributes.items()],
+                        "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+                    }
+                    for s in spans
+                ],
+            }],
+        }]
+    }
+
+
+_exporter: Optional[OtlpHttpExporter] = None
+_exporter_lock = threading.Lock()
+
+
+def _get_exporter() -> Optional[OtlpHttpExporter]:
+    global _exporter
+    if not OTLP_ENDPOINT:
+        return None
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                _exporter = OtlpHttpExporter(OTLP_ENDPOINT)
+    return _exporter
+
+
+def _finish(finished: Span) -> None:
+    labels = {"span": finished.name}
+    labels.update({key: finished.attributes[key] for key in METRIC_LABELS if key in finished.attributes})
+    metrics.observe("app_span_duration_seconds", finished.duration, labels)
+    if finished.error:
+        metrics.inc("app_span_errors_total", 1, labels)
+    exporter = _get_exporter()
+    if exporter is not None:
+        exporter.export(finished)
+
+
+def record_tokens(model: str, input_tokens: int = 0, output_tokens: int = 0) -> None:
+    if input_tokens:
+        metrics.inc("app_llm_tokens_total", input_tokens, {"model": model, "type": "input"})
+    if output_tokens:
+        metrics.inc("app_llm_tokens_total", output_tokens, {"model": model, "type": "output"})
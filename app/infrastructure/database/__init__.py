@@ -1,8 +1,9 @@
-from .connection import engine, SessionLocal, get_session, metadata
+from .connection import get_engine, get_sessionmaker, get_session, metadata
 from .crud import (
     read_table,
     get_by_id,
     create_row,
+    create_rows,
     update_row,
     delete_row,
 )
@@ -11,12 +12,23 @@ from .repository import Repository
 __all__ = [
     "engine",
     "SessionLocal",
+    "get_engine",
+    "get_sessionmaker",
     "get_session",
     "metadata",
     "read_table",
     "get_by_id",
     "create_row",
+    "create_rows",
     "update_row",
     "delete_row",
     "Repository",
 ]
+
+
+def __getattr__(name: str):
+    # Lazily created; see app.infrastructure.database.connection
+    if name in ("engine", "SessionLocal"):
+        from . import connection
+        return getattr(connection, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,12 +1,54 @@
 from contextlib import contextmanager
-from sqlalchemy import create_engine, MetaData
+from functools import lru_cache
+from sqlalchemy import create_engine, event, MetaData
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.telemetry import start_span
 
-# Create a global SQLAlchemy Engine and Session factory
 DATABASE_URL = settings.database_url()
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+# Trace every statement as a "db.query" span under the current request
+def _start_query_span(conn, cursor, statement, parameters, context, executemany):
+    context._telemetry_span = start_span("db.query", {"db.statement": statement.split(None, 1)[0].upper() if statement else ""})
+
+
+def _end_query_span(conn, cursor, statement, parameters, context, executemany):
+    current = getattr(context, "_telemetry_span", None)
+    if current is not None:
+        current.end()
+
+
+def _fail_query_span(exception_context):
+    current = getattr(exception_context.execution_context, "_telemetry_span", None)
+    if current is not None:
+        current.end(error=exception_context.original_exception)
+
+
+@lru_cache(maxsize=None)
+def get_engine() -> Engine:
+    """The global SQLAlchemy Engine, created on first use so importing the app does not load the DB driver."""
+    engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+    event.listen(engine, "before_cursor_execute", _start_query_span)
+    event.listen(engine, "after_cursor_execute", _end_query_span)
+    event.listen(engine, "handle_error", _fail_query_span)
+    return engine
+
+
+@lru_cache(maxsize=None)
+def get_sessionmaker() -> sessionmaker:
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+
+
+def __getattr__(name: str):
+    # `engine` and `SessionLocal` remain importable, but are only built when first accessed
+    if name == "engine":
+        return get_engine()
+    if name == "SessionLocal":
+        return get_sessionmaker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Shared MetaData for reflection/reuse
 metadata = MetaData()
@@ -15,7 +57,7 @@ metadata = MetaData()
 @contextmanager
 def get_session():
     """Provide a transactional scope around a series of operations."""
-    session = SessionLocal()
+    session = get_sessionmaker()()
     try:
         yield session
         session.commit()
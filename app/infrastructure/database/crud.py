@@ -72,6 +72,21 @@ def create_row(
         return result.scalar()  # returns inserted primary key if supported
 
 
+def create_rows(
+    engine: Engine,
+    metadata: MetaData,
+    table_name: str,
+    rows: List[Dict[str, Any]],
+) -> int:
+    """Insert many rows in one statement (executemany); returns the number of rows sent."""
+    if not rows:
+        return 0
+    table = _reflect_table(table_name, metadata, engine)
+    with engine.begin() as conn:
+        conn.execute(insert(table), rows)
+    return len(rows)
+
+
 def update_row(
     engine: Engine,
     metadata: MetaData,
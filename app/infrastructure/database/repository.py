@@ -1,5 +1,5 @@
 from typing import Any, Dict, Iterable, List, Optional
-from .connection import engine, metadata
+from .connection import get_engine, metadata
 from . import crud
 
 class Repository:
@@ -15,22 +15,25 @@ class Repository:
         self.id_column = id_column
 
     def all(self, columns: Optional[Iterable[str]] = None, limit: Optional[int] = None, offset: Optional[int] = None) -> List[Dict[str, Any]]:
-        return crud.read_table(engine, metadata, self.table_name, columns=columns, limit=limit, offset=offset)
+        return crud.read_table(get_engine(), metadata, self.table_name, columns=columns, limit=limit, offset=offset)
 
     def filter(self, where: Dict[str, Any], columns: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
-        return crud.read_table(engine, metadata, self.table_name, columns=columns, where=where)
+        return crud.read_table(get_engine(), metadata, self.table_name, columns=columns, where=where)
 
     def get(self, id_value: Any) -> Optional[Dict[str, Any]]:
-        return crud.get_by_id(engine, metadata, self.table_name, self.id_column, id_value)
+        return crud.get_by_id(get_engine(), metadata, self.table_name, self.id_column, id_value)
 
     def create(self, values: Dict[str, Any]) -> Any:
-        return crud.create_row(engine, metadata, self.table_name, values)
+        return crud.create_row(get_engine(), metadata, self.table_name, values)
+
+    def create_many(self, rows: List[Dict[str, Any]]) -> int:
+        return crud.create_rows(get_engine(), metadata, self.table_name, rows)
 
     def update(self, id_value: Any, values: Dict[str, Any]) -> int:
-        return crud.update_row(engine, metadata, self.table_name, self.id_column, id_value, values)
+        return crud.update_row(get_engine(), metadata, self.table_name, self.id_column, id_value, values)
 
     def delete(self, id_value: Any) -> int:
-        return crud.delete_row(engine, metadata, self.table_name, self.id_column, id_value)
+        return crud.delete_row(get_engine(), metadata, self.table_name, self.id_column, id_value)
 
 # Convenience instances (assuming actual table names 'users' and 'tokens')
 users_repository = Repository("users", id_column="id")
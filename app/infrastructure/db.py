@@ -4,14 +4,16 @@ Re-exports new database utilities from `app.infrastructure.database` so existing
 imports like `from app.infrastructure.db import ...` continue working.
 """
 
+import app.infrastructure.database as _database
 from app.infrastructure.database import (
-	engine,
-	SessionLocal,
+	get_engine,
+	get_sessionmaker,
 	get_session,
 	metadata,
 	read_table,
 	get_by_id,
 	create_row,
+	create_rows,
 	update_row,
 	delete_row,
 	Repository,
@@ -20,12 +22,22 @@ from app.infrastructure.database import (
 __all__ = [
 	"engine",
 	"SessionLocal",
+	"get_engine",
+	"get_sessionmaker",
 	"get_session",
 	"metadata",
 	"read_table",
 	"get_by_id",
 	"create_row",
+	"create_rows",
 	"update_row",
 	"delete_row",
 	"Repository",
 ]
+
+
+def __getattr__(name: str):
+	# `engine` / `SessionLocal` are created on first access
+	if name in ("engine", "SessionLocal"):
+		return getattr(_database, name)
+	raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,16 +1,28 @@
-from fastapi import FastAPI
-from app.api.routers import agent_router, ai_router
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
+from app.api.routers import admin_router, agent_router, ai_router, usage_router
+from app.api.routers.admin_router import is_admin, profile_lock, profile_name
 from app.core.logger import setup_logging, get_logger
-from app.mcp.client import close_mcp_client, initialize_mcp_client
+from app.core.config import settings
+from app.core.loop_watchdog import LoopWatchdog
+from app.core.profiler import PROFILE_FORMATS, SamplingProfiler
+from app.mcp.client import close_mcp_client, get_mcp_status, initialize_mcp_client
+from app.api.schemas.mcp_schema import HealthCheckResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from contextlib import asynccontextmanager
 import asyncio
+import random
+from pathlib import Path
 from sqlalchemy import text
-from app.infrastructure.db import engine
+from app.infrastructure.db import get_engine
+from app.core.telemetry import metrics, span
+from app.ai.callbacks import install_llm_tracing, llm_debug
+from app.services.usage_service import usage_ledger
 
 setup_logging()
 logger = get_logger(__name__)
+install_llm_tracing()
 
 def init_db():
     """Verify DB connectivity and log basic status.
@@ -20,7 +32,7 @@ def init_db():
     This avoids heavy reflection of all tables on startup.
     """
     try:
-        with engine.connect() as conn:
+        with get_engine().connect() as conn:
             conn.execute(text("SELECT 1"))
         logger.info("✅ Database connectivity OK.")
     except Exception as e:
@@ -32,10 +44,16 @@ def init_db():
 async def lifespan(app: FastAPI):
     logger.info("🚀 FastAPI app started successfully.")
     # --- Startup ----
+    watchdog = None
+    if settings.LOOP_WATCHDOG:
+        # Started first so blocking work during startup (DB check, MCP sessions) is caught too
+        watchdog = LoopWatchdog(settings.LOOP_WATCHDOG_THRESHOLD, settings.LOOP_WATCHDOG_INTERVAL)
+        watchdog.start()
     try:
         logger.info("Initializing MCP client...")
         init_db()
         await initialize_mcp_client()
+        usage_ledger.start()
         yield
     finally:
         logger.info("🛑 FastAPI app shutting down.")
@@ -46,6 +64,13 @@ async def lifespan(app: FastAPI):
             await close_mcp_client(timeout=5.0)
         except asyncio.CancelledError:
             logger.warning("⚠️ Lifespan shutdown cancelled during MCP client close; continuing app shutdown.")
+        try:
+            # Write out usage recorded since the last periodic flush
+            await usage_ledger.stop()
+        except asyncio.CancelledError:
+            logger.warning("⚠️ Lifespan shutdown cancelled during usage flush; continuing app shutdown.")
+        if watchdog is not None:
+            await watchdog.stop()
         
 app = FastAPI(title="AI Agent Microservice", version='1.0', lifespan=lifespan)
 
@@ -61,10 +86,82 @@ app.add_middleware(
     allow_methods=["*"],            # allow all HTTP methods
     allow_headers=["*"],            # allow all headers (e.g. Content-Type)
 )
+
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    # Root span of the request; stage spans (validation, LLM, MCP, DB) nest under it
+    with span("http.request", method=request.method) as current:
+        response = await call_next(request)
+        route = request.scope.get("route")
+        current.set_attribute("route", getattr(route, "path", "unmatched"))
+        current.set_attribute("status", response.status_code)
+        return response
+
+
+@app.middleware("http")
+async def profile_requests(request: Request, call_next):
+    # "X-Profile: speedscope|collapsed" plus a valid X-Admin-Token profiles this request.
+    # Samples cover the whole process while it runs, so other in-flight requests show up too.
+    profile_format = request.headers.get("x-profile")
+    if not profile_format or not is_admin(request.headers.get("x-admin-token")):
+        return await call_next(request)
+    if profile_lock.locked():
+        return PlainTextResponse("A profile is already running.", status_code=409)
+    async with profile_lock:
+        profiler = SamplingProfiler()
+        profiler.start(settings.PROFILE_MAX_SECONDS)
+        try:
+            response = await call_next(request)
+        finally:
+            profiler.stop()
+    if profile_format not in PROFILE_FORMATS:
+        profile_format = "speedscope"
+    path = await asyncio.to_thread(profiler.write, Path(settings.PROFILE_DIR), profile_name("request"), profile_format)
+    logger.info(f"🔬 Request profile written to {path}")
+    response.headers["X-Profile-File"] = path.name
+    return response
+
+
+@app.middleware("http")
+async def debug_llm_requests(request: Request, call_next):
+    # LangChain step logging (app.ai.debug) for this request: always with LLM_DEBUG, for a
+    # LLM_DEBUG_SAMPLE_RATE fraction of requests, or on demand with "X-LLM-Debug: 1" plus X-Admin-Token
+    if settings.LLM_DEBUG:
+        reason = "always"
+    elif request.headers.get("x-llm-debug", "").lower() in ("1", "true") and is_admin(request.headers.get("x-admin-token")):
+        reason = "header"
+    elif settings.LLM_DEBUG_SAMPLE_RATE > 0 and random.random() < settings.LLM_DEBUG_SAMPLE_RATE:
+        reason = "sampled"
+    else:
+        return await call_next(request)
+    with llm_debug(reason):
+        return await call_next(request)
+
 app.include_router(agent_router.router, prefix="/agent", tags=["Agent"])
 app.include_router(ai_router.router, prefix="/ai", tags=["AI"])
+app.include_router(usage_router.router, prefix="/usage", tags=["Usage"])
+app.include_router(admin_router.router, prefix="/admin", tags=["Admin"])
 
 
 @app.get("/")
 async def root():
-    return {"message": "Welcome to the AI Agent Microservice!"}
\ No newline at end of file
+    return {"message": "Welcome to the AI Agent Microservice!"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/health", response_model=HealthCheckResponse)
+async def health():
+    mcp = get_mcp_status()
+    return HealthCheckResponse(
+        status="healthy" if mcp["status"] != "error" else "degraded",
+        app_name=app.title,
+        version=app.version,
+        mcp_status=mcp["status"],
+        mcp_servers=mcp["servers"],
+        mcp_errors=mcp["errors"],
+    )
\ No newline at end of file
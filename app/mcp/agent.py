@@ -1,10 +1,38 @@
 import logging
+import asyncio
+from typing import Optional
 from mcp_use import MCPAgent, MCPClient
-from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.language_models import BaseChatModel
+from app.ai.llm import chat_model
+from app.mcp.client import ensure_mcp_sessions
 
 logger = logging.getLogger(__name__)
 
-def create_agent(client: MCPClient) -> MCPAgent:
+# --- toolType routing: which MCP servers (and optionally which of their tools) each type needs ---
+DOC_TOOLS = frozenset({"create-document", "read-document", "update-document", "lookup-file", "search-documents", "list-recent-documents"})
+SHEET_TOOLS = frozenset({"create-sheet", "read-sheet", "update-sheet", "lookup-file", "search-sheets", "list-recent-sheets"})
+
+TOOL_ROUTES: dict[str, tuple[tuple[str, ...], Optional[frozenset[str]]]] = {
+    "google-docs": (("google-doc-sheet",), DOC_TOOLS),
+    "google-sheets": (("google-doc-sheet",), SHEET_TOOLS),
+    "google-calendar": (("google-calendar",), None),
+    "gmail": (("gmail-mcp",), None),
+    "slack": (("slack-mcp",), None),
+}
+TOOL_TYPE_ALIASES = {
+    "google-doc": "google-docs", "gdoc": "google-docs", "doc": "google-docs",
+    "google-sheet": "google-sheets", "gsheet": "google-sheets", "sheet": "google-sheets",
+    "calendar": "google-calendar", "gcal": "google-calendar",
+    "email": "gmail", "mail": "gmail",
+}
+
+def resolve_route(tool_type: Optional[str]) -> Optional[str]:
+    """Map a toolType to a TOOL_ROUTES key, or None when it needs every server."""
+    key = (tool_type or "").strip().lower()
+    key = TOOL_TYPE_ALIASES.get(key, key)
+    return key if key in TOOL_ROUTES else None
+
+def create_agent(client: MCPClient, llm: Optional[BaseChatModel] = None, **agent_options) -> MCPAgent:
     """
         Factory Function to create a configured MCPAgent instance 
         
@@ -16,14 +44,16 @@ def create_agent(client: MCPClient) -> MCPAgent:
     logger.info("🧠 Creating MCPAgent...")
     try:
         # --- Step 1 : Initialize the LLM (Gemini 2.5 Flash) ---
-        llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
-            temperature=0.7,
-        )
+        if llm is None:
+            llm = chat_model(
+                "gemini-2.5-flash",
+                temperature=0.7,
+            )
         # --- Step 2 : Create the Agent Instance ---- 
         agent = MCPAgent(
             llm=llm,
-            client=client
+            client=client,
+            **agent_options
         )
         logger.info("✅ MCPAgent created successfully.")
         return agent
@@ -43,4 +73,66 @@ def get_or_create_agent(client: MCPClient) -> MCPAgent:
     if _agent_instance is not None:
         return _agent_instance
     _agent_instance = create_agent(client)
-    return _agent_instance
\ No newline at end of file
+    return _agent_instance
+
+# --- Per-toolType agents, each seeing only its route's servers and tools ---
+# Keyed by (route, model config): a handful of routes times the few model configs in use
+_route_agents: dict[tuple[str, str], tuple[MCPAgent, tuple]] = {}
+_route_locks: dict[tuple[str, str], asyncio.Lock] = {}
+
+def _scoped_client(client: MCPClient, servers: list[str]) -> MCPClient:
+    """A client view that shares `client`'s live sessions for `servers` only."""
+    view = MCPClient(config={"mcpServers": {name: client.config["mcpServers"][name] for name in servers}})
+    view.sessions = {name: client.sessions[name] for name in servers if name in client.sessions}
+    view.active_sessions = list(view.sessions)
+    return view
+
+def _model_key(llm: Optional[BaseChatModel]) -> str:
+    """Identify a chat model by its configuration, so equivalent instances share cached agents."""
+    if llm is None:
+        return "default"
+    params = getattr(llm, "_identifying_params", None) or {}
+    return f"{type(llm).__name__}:{sorted((str(k), repr(v)) for k, v in dict(params).items())}"
+
+async def get_agent_for_tool_type(client: MCPClient, tool_type: Optional[str], llm: Optional[BaseChatModel] = None) -> MCPAgent:
+    """
+    Return an initialized, cached MCPAgent restricted to the servers and tools
+    routed for `tool_type`; unknown types get every configured server.
+
+    The agent's tool schemas are built once per (route, model config) and reused, and it
+    is rebuilt only if one of its sessions was replaced. Agents are created
+    without memory so requests do not share history; run them with
+    manage_connector=False since the sessions belong to the shared client.
+    """
+    route = resolve_route(tool_type)
+    if route is None:
+        servers = list(client.config.get("mcpServers", {}))
+        allowed = None
+    else:
+        servers, allowed = list(TOOL_ROUTES[route][0]), TOOL_ROUTES[route][1]
+    key = (route or "*", _model_key(llm))
+
+    async with _route_locks.setdefault(key, asyncio.Lock()):
+        status = await ensure_mcp_sessions(servers)
+        servers = [name for name in servers if status.get(name) == "connected"]
+        if not servers:
+            raise RuntimeError(f"No MCP server available for tool type '{tool_type}'")
+        sessions = tuple(client.sessions[name] for name in servers)
+        cached = _route_agents.get(key)
+        if cached is not None and cached[1] == sessions:
+            return cached[0]
+
+        disallowed: list[str] = []
+        if allowed is not None:
+            for session in sessions:
+                disallowed.extend(tool.name for tool in await session.list_tools() if tool.name not in allowed)
+        agent = create_agent(
+            _scoped_client(client, servers),
+            llm=llm,
+            memory_enabled=False,
+            disallowed_tools=disallowed or None,
+        )
+        await agent.initialize()
+        logger.info(f"🧭 Agent for tool type '{route or '*'}' uses servers {servers}")
+        _route_agents[key] = (agent, sessions)
+        return agent
@@ -1,13 +1,16 @@
 import os
 import logging
 import asyncio
-from typing import Optional
+import time
+from typing import Iterable, Optional
 
 
 
-from mcp_use import MCPClient
+from mcp_use import MCPClient, load_config_file
 from app.core.config import settings
 from app.mcp.google_calendar_mcp.server import GoogleCalendarService
+from app.mcp.tracing import TracingMiddleware, connector_ids
+from app.mcp.fake_mcp.app import fake_mcp_config
 
 
 # Disable anonymized telemetry by default unless explicitly enabled in the environment
@@ -19,6 +22,17 @@ logger = logging.getLogger(__name__)
 # --- Get Global Singleton for the MCPClient --- 
 _client_instance: Optional[MCPClient] = None 
 
+# --- Per-server session state: "connected", "disconnected" (not started yet) or "error" ---
+_server_status: dict[str, str] = {}
+_server_errors: dict[str, str] = {}
+_session_locks: dict[str, asyncio.Lock] = {}
+# Consecutive startup failures and when (time.monotonic) a failed server may be retried
+_server_failures: dict[str, int] = {}
+_retry_after: dict[str, float] = {}
+# Bumped each time a server's session is (re)started, so per-session caches can detect a restart
+_session_generations: dict[str, int] = {}
+_auth_task: Optional[asyncio.Task] = None
+
 async def get_mcp_client() -> MCPClient:
     """
         Get the Singleton MCPClient instance . 
@@ -28,11 +42,118 @@ async def get_mcp_client() -> MCPClient:
         raise RuntimeError("MCP client not initialized. Call init_mcp_client() first.")
     return _client_instance
 
+def _configured_servers(client: MCPClient) -> list[str]:
+    return list(client.config.get("mcpServers", {}))
+
+def _eager_servers(client: MCPClient) -> list[str]:
+    configured = _configured_servers(client)
+    eager = settings.MCP_EAGER_SERVERS.strip()
+    if eager == "*":
+        return configured
+    wanted = {name.strip() for name in eager.split(",") if name.strip()}
+    unknown = wanted.difference(configured)
+    if unknown:
+        logger.warning(f"⚠️ MCP_EAGER_SERVERS lists unknown servers: {sorted(unknown)}")
+    return [name for name in configured if name in wanted]
+
+def _cooling_down(name: str) -> bool:
+    """A failed server is not retried until its backoff has elapsed."""
+    return _server_status.get(name) == "error" and time.monotonic() < _retry_after.get(name, 0.0)
+
+def _record_failure(name: str, error: str) -> None:
+    failures = _server_failures[name] = _server_failures.get(name, 0) + 1
+    delay = min(settings.MCP_RETRY_BACKOFF * 2 ** (failures - 1), settings.MCP_RETRY_BACKOFF_MAX)
+    _retry_after[name] = time.monotonic() + delay
+    _server_status[name] = "error"
+    _server_errors[name] = error
+    logger.error(f"❌ MCP server '{name}' {error}; next retry in {delay:.0f}s")
+
+async def _start_session(client: MCPClient, name: str) -> bool:
+    """
+        Create one server session, bounded by its startup timeout.
+        Failures are recorded in the per-server status instead of raised, and
+        the server is not retried until its backoff has elapsed.
+    """
+    lock = _session_locks.setdefault(name, asyncio.Lock())
+    async with lock:
+        if _server_status.get(name) == "connected" and name in client.sessions:
+            return True
+        # Requests that queued behind a failing attempt fail fast instead of retrying it
+        if _cooling_down(name):
+            return False
+        server_config = client.config.get("mcpServers", {}).get(name, {})
+        timeout = float(server_config.get("startupTimeout", settings.MCP_SESSION_TIMEOUT))
+        started = asyncio.get_running_loop().time()
+        try:
+            await asyncio.wait_for(client.create_session(name), timeout=timeout)
+        except asyncio.TimeoutError:
+            _record_failure(name, f"startup timed out after {timeout:.0f}s")
+            return False
+        except Exception as e:
+            _record_failure(name, f"failed to start: {e}")
+            return False
+        _server_status[name] = "connected"
+        _server_errors.pop(name, None)
+        _server_failures.pop(name, None)
+        _retry_after.pop(name, None)
+        _session_generations[name] = _session_generations.get(name, 0) + 1
+        logger.info(f"✅ MCP server '{name}' started in {asyncio.get_running_loop().time() - started:.2f}s")
+        return True
+
+async def ensure_mcp_sessions(names: Optional[Iterable[str]] = None) -> dict[str, str]:
+    """
+        Start the sessions for `names` (default: every configured server) that
+        are not running yet, concurrently. Servers that failed recently are
+        skipped until their backoff elapses. Returns the status of each requested server.
+    """
+    client = await get_mcp_client()
+    names = list(names) if names is not None else _configured_servers(client)
+    pending = [name for name in names if _server_status.get(name) != "connected" and not _cooling_down(name)]
+    if pending:
+        await asyncio.gather(*(_start_session(client, name) for name in pending))
+    return {name: _server_status.get(name, "disconnected") for name in names}
+
+def session_generation(name: str) -> int:
+    """How many times the session for `name` has been started; changes on every restart."""
+    return _session_generations.get(name, 0)
+
+def get_mcp_status() -> dict:
+    """
+        Overall and per-server MCP health for the health endpoint.
+    """
+    if _client_instance is None:
+        return {"status": "disconnected", "servers": {}, "errors": {}}
+    servers = {name: _server_status.get(name, "disconnected") for name in _configured_servers(_client_instance)}
+    if any(status == "error" for status in servers.values()):
+        overall = "error"
+    elif any(status == "connected" for status in servers.values()):
+        overall = "connected"
+    else:
+        overall = "disconnected"
+    return {"status": overall, "servers": servers, "errors": dict(_server_errors)}
+
+async def _authenticate_google() -> None:
+    # --- Check for google credentials, off the event loop (token refresh/OAuth flow block) ---
+    try:
+        google_auth = await asyncio.to_thread(GoogleCalendarService().authenticate)
+    except Exception as e:
+        logger.warning(f"⚠️ Google Calendar authentication failed during MCPClient initialization: {e}")
+        return
+    if not google_auth:
+        logger.warning("⚠️ Google Calendar authentication failed during MCPClient initialization.")
+        return
+    logger.info("✅ Google Calendar authenticated successfully.")
+
 async def initialize_mcp_client() -> MCPClient:
     """
         Initialize the singleton MCPClient from config. 
+
+        Eager servers (MCP_EAGER_SERVERS) are started concurrently, each with its
+        own timeout; a server that fails is reported by get_mcp_status() and
+        retried on a later use, after a backoff, instead of failing startup. Other servers start lazily
+        through ensure_mcp_sessions().
     """
-    global _client_instance
+    global _client_instance, _auth_task
 
     if _client_instance is not None:
         logger.warning("MCPClient already initialized. Skipping.")
@@ -40,37 +161,53 @@ async def initialize_mcp_client() -> MCPClient:
     logger.info("🚀 Initializing MCPClient...")
     try:
         # --- Create Client form Config file --- 
-        client = MCPClient.from_config_file(settings.mcp_config_path)
-        # --- Health Check : Create All Sessions --- 
-        r = await client.create_all_sessions()
-        logger.info(f"MCPClient sessions created with result: {r}")
-        
-        # --- Check for google credentials ---
-        google_auth = GoogleCalendarService().authenticate()
-        if not google_auth:
-            logger.warning("⚠️ Google Calendar authentication failed during MCPClient initialization.")
-        logger.info("✅ Google Calendar authenticated successfully.")
-        
-        # --- Store as singleton --- *
-        _client_instance = client
-        logger.info("✅ MCPClient initialized and sessions created successfully.")
-        return client
+        if settings.FAKE_MCP:
+            logger.info("🧪 Using fake MCP servers (FAKE_MCP=true)")
+            config = fake_mcp_config(settings.FAKE_MCP_LATENCY)
+        else:
+            config = load_config_file(settings.mcp_config_path)
+        client = MCPClient(config=config, middleware=[TracingMiddleware(connector_ids(config))])
     except Exception as e:
         logger.error(f"❌ Failed to initialize MCPClient: {e}")
         raise RuntimeError(f"MCPClient initialization failed: {e}")
-    
-    
+
+    # --- Store as singleton --- *
+    _client_instance = client
+    _server_status.clear()
+    _server_errors.clear()
+    _server_failures.clear()
+    _retry_after.clear()
+
+    # --- Google auth runs in a worker thread alongside session startup ---
+    if not settings.FAKE_MCP:
+        _auth_task = asyncio.create_task(_authenticate_google())
+
+    # --- Health Check : Start eager sessions concurrently ---
+    eager = _eager_servers(client)
+    r = await ensure_mcp_sessions(eager)
+    logger.info(f"MCPClient sessions started with result: {r}")
+    lazy = [name for name in _configured_servers(client) if name not in eager]
+    if lazy:
+        logger.info(f"Deferring MCP servers until first use: {lazy}")
+    logger.info("✅ MCPClient initialized.")
+    return client
+
+
 async def close_mcp_client(timeout: float = 5.0) -> None:
     """
     Gracefully close the MCPClient sessions.
     This should be called during app shutdown.
     """
-    global _client_instance
-    
+    global _client_instance, _auth_task
+
     if _client_instance is None:
         logger.warning("MCPClient not initialized. Nothing to close.")
         return
-    
+
+    if _auth_task is not None and not _auth_task.done():
+        _auth_task.cancel()
+    _auth_task = None
+
     logger.info("🛑 Closing MCPClient sessions...")
     try:
         # Shield against cancellation and bound the waiting time
@@ -84,4 +221,6 @@ async def close_mcp_client(timeout: float = 5.0) -> None:
     except Exception as e:
         logger.error(f"❌ Error closing MCPClient: {e}")
     finally:
-        _client_instance = None
\ No newline at end of file
+        _client_instance = None
+        _server_status.clear()
+        _server_errors.clear()
@@ -0,0 +1,186 @@
+"""
+Shared OAuth credential handling for the Google MCP servers.
+
+Each token file gets one `GoogleCredentialManager` per process. The manager
+keeps the loaded credentials in memory, writes the token file atomically and
+refreshes the access token on a background thread shortly before it expires,
+so tool calls never wait on an OAuth round trip.
+"""
+
+import os
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+from app.core.logger import logging
+from google.auth.credentials import Credentials as BaseCredentials
+from google.auth.exceptions import RefreshError
+from google.oauth2.credentials import Credentials
+
+logger = logging.getLogger(__name__)
+
+# Refresh this long before expiry; must exceed google-auth's own refresh threshold
+REFRESH_MARGIN_SECONDS = int(os.environ.get("GOOGLE_TOKEN_REFRESH_MARGIN", "600"))
+# Back-off between attempts when a background refresh fails transiently
+REFRESH_RETRY_SECONDS = 60
+
+
+def _auth_request():
+    """google.auth's `requests` transport, imported on the first token refresh rather than at server start."""
+    from google.auth.transport.requests import Request
+
+    return Request()
+
+
+class GoogleCredentialManager:
+    """Loads, caches, persists and proactively refreshes one OAuth token file."""
+
+    def __init__(self, token_path: Path, scopes: list[str], refresh_margin: int = REFRESH_MARGIN_SECONDS):
+        self.token_path = token_path
+        self.scopes = scopes
+        self.refresh_margin = refresh_margin
+        self._creds: Optional[BaseCredentials] = None
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+
+    def get_credentials(self, client_secrets_path: Path, default_secrets_path: Optional[Path] = None) -> BaseCredentials:
+        """Return valid credentials, loading or creating them on first use.
+
+        Only the first call (or a call after the background refresher gave up)
+        touches disk or the network; later calls return the cached object.
+        """
+        with self._lock:
+            if self._creds is None and self.token_path.exists():
+                self._creds = Credentials.from_authorized_user_file(str(self.token_path), self.scopes)
+
+            if not self._creds or not self._creds.valid:
+                if self._creds and getattr(self._creds, "expired", False) and getattr(self._creds, "refresh_token", None):
+                    try:
+                        self._creds.refresh(_auth_request())
+                    except RefreshError as e:
+                        # Revoked or invalid grant: the stored token is useless, ask for consent again
+                        logger.warning(f"Refreshing {self.token_path.name} failed, re-running the OAuth flow: {e}")
+                        self._creds = self._run_oauth_flow(client_secrets_path, default_secrets_path)
+                else:
+                    self._creds = self._run_oauth_flow(client_secrets_path, default_secrets_path)
+                self._save()
+
+            self._ensure_refresher()
+            return self._creds
+
+    def _run_oauth_flow(self, client_secrets_path: Path, default_secrets_path: Optional[Path]) -> BaseCredentials:
+        if not client_secrets_path.exists():
+            env_hint = os.environ.get("GOOGLE_CREDENTIALS_PATH")
+            msg = [
+                "Credentials file not found.",
+                f"Looked for: {client_secrets_path}",
+            ]
+            if env_hint:
+                msg.append("GOOGLE_CREDENTIALS_PATH is set but the file was not found at that path.")
+            msg.append(
+                "Set GOOGLE_CREDENTIALS_PATH to your OAuth client secrets JSON path, "
+                f"or place a 'credentials.json' next to this server at: {default_secrets_path or client_secrets_path}"
+            )
+            raise FileNotFoundError("\n".join(msg))
+
+        # Only needed for interactive consent; keeps oauthlib/requests_oauthlib out of server startup
+        from google_auth_oauthlib.flow import InstalledAppFlow
+
+        flow = InstalledAppFlow.from_client_secrets_file(str(client_secrets_path), self.scopes)
+        return flow.run_local_server(port=0)
+
+    def _save(self) -> None:
+        """Atomically persist the current credentials to the token file."""
+        if not self._creds or not hasattr(self._creds, "to_json"):
+            logger.warning("OAuth credentials could not be serialized; skipping token cache.")
+            return
+        self.token_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.token_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            tmp_path.write_text(getattr(self._creds, "to_json")(), encoding="utf-8")
+            os.replace(tmp_path, self.token_path)
+        except OSError as e:
+            logger.warning(f"Failed to save token to {self.token_path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+    def _seconds_until_refresh(self) -> Optional[float]:
+        expiry: Optional[datetime] = getattr(self._creds, "expiry", None)
+        if expiry is None:
+            return None
+        # google-auth stores expiry as a naive UTC datetime
+        refresh_at = expiry - timedelta(seconds=self.refresh_margin)
+        return max((refresh_at - datetime.utcnow()).total_seconds(), 0.0)
+
+    def _ensure_refresher(self) -> None:
+        if self._refresher is not None and self._refresher.is_alive():
+            return
+        if not getattr(self._creds, "refresh_token", None):
+            return
+        self._stop.clear()
+        self._refresher = threading.Thread(
+            target=self._refresh_loop,
+            name=f"google-token-refresh:{self.token_path.name}",
+            daemon=True,
+        )
+        self._refresher.start()
+
+    def _refresh_loop(self) -> None:
+        while not self._stop.is_set():
+            with self._lock:
+                delay = self._seconds_until_refresh()
+            if delay is None:
+                return
+            if self._stop.wait(delay):
+                return
+            try:
+                creds = self._creds
+                assert creds is not None
+                # The token is still valid here, so refresh without holding the lock
+                # and leave request-path readers unblocked. Refresh mutates the object
+                # in place, so API clients holding it pick up the new token.
+                creds.refresh(_auth_request())
+                with self._lock:
+                    self._save()
+                logger.info(f"Refreshed Google token {self.token_path.name} ahead of expiry")
+            except RefreshError as e:
+                # Revoked or invalid grant: drop the cached credentials and stop. Tool calls
+                # keep using the current access token until it expires; the next call after
+                # that re-authenticates, which re-runs the OAuth flow (see get_credentials).
+                logger.error(f"Background refresh of {self.token_path.name} failed permanently: {e}")
+                with self._lock:
+                    if self._creds is creds:
+                        self._creds = None
+                return
+            except Exception as e:
+                logger.warning(f"Background refresh of {self.token_path.name} failed, retrying: {e}")
+                if self._stop.wait(REFRESH_RETRY_SECONDS):
+                    return
+
+    def stop(self) -> None:
+        """Stop the background refresher."""
+        self._stop.set()
+
+
+_managers: dict[Path, GoogleCredentialManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_credential_manager(token_path: Path, scopes: list[str]) -> GoogleCredentialManager:
+    """Return the process-wide manager for a token file."""
+    key = token_path.resolve()
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = GoogleCredentialManager(token_path, scopes)
+            _managers[key] = manager
+        return manager
+
+
+def stop_all_refreshers() -> None:
+    """Stop every background refresher in this process."""
+    with _managers_lock:
+        for manager in _managers.values():
+            manager.stop()
+
@@ -0,0 +1,113 @@
+"""
+Shared googleapiclient discovery helpers for the Google MCP servers.
+
+`build_service` wraps `googleapiclient.discovery.build` with an on-disk
+discovery-document cache, and `LazyGoogleService` defers building a service
+object until a tool actually uses it.
+"""
+
+import hashlib
+import os
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from app.core.logger import logging
+from googleapiclient.discovery_cache.base import Cache
+
+logger = logging.getLogger(__name__)
+
+DISCOVERY_CACHE_DIR = Path(
+    os.environ.get(
+        "GOOGLE_DISCOVERY_CACHE_DIR",
+        str(Path.home() / ".cache" / "project-x-ai-service" / "discovery"),
+    )
+)
+# Discovery documents change rarely; refetch once a day at most
+DISCOVERY_CACHE_TTL_SECONDS = int(os.environ.get("GOOGLE_DISCOVERY_CACHE_TTL", "86400"))
+
+
+class DiscoveryFileCache(Cache):
+    """File-backed discovery cache shared by every MCP subprocess."""
+
+    def __init__(self, directory: Path = DISCOVERY_CACHE_DIR, ttl: int = DISCOVERY_CACHE_TTL_SECONDS):
+        self.directory = directory
+        self.ttl = ttl
+
+    def _path(self, url: str) -> Path:
+        return self.directory / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+    def get(self, url: str) -> Optional[str]:
+        path = self._path(url)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl:
+                return None
+            return path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def set(self, url: str, content: str) -> None:
+        path = self._path(url)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file first so concurrent readers never see a partial document
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(content, encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write discovery cache for {url}: {e}")
+
+
+_discovery_cache = DiscoveryFileCache()
+
+
+def _use_static_discovery() -> bool:
+    """Bundled discovery documents are used unless explicitly disabled."""
+    return os.environ.get("GOOGLE_API_USE_STATIC_DISCOVERY", "true").lower() not in {"0", "false", "no"}
+
+
+def build_service(service_name: str, version: str, credentials: Any) -> Any:
+    """Build a Google API client, reusing cached discovery documents."""
+    # googleapiclient.discovery pulls in httplib2/uritemplate; import it when the first client is built
+    from googleapiclient.discovery import build
+
+    started = time.perf_counter()
+    service = build(
+        service_name,
+        version,
+        credentials=credentials,
+        cache_discovery=True,
+        cache=_discovery_cache,
+        static_discovery=_use_static_discovery(),
+    )
+    logger.debug(f"Built {service_name} {version} service in {(time.perf_counter() - started) * 1000:.1f} ms")
+    return service
+
+
+class LazyGoogleService:
+    """Descriptor that builds a Google API client on first access.
+
+    The owning object must expose ``creds``. Until credentials are loaded the
+    attribute reads as None; assigning None drops the cached client so it is
+    rebuilt with fresh credentials on next access.
+    """
+
+    def __init__(self, service_name: str, version: str):
+        self.service_name = service_name
+        self.version = version
+        self.attr_name = f"_{service_name}_service"
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.attr_name = f"_{name}"
+
+    def __get__(self, obj: Any, objtype: Optional[type] = None) -> Any:
+        if obj is None:
+            return self
+        service = obj.__dict__.get(self.attr_name)
+        if service is None and getattr(obj, "creds", None) is not None:
+            service = build_service(self.service_name, self.version, obj.creds)
+            obj.__dict__[self.attr_name] = service
+        return service
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        obj.__dict__[self.attr_name] = value
@@ -0,0 +1,162 @@
+"""
+Compact serialization of MCP tool results.
+
+Every MCP server returns tool results as JSON text that ends up in the
+model's context. Results are encoded here with orjson (no indentation),
+optionally projected to the fields the caller asked for, and cut down to
+a per-tool character budget. When a result is cut, a ``_truncated`` marker
+tells the model what was dropped so it can page or narrow the request.
+"""
+
+import os
+from typing import Any, Iterable, Optional
+
+import orjson
+from mcp.types import Tool
+
+DEFAULT_MAX_CHARS = int(os.environ.get("MCP_TOOL_OUTPUT_MAX_CHARS", "20000"))
+# Room left in the budget for the truncation marker itself
+MARKER_RESERVE_CHARS = 256
+
+FIELDS_SCHEMA = {
+    "type": "array",
+    "items": {"type": "string"},
+    "description": "Only return these fields of the result (dot paths into lists/objects, e.g. 'messages.id')"
+}
+
+
+def add_output_options(tools: list[Tool]) -> list[Tool]:
+    """Advertise the shared ``fields`` argument on every tool."""
+    for tool in tools:
+        tool.inputSchema.setdefault("properties", {}).setdefault("fields", FIELDS_SCHEMA)
+    return tools
+
+
+def _field_tree(fields: Iterable[str]) -> dict:
+    tree: dict = {}
+    for path in fields:
+        node = tree
+        for part in path.split('.'):
+            node = node.setdefault(part, {})
+    return tree
+
+
+def project(value: Any, tree: dict) -> Any:
+    """Keep only the paths in ``tree``; lists are projected element-wise."""
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [project(item, tree) for item in value]
+    if isinstance(value, dict):
+        return {key: project(value[key], subtree) for key, subtree in tree.items() if key in value}
+    return value
+
+
+def _dumps(value: Any) -> bytes:
+    return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _largest_list(value: Any, path: tuple = ()) -> Optional[tuple[tuple, list]]:
+    """Find the longest list in a result, with the path leading to it."""
+    best = (path, value) if isinstance(value, list) and len(value) > 1 else None
+    children = value.items() if isinstance(value, dict) else enumerate(value) if isinstance(value, list) else ()
+    for key, child in children:
+        found = _largest_list(child, path + (key,))
+        if found and (best is None or len(found[1]) > len(best[1])):
+            best = found
+    return best
+
+
+def _replace(value: Any, path: tuple, new: Any) -> Any:
+    if not path:
+        return new
+    head, rest = path[0], path[1:]
+    if isinstance(value, dict):
+        return {**value, head: _replace(value[head], rest, new)}
+    copy = list(value)
+    copy[head] = _replace(copy[head], rest, new)
+    return copy
+
+
+def _shorten_strings(value: Any, limit: int) -> Any:
+    if isinstance(value, str) and len(value) > limit:
+        return value[:limit] + f"... [{len(value) - limit} more chars]"
+    if isinstance(value, dict):
+        return {key: _shorten_strings(child, limit) for key, child in value.items()}
+    if isinstance(value, list):
+        return [_shorten_strings(child, limit) for child in value]
+    return value
+
+
+def _longest_string(value: Any) -> int:
+    if isinstance(value, str):
+        return len(value)
+    children = value.values() if isinstance(value, dict) else value if isinstance(value, list) else ()
+    return max((_longest_string(child) for child in children), default=0)
+
+
+def _shorten_to_budget(result: Any, budget: int) -> tuple[Any, Optional[int]]:
+    """Cut strings to the longest common length that fits ``budget``; None if even empty strings don't fit."""
+    low, high = 0, _longest_string(result)
+    if len(_dumps(_shorten_strings(result, low))) > budget:
+        return result, None
+    # Binary search the longest per-string limit that still fits
+    while low < high:
+        mid = (low + high + 1) // 2
+        if len(_dumps(_shorten_strings(result, mid))) <= budget:
+            low = mid
+        else:
+            high = mid - 1
+    return _shorten_strings(result, low), low
+
+
+def _fit(result: Any, max_chars: int) -> tuple[Any, list[dict]]:
+    """Trim the longest lists (keeping a prefix) until the encoding fits."""
+    markers: list[dict] = []
+    for _ in range(8):
+        if len(_dumps(result)) <= max_chars:
+            break
+        found = _largest_list(result)
+        if found is None:
+            break
+        path, items = found
+        # Binary search the longest prefix that fits
+        low, high = 1, len(items) - 1
+        while low < high:
+            mid = (low + high + 1) // 2
+            if len(_dumps(_replace(result, path, items[:mid]))) <= max_chars:
+                low = mid
+            else:
+                high = mid - 1
+        result = _replace(result, path, items[:low])
+        markers.append({'path': '.'.join(str(part) for part in path), 'kept': low, 'total': len(items)})
+    return result, markers
+
+
+def encode_result(result: Any, fields: Optional[list[str]] = None, max_chars: Optional[int] = None) -> str:
+    """Encode a tool result as compact JSON within ``max_chars``."""
+    max_chars = max_chars or DEFAULT_MAX_CHARS
+    if fields:
+        result = project(result, _field_tree(fields))
+
+    encoded = _dumps(result)
+    if len(encoded) <= max_chars:
+        return encoded.decode()
+
+    budget = max(max_chars - MARKER_RESERVE_CHARS, 1)
+    result, markers = _fit(result, budget)
+    if len(_dumps(result)) > budget:
+        shortened, limit = _shorten_to_budget(result, budget)
+        if limit is not None:
+            result = shortened
+            markers.append({'stringsShortenedTo': limit})
+    encoded = _dumps({'_truncated': markers, 'result': result} if not isinstance(result, dict) else {**result, '_truncated': markers})
+    if len(encoded) > max_chars:
+        # Nothing structured left to trim; fall back to a prefix of the encoding
+        text = encoded.decode()
+        return _dumps({'_truncated': {'chars': budget, 'total': len(text)}, 'preview': text[:budget]}).decode()
+    return encoded.decode()
+
+
+def encode_error(error: Exception) -> str:
+    return _dumps({"error": str(error)}).decode()
@@ -0,0 +1,123 @@
+import json
+import logging
+from typing import Any, Optional
+
+from jsonschema import Draft202012Validator
+from mcp_use import MCPClient
+
+from app.mcp.agent import resolve_route
+from app.mcp.client import ensure_mcp_sessions, session_generation
+
+logger = logging.getLogger(__name__)
+
+# --- Direct dispatch: toolType -> (server, tool, payload key -> tool argument) ---
+# A payload is dispatched only if every one of its keys is mapped here and the
+# mapped arguments validate against the tool's inputSchema; anything else goes
+# to the LLM agent, which can interpret free-form or partial payloads. Requests
+# that carry a user instruction always go to the agent: these tools send
+# messages and create events, so the instruction must be able to change them.
+DIRECT_TOOLS: dict[str, tuple[str, str, dict[str, str]]] = {
+    "gmail": ("gmail-mcp", "send-email", {
+        "to": "to", "subject": "subject", "body": "body", "cc": "cc", "bcc": "bcc", "html": "html",
+    }),
+    "slack": ("slack-mcp", "send-message", {
+        "channel": "channel", "message": "text", "text": "text", "threadTs": "threadTs",
+    }),
+    "google-calendar": ("google-calendar", "create-event", {
+        "summary": "summary", "title": "summary", "description": "description", "contents": "description",
+        "startTime": "startTime", "endTime": "endTime", "location": "location",
+        "attendees": "attendees", "timezone": "timezone",
+    }),
+}
+
+# --- Cached tool input schemas: server -> (session generation, tool name -> validator) ---
+_validators: dict[str, tuple[int, dict[str, Draft202012Validator]]] = {}
+
+
+def map_payload(tool_type: Optional[str], payload: Any) -> Optional[tuple[str, str, dict]]:
+    """
+    Translate an expander payload into (server, tool, arguments), or None when
+    the payload is not a plain, fully-mapped object for a direct tool.
+    """
+    route = resolve_route(tool_type)
+    if route not in DIRECT_TOOLS or not isinstance(payload, dict) or not payload:
+        return None
+    server, tool, mapping = DIRECT_TOOLS[route]
+    unmapped = set(payload).difference(mapping)
+    if unmapped:
+        logger.info(f"Direct dispatch skipped for '{route}': unmapped payload keys {sorted(unmapped)}")
+        return None
+    arguments: dict[str, Any] = {}
+    for key, value in payload.items():
+        if value in (None, ""):
+            continue
+        argument = mapping[key]
+        if argument in arguments and arguments[argument] != value:
+            # Two payload keys disagree about one argument; let the agent decide
+            return None
+        arguments[argument] = value
+    return server, tool, arguments
+
+
+async def _validator(server: str, session, tool: str) -> Optional[Draft202012Validator]:
+    generation = session_generation(server)
+    cached = _validators.get(server)
+    if cached is None or cached[0] != generation:
+        # First use, or the session was restarted and its tool schemas may have changed
+        validators = {t.name: Draft202012Validator(t.inputSchema or {"type": "object"}) for t in await session.list_tools()}
+        cached = _validators[server] = (generation, validators)
+    return cached[1].get(tool)
+
+
+async def try_direct_dispatch(client: MCPClient, tool_type: Optional[str], payload: Any,
+                              user_prompt: Optional[str] = None) -> Optional[dict]:
+    """
+    Call the MCP tool for `tool_type` directly when `payload` fully specifies it.
+
+    Returns {"server", "tool", "arguments", "result"} on success, or None when
+    the payload does not qualify (a user instruction to apply, no direct tool,
+    unmapped keys, schema mismatch, server unavailable) so the caller can fall
+    back to the agent.
+    Once the tool has been called, failures (an error reported by the tool, a
+    timeout or a transport error) are returned as a result with "error", since
+    retrying through the agent could repeat a call that already took effect.
+    Exceptions raised by this function happen before the tool is called.
+    """
+    if user_prompt and user_prompt.strip():
+        logger.info("Direct dispatch skipped: the request carries a user instruction for the agent")
+        return None
+    mapped = map_payload(tool_type, payload)
+    if mapped is None:
+        return None
+    server, tool, arguments = mapped
+
+    status = await ensure_mcp_sessions([server])
+    if status.get(server) != "connected":
+        return None
+    session = client.get_session(server)
+
+    validator = await _validator(server, session, tool)
+    if validator is None:
+        logger.warning(f"Direct dispatch skipped: server '{server}' has no tool '{tool}'")
+        return None
+    errors = sorted(validator.iter_errors(arguments), key=lambda e: list(e.path))
+    if errors:
+        logger.info(f"Direct dispatch skipped for '{tool}': {errors[0].message}")
+        return None
+
+    logger.info(f"⚡ Direct dispatch: {server}/{tool}")
+    try:
+        response = await session.call_tool(tool, arguments)
+    except Exception as e:
+        # The call may already have reached Gmail/Slack/Calendar; falling back to the
+        # agent could send the email or create the event a second time
+        logger.warning(f"Direct dispatch of {server}/{tool} failed after the call was issued: {e}")
+        return {"server": server, "tool": tool, "arguments": arguments, "result": {"error": str(e) or type(e).__name__}}
+    text = "".join(getattr(part, "text", "") for part in response.content)
+    try:
+        result = json.loads(text)
+    except ValueError:
+        result = text
+    if getattr(response, "isError", False) and not (isinstance(result, dict) and "error" in result):
+        result = {"error": text}
+    return {"server": server, "tool": tool, "arguments": arguments, "result": result}
@@ -0,0 +1,95 @@
+"""
+Fake MCP server for load testing. It serves the tool list of one of the real
+servers (so schemas and input validation match) and answers every call with a
+canned result after a sampled latency (FAKE_MCP_LATENCY), without touching
+Slack or Google.
+
+    python -m app.mcp.fake_mcp.app slack-mcp
+"""
+
+import asyncio
+import importlib
+import itertools
+import os
+import sys
+from pathlib import Path
+from typing import Any
+
+from mcp.server import Server
+from mcp.server.stdio import stdio_server
+from mcp.types import Tool, TextContent
+from app.core.fakes import Latency
+from app.mcp.common.tool_output import encode_result
+
+# Server name in mcp_config.json -> module whose list_tools() is mirrored
+MIRRORED_SERVERS = {
+    "slack-mcp": "app.mcp.slack_mcp.app",
+    "gmail-mcp": "app.mcp.gmail_mcp.app",
+    "google-calendar": "app.mcp.google_calendar_mcp.app",
+    "google-doc-sheet": "app.mcp.google_doc_sheet_mcp.tool",
+}
+REPO_ROOT = Path(__file__).resolve().parents[3]
+
+
+def fake_mcp_config(latency: str = "0") -> dict:
+    """mcp_use config running one fake server per mirrored server, under the same names."""
+    return {
+        "mcpServers": {
+            name: {
+                "command": sys.executable,
+                "args": ["-m", "app.mcp.fake_mcp.app", name],
+                # stdio servers only inherit a minimal environment
+                "env": {"FAKE_MCP_LATENCY": latency, "PYTHONPATH": str(REPO_ROOT)},
+            }
+            for name in MIRRORED_SERVERS
+        }
+    }
+
+
+def canned_result(server: str, tool: str, call_id: int) -> dict:
+    if tool == "lookup-file":
+        return {"files": []}
+    if tool.startswith(("list-", "search-", "get-free-busy", "get-channel-history", "get-thread-replies")):
+        return {"items": [], "count": 0}
+    if tool.startswith(("read-", "get-")):
+        return {"id": f"fake-{call_id}", "content": ""}
+    return {"id": f"fake-{call_id}", "status": "ok", "url": f"https://fake.invalid/{server}/{call_id}"}
+
+
+def build_server(name: str) -> Server:
+    real = importlib.import_module(MIRRORED_SERVERS[name])
+    latency = Latency(os.environ.get("FAKE_MCP_LATENCY", "0"))
+    call_ids = itertools.count(1)
+    app = Server(f"fake-{name}")
+
+    @app.list_tools()
+    async def list_tools() -> list[Tool]:
+        return await real.list_tools()
+
+    @app.call_tool()
+    async def call_tool(tool: str, arguments: Any) -> list[TextContent]:
+        fields = arguments.pop('fields', None) if arguments else None
+        await asyncio.sleep(latency.sample())
+        return [TextContent(
+            type="text",
+            text=encode_result(canned_result(name, tool, next(call_ids)), fields=fields)
+        )]
+
+    return app
+
+
+async def main(name: str):
+    """Run the fake MCP server"""
+    app = build_server(name)
+    async with stdio_server() as (read_stream, write_stream):
+        await app.run(
+            read_stream,
+            write_stream,
+            app.create_initialization_options()
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2 or sys.argv[1] not in MIRRORED_SERVERS:
+        sys.exit(f"usage: python -m app.mcp.fake_mcp.app {{{','.join(MIRRORED_SERVERS)}}}")
+    asyncio.run(main(sys.argv[1]))
@@ -1,20 +1,23 @@
 import asyncio
-import json
 from typing import Any
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
+from app.mcp.common.tool_output import add_output_options, encode_error, encode_result
 from app.mcp.gmail_mcp.server import GmailService
     
 app = Server("gmail-mcp")
 gmail = GmailService()
 
+# Per-tool output budgets (characters); other tools use the shared default
+TOOL_OUTPUT_BUDGETS = {"get-message": 40000}
+
 
 @app.list_tools()
 async def list_tools() -> list[Tool]:
     """List available Gmail tools"""
-    return [
+    return add_output_options([
         Tool(
             name="send-email",
             description="Send an email via Gmail",
@@ -88,6 +91,15 @@ async def list_tools() -> list[Tool]:
                         "enum": ["minimal", "full", "raw", "metadata"],
                         "description": "Message format",
                         "default": "full"
+                    },
+                    "maxBodyChars": {
+                        "type": "integer",
+                        "description": "Truncate the body to this many characters (optional)"
+                    },
+                    "includeAttachments": {
+                        "type": "boolean",
+                        "description": "Include base64url attachment data in the result",
+                        "default": False
                     }
                 },
                 "required": ["messageId"]
@@ -150,6 +162,72 @@ async def list_tools() -> list[Tool]:
                 "required": ["messageId"]
             }
         ),
+        Tool(
+            name="batch-modify-labels",
+            description="Add or remove labels on many messages in one call (e.g. archive by removing INBOX)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "messageIds": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "IDs of the messages to modify"
+                    },
+                    "addLabels": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Label IDs to add"
+                    },
+                    "removeLabels": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Label IDs to remove"
+                    }
+                },
+                "required": ["messageIds"]
+            }
+        ),
+        Tool(
+            name="batch-trash-messages",
+            description="Move many messages to trash in one call",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "messageIds": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "IDs of the messages to move to trash"
+                    }
+                },
+                "required": ["messageIds"]
+            }
+        ),
+        Tool(
+            name="send-bulk-email",
+            description="Send several emails in one call",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "emails": {
+                        "type": "array",
+                        "description": "Emails to send",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "to": {"type": "string", "description": "Recipient email address"},
+                                "subject": {"type": "string", "description": "Email subject"},
+                                "body": {"type": "string", "description": "Email body content"},
+                                "cc": {"type": "string", "description": "CC email address (optional)"},
+                                "bcc": {"type": "string", "description": "BCC email address (optional)"},
+                                "html": {"type": "boolean", "description": "Whether the body is HTML", "default": False}
+                            },
+                            "required": ["to", "subject", "body"]
+                        }
+                    }
+                },
+                "required": ["emails"]
+            }
+        ),
         Tool(
             name="list-labels",
             description="List all Gmail labels",
@@ -216,15 +294,18 @@ async def list_tools() -> list[Tool]:
                 "required": ["messageId", "body"]
             }
         )
-    ]
+    ])
 
 
 @app.call_tool()
 async def call_tool(name: str, arguments: Any) -> list[TextContent]:
     """Handle tool calls"""
+    # Output projection is shared by every tool and handled by the encoder
+    fields = arguments.pop('fields', None) if arguments else None
     
     # Ensure user is authenticated
-    if not gmail.creds:
+    # Re-authenticate as well once the token has expired without being refreshed
+    if not gmail.creds or not gmail.creds.valid:
         gmail.authenticate()
     
     try:
@@ -246,7 +327,9 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
         elif name == "get-message":
             result = gmail.get_message(
                 message_id=arguments['messageId'],
-                format=arguments.get('format', 'full')
+                format=arguments.get('format', 'full'),
+                max_body_chars=arguments.get('maxBodyChars'),
+                include_attachments=arguments.get('includeAttachments', False)
             )
         elif name == "search-messages":
             result = gmail.search_messages(
@@ -263,6 +346,20 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
                 add_labels=arguments.get('addLabels'),
                 remove_labels=arguments.get('removeLabels')
             )
+        elif name == "batch-modify-labels":
+            result = gmail.batch_modify_labels(
+                message_ids=arguments['messageIds'],
+                add_labels=arguments.get('addLabels'),
+                remove_labels=arguments.get('removeLabels')
+            )
+        elif name == "batch-trash-messages":
+            result = gmail.batch_trash_messages(
+                message_ids=arguments['messageIds']
+            )
+        elif name == "send-bulk-email":
+            result = gmail.send_bulk_emails(
+                emails=arguments['emails']
+            )
         elif name == "list-labels":
             result = gmail.list_labels()
         elif name == "create-draft":
@@ -285,13 +382,13 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
         
         return [TextContent(
             type="text",
-            text=json.dumps(result, indent=2)
+            text=encode_result(result, fields=fields, max_chars=TOOL_OUTPUT_BUDGETS.get(name))
         )]
     
     except Exception as e:
         return [TextContent(
             type="text",
-            text=json.dumps({"error": str(e)}, indent=2)
+            text=encode_error(e)
         )]
 
 
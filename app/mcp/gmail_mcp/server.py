@@ -1,17 +1,15 @@
 import os
 import base64
 from pathlib import Path
-from typing import Any, Optional
+from typing import Optional
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
 from app.core.logger import logging
-from google.auth.transport.requests import Request
 from google.auth.credentials import Credentials as BaseCredentials
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from app.mcp.common.google_credentials import get_credential_manager
+from app.mcp.common.google_discovery import LazyGoogleService
 
 
 # OAuth 2.0 scopes for Gmail
@@ -27,6 +25,11 @@ SCOPES = [
 TOKEN_PATH = Path(__file__).parent / 'tokens' / 'gmail_token.json'
 CREDENTIALS_PATH = Path(__file__).parent / 'tokens' / 'credentials.json'
 
+# users.messages.batchModify accepts at most 1000 ids per call; Google advises
+# keeping HTTP batch requests to 50 calls or fewer for Gmail.
+BATCH_MODIFY_LIMIT = 1000
+HTTP_BATCH_LIMIT = 50
+
 logger.info(f"Using TOKEN_PATH: {TOKEN_PATH}, CREDENTIALS_PATH: {CREDENTIALS_PATH}")
 
 
@@ -56,14 +59,97 @@ def _load_env_file() -> None:
 _load_env_file()
 
 
+def _unique(ids: list[str]) -> list[str]:
+    """Drop repeated IDs, keeping first-seen order (batch request IDs must be unique)."""
+    return list(dict.fromkeys(ids))
+
+
+def _iter_parts(payload: dict):
+    """Yield every MIME part of a message payload, depth-first."""
+    stack = [payload]
+    while stack:
+        part = stack.pop()
+        yield part
+        # Reverse so children come out in document order
+        stack.extend(reversed(part.get('parts', [])))
+
+
+def _is_attachment(part: dict) -> bool:
+    """A part is an attachment when it carries a filename or a detached body."""
+    return bool(part.get('filename')) or bool(part.get('body', {}).get('attachmentId'))
+
+
+def _select_text_part(payload: dict) -> Optional[dict]:
+    """Pick the best readable body part: first text/plain, else first text/html."""
+    html_part = None
+    for part in _iter_parts(payload):
+        if _is_attachment(part) or not part.get('body', {}).get('data'):
+            continue
+        mime_type = part.get('mimeType', '')
+        if mime_type == 'text/plain':
+            return part
+        if mime_type == 'text/html' and html_part is None:
+            html_part = part
+    return html_part
+
+
+def _decode_body(data: str, max_chars: Optional[int] = None) -> tuple[str, bool]:
+    """Decode base64url body data, optionally decoding only a prefix.
+
+    A UTF-8 character is at most 4 bytes, so ``max_chars`` characters need at
+    most ``4 * max_chars`` decoded bytes; only that much of ``data`` is decoded.
+    Returns the text and whether it was truncated.
+    """
+    if not data:
+        return "", False
+    if max_chars is None or max_chars < 0:
+        return base64.urlsafe_b64decode(data).decode('utf-8', errors='replace'), False
+
+    byte_budget = 4 * max_chars
+    encoded_budget = -(-byte_budget // 3) * 4
+    chunk = data[:encoded_budget]
+    # Restore padding stripped by the Gmail API
+    chunk += '=' * (-len(chunk) % 4)
+    text = base64.urlsafe_b64decode(chunk).decode('utf-8', errors='ignore')
+    truncated = len(data) > encoded_budget or len(text) > max_chars
+    return text[:max_chars], truncated
+
+
+def _build_raw_message(
+    to: str,
+    subject: str,
+    body: str,
+    cc: Optional[str] = None,
+    bcc: Optional[str] = None,
+    html: bool = False
+) -> str:
+    """Build a MIME message and return it base64url-encoded for the Gmail API."""
+    message = MIMEMultipart() if html else MIMEText(body)
+    
+    message['To'] = to
+    message['Subject'] = subject
+    
+    if cc:
+        message['Cc'] = cc
+    if bcc:
+        message['Bcc'] = bcc
+    
+    if html:
+        message.attach(MIMEText(body, 'html'))
+    
+    return base64.urlsafe_b64encode(message.as_bytes()).decode('utf-8')
+
+
 class GmailService:
     """Handles Gmail API operations with OAuth authentication"""
     
+    # Google API client, built on first use once credentials are loaded
+    service = LazyGoogleService('gmail', 'v1')
+    
     def __init__(self):
         # Use the broad base credentials interface to satisfy all concrete types
         self.creds: Optional[BaseCredentials] = None
-        # Lazily constructed Google API client
-        self.service: Any = None
+        self.service = None
 
     def _get_credentials_path(self) -> Path:
         """Resolve OAuth client secrets path.
@@ -82,44 +168,17 @@ class GmailService:
         """
         Authenticate user using OAuth 2.0 flow.
         Returns True if authentication successful.
+
+        Credentials are cached per token file and refreshed in the background
+        before they expire (see app.mcp.common.google_credentials).
         """
-        # Load existing credentials if available
-        if TOKEN_PATH.exists():
-            self.creds = Credentials.from_authorized_user_file(str(TOKEN_PATH), SCOPES)
-        
-        # Refresh or initiate OAuth flow
-        if not self.creds or not self.creds.valid:
-            if self.creds and getattr(self.creds, "expired", False) and getattr(self.creds, "refresh_token", None):
-                self.creds.refresh(Request())
-            else:
-                cred_path = self._get_credentials_path()
-                if not cred_path.exists():
-                    env_hint = os.environ.get("GOOGLE_CREDENTIALS_PATH")
-                    msg = [
-                        "Credentials file not found.",
-                        f"Looked for Gmail credentials at: {cred_path}",
-                    ]
-                    if env_hint:
-                        msg.append("GOOGLE_CREDENTIALS_PATH is set but the file was not found at that path.")
-                    msg.append(
-                        "Set GOOGLE_CREDENTIALS_PATH to your OAuth client secrets JSON path, "
-                        f"or place a 'credentials.json' next to this server at: {CREDENTIALS_PATH}"
-                    )
-                    raise FileNotFoundError("\n".join(msg))
-
-                flow = InstalledAppFlow.from_client_secrets_file(str(cred_path), SCOPES)
-                self.creds = flow.run_local_server(port=0)
-            
-            # Save credentials for next time
-            TOKEN_PATH.parent.mkdir(parents=True, exist_ok=True)
-            if self.creds and hasattr(self.creds, "to_json"):
-                with open(TOKEN_PATH, 'w') as token:
-                    token.write(getattr(self.creds, "to_json")())
-            else:
-                print("Warning: OAuth credentials could not be serialized; skipping token cache.")
-        
-        # Build service
-        self.service = build('gmail', 'v1', credentials=self.creds)
+        creds = get_credential_manager(TOKEN_PATH, SCOPES).get_credentials(
+            self._get_credentials_path(), CREDENTIALS_PATH
+        )
+        if creds is not self.creds:
+            self.creds = creds
+            # Drop any client bound to old credentials; it is rebuilt lazily
+            self.service = None
         
         return True
     
@@ -134,20 +193,7 @@ class GmailService:
     ) -> dict:
         """Send an email"""
         try:
-            message = MIMEMultipart() if html else MIMEText(body)
-            
-            message['To'] = to
-            message['Subject'] = subject
-            
-            if cc:
-                message['Cc'] = cc
-            if bcc:
-                message['Bcc'] = bcc
-            
-            if html:
-                message.attach(MIMEText(body, 'html'))
-            
-            raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode('utf-8')
+            raw_message = _build_raw_message(to, subject, body, cc=cc, bcc=bcc, html=html)
             
             sent_message = self.service.users().messages().send(
                 userId='me',
@@ -218,8 +264,21 @@ class GmailService:
         except HttpError as e:
             raise Exception(f"Failed to list messages: {e}")
     
-    def get_message(self, message_id: str, format: str = 'full') -> dict:
-        """Get a specific message by ID"""
+    def get_message(
+        self,
+        message_id: str,
+        format: str = 'full',
+        max_body_chars: Optional[int] = None,
+        include_attachments: bool = False
+    ) -> dict:
+        """Get a specific message by ID.
+
+        The payload is walked recursively so bodies nested inside multipart
+        containers are found; ``text/plain`` wins over ``text/html``. When
+        ``max_body_chars`` is set only enough of the encoded body is decoded
+        to fill that budget. Attachment bodies are skipped unless
+        ``include_attachments`` is True; their metadata is always returned.
+        """
         try:
             message = self.service.users().messages().get(
                 userId='me',
@@ -227,24 +286,36 @@ class GmailService:
                 format=format
             ).execute()
             
-            headers = message.get('payload', {}).get('headers', [])
+            payload = message.get('payload', {})
+            headers = payload.get('headers', [])
             header_dict = {h['name']: h['value'] for h in headers}
             
-            # Extract body
+            # Extract body from the best text part
             body = ""
-            if 'parts' in message['payload']:
-                for part in message['payload']['parts']:
-                    if part['mimeType'] == 'text/plain':
-                        data = part['body'].get('data', '')
-                        if data:
-                            body = base64.urlsafe_b64decode(data).decode('utf-8')
-                            break
-            else:
-                data = message['payload']['body'].get('data', '')
-                if data:
-                    body = base64.urlsafe_b64decode(data).decode('utf-8')
+            truncated = False
+            text_part = _select_text_part(payload)
+            if text_part is not None:
+                body, truncated = _decode_body(
+                    text_part.get('body', {}).get('data', ''),
+                    max_chars=max_body_chars
+                )
+            
+            attachments = []
+            for part in _iter_parts(payload):
+                if not _is_attachment(part):
+                    continue
+                part_body = part.get('body', {})
+                attachment = {
+                    'filename': part.get('filename', ''),
+                    'mimeType': part.get('mimeType', ''),
+                    'size': part_body.get('size', 0),
+                    'attachmentId': part_body.get('attachmentId')
+                }
+                if include_attachments:
+                    attachment['data'] = self._get_attachment_data(message['id'], part_body)
+                attachments.append(attachment)
             
-            return {
+            result = {
                 'id': message['id'],
                 'threadId': message['threadId'],
                 'labelIds': message.get('labelIds', []),
@@ -253,10 +324,29 @@ class GmailService:
                 'to': header_dict.get('To', ''),
                 'subject': header_dict.get('Subject', ''),
                 'date': header_dict.get('Date', ''),
-                'body': body
+                'body': body,
+                'attachments': attachments
             }
+            if truncated:
+                result['bodyTruncated'] = True
+            return result
         except HttpError as e:
             raise Exception(f"Failed to get message: {e}")
+
+    def _get_attachment_data(self, message_id: str, part_body: dict) -> str:
+        """Return the base64url data of an attachment, fetching it if not inlined"""
+        data = part_body.get('data')
+        if data:
+            return data
+        attachment_id = part_body.get('attachmentId')
+        if not attachment_id:
+            return ''
+        attachment = self.service.users().messages().attachments().get(
+            userId='me',
+            messageId=message_id,
+            id=attachment_id
+        ).execute()
+        return attachment.get('data', '')
     
     def search_messages(self, query: str, max_results: int = 10) -> dict:
         """Search messages using Gmail query syntax"""
@@ -305,6 +395,121 @@ class GmailService:
         except HttpError as e:
             raise Exception(f"Failed to modify labels: {e}")
     
+    def _execute_batch(self, requests: list) -> tuple[dict, dict]:
+        """Execute (key, HttpRequest) pairs through HTTP batch requests.
+
+        Returns two dicts keyed by request key: successful responses and
+        error messages.
+        """
+        responses: dict = {}
+        errors: dict = {}
+
+        def _callback(request_id, response, exception):
+            if exception is not None:
+                errors[request_id] = str(exception)
+            else:
+                responses[request_id] = response
+
+        # A repeated key would make batch.add raise and fail the whole call; keep the first
+        seen: set = set()
+        requests = [(key, request) for key, request in requests if not (key in seen or seen.add(key))]
+        for start in range(0, len(requests), HTTP_BATCH_LIMIT):
+            batch = self.service.new_batch_http_request(callback=_callback)
+            for key, request in requests[start:start + HTTP_BATCH_LIMIT]:
+                batch.add(request, request_id=key)
+            batch.execute()
+        return responses, errors
+
+    def batch_modify_labels(
+        self,
+        message_ids: list[str],
+        add_labels: Optional[list[str]] = None,
+        remove_labels: Optional[list[str]] = None
+    ) -> dict:
+        """Add or remove labels on many messages using users.messages.batchModify"""
+        try:
+            message_ids = _unique(message_ids)
+            body = {}
+            if add_labels:
+                body['addLabelIds'] = add_labels
+            if remove_labels:
+                body['removeLabelIds'] = remove_labels
+            
+            for start in range(0, len(message_ids), BATCH_MODIFY_LIMIT):
+                self.service.users().messages().batchModify(
+                    userId='me',
+                    body={**body, 'ids': message_ids[start:start + BATCH_MODIFY_LIMIT]}
+                ).execute()
+            
+            return {
+                'count': len(message_ids),
+                'messageIds': message_ids,
+                'message': 'Labels modified successfully'
+            }
+        except HttpError as e:
+            raise Exception(f"Failed to batch modify labels: {e}")
+
+    def batch_trash_messages(self, message_ids: list[str]) -> dict:
+        """Move many messages to trash using HTTP batch requests"""
+        try:
+            requests = [
+                (message_id, self.service.users().messages().trash(userId='me', id=message_id))
+                for message_id in _unique(message_ids)
+            ]
+            responses, errors = self._execute_batch(requests)
+            
+            return {
+                'trashedCount': len(responses),
+                'trashed': list(responses.keys()),
+                'failed': errors,
+                'message': 'Messages moved to trash' if not errors else 'Some messages could not be moved to trash'
+            }
+        except HttpError as e:
+            raise Exception(f"Failed to batch trash messages: {e}")
+
+    def send_bulk_emails(self, emails: list[dict]) -> dict:
+        """Send several emails using HTTP batch requests.
+
+        Each item accepts the same fields as send_email: to, subject, body and
+        optional cc, bcc, html.
+        """
+        try:
+            requests = []
+            for index, email in enumerate(emails):
+                raw_message = _build_raw_message(
+                    email['to'],
+                    email['subject'],
+                    email['body'],
+                    cc=email.get('cc'),
+                    bcc=email.get('bcc'),
+                    html=email.get('html', False)
+                )
+                requests.append((
+                    str(index),
+                    self.service.users().messages().send(userId='me', body={'raw': raw_message})
+                ))
+            responses, errors = self._execute_batch(requests)
+            
+            results = []
+            for index, email in enumerate(emails):
+                key = str(index)
+                entry = {'to': email['to'], 'subject': email['subject']}
+                if key in responses:
+                    entry['messageId'] = responses[key].get('id')
+                    entry['threadId'] = responses[key].get('threadId')
+                else:
+                    entry['error'] = errors.get(key, 'Unknown error')
+                results.append(entry)
+            
+            return {
+                'sentCount': len(responses),
+                'failedCount': len(errors),
+                'results': results,
+                'message': 'Emails sent successfully' if not errors else 'Some emails could not be sent'
+            }
+        except HttpError as e:
+            raise Exception(f"Failed to send bulk emails: {e}")
+    
     def list_labels(self) -> dict:
         """List all labels"""
         try:
@@ -338,20 +543,7 @@ class GmailService:
     ) -> dict:
         """Create a draft email"""
         try:
-            message = MIMEMultipart() if html else MIMEText(body)
-            
-            message['To'] = to
-            message['Subject'] = subject
-            
-            if cc:
-                message['Cc'] = cc
-            if bcc:
-                message['Bcc'] = bcc
-            
-            if html:
-                message.attach(MIMEText(body, 'html'))
-            
-            raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode('utf-8')
+            raw_message = _build_raw_message(to, subject, body, cc=cc, bcc=bcc, html=html)
             
             draft = self.service.users().drafts().create(
                 userId='me',
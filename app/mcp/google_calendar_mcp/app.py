@@ -1,10 +1,10 @@
-import json
 from typing import Any
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 from app.core.logger import get_logger
+from app.mcp.common.tool_output import add_output_options, encode_error, encode_result
 from app.mcp.google_calendar_mcp.server import GoogleCalendarService
 
 """
@@ -24,11 +24,14 @@ app = Server("google_calendar_mcp")
 gcal = GoogleCalendarService()
 logger.info("Initialized GoogleCalendarService successfully., %s", gcal)
 
+# Per-tool output budgets (characters); other tools use the shared default
+TOOL_OUTPUT_BUDGETS = {"list-events": 30000, "search-events": 30000}
+
 
 @app.list_tools()
 async def list_tools() -> list[Tool]:
     """List available Google Calendar tools"""
-    return [
+    return add_output_options([
         Tool(
             name="list-calendars",
             description="List all accessible Google Calendars",
@@ -60,6 +63,11 @@ async def list_tools() -> list[Tool]:
                     "timeMax": {
                         "type": "string",
                         "description": "End time (ISO 8601 format)"
+                    },
+                    "useCache": {
+                        "type": "boolean",
+                        "description": "Serve from the incrementally synced local cache (covers about six months either side of now; other ranges query the API)",
+                        "default": True
                     }
                 }
             }
@@ -218,16 +226,90 @@ async def list_tools() -> list[Tool]:
                 },
                 "required": ["timeMin", "timeMax"]
             }
+        ),
+        Tool(
+            name="schedule-events",
+            description="Find non-conflicting time slots for several events using free/busy and create them all in one call",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "events": {
+                        "type": "array",
+                        "description": "Events to schedule, placed in the given order",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "summary": {"type": "string", "description": "Event title"},
+                                "durationMinutes": {"type": "integer", "description": "Event length in minutes"},
+                                "attendees": {
+                                    "type": "array",
+                                    "items": {"type": "string"},
+                                    "description": "Attendee email addresses"
+                                },
+                                "description": {"type": "string", "description": "Event description"},
+                                "location": {"type": "string", "description": "Event location"},
+                                "earliestStart": {"type": "string", "description": "Do not start before this time (ISO 8601)"},
+                                "latestEnd": {"type": "string", "description": "Do not end after this time (ISO 8601)"}
+                            },
+                            "required": ["summary", "durationMinutes"]
+                        }
+                    },
+                    "timeMin": {
+                        "type": "string",
+                        "description": "Start of the scheduling window (ISO 8601)"
+                    },
+                    "timeMax": {
+                        "type": "string",
+                        "description": "End of the scheduling window (ISO 8601)"
+                    },
+                    "calendarId": {
+                        "type": "string",
+                        "description": "Organizer calendar ID",
+                        "default": "primary"
+                    },
+                    "timezone": {
+                        "type": "string",
+                        "description": "IANA timezone for working hours and created events",
+                        "default": "UTC"
+                    },
+                    "workStartHour": {
+                        "type": "integer",
+                        "minimum": 0,
+                        "maximum": 23,
+                        "description": "Only schedule at or after this local hour (optional, requires workEndHour)"
+                    },
+                    "workEndHour": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "maximum": 24,
+                        "description": "Only schedule before this local hour; 24 is midnight (optional, requires workStartHour)"
+                    },
+                    "slotMinutes": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "description": "Slot start granularity in minutes",
+                        "default": 15
+                    },
+                    "dryRun": {
+                        "type": "boolean",
+                        "description": "Only return the proposed slots without creating events",
+                        "default": False
+                    }
+                },
+                "required": ["events", "timeMin", "timeMax"]
+            }
         )
-    ]
+    ])
 
 
 @app.call_tool()
 async def call_tool(name: str, arguments: Any) -> list[TextContent]:
     """Handle tool calls"""
+    # Output projection is shared by every tool and handled by the encoder
+    fields = arguments.pop('fields', None) if arguments else None
 
-    # Ensure authentication
-    if not gcal.service:
+    # Ensure authentication, again once the token has expired without being refreshed
+    if not gcal.creds or not gcal.creds.valid:
         gcal.authenticate()
 
     try:
@@ -239,7 +321,8 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
                 calendar_id=arguments.get('calendarId', 'primary'),
                 max_results=arguments.get('maxResults', 10),
                 time_min=arguments.get('timeMin'),
-                time_max=arguments.get('timeMax')
+                time_max=arguments.get('timeMax'),
+                use_cache=arguments.get('useCache', True)
             )
 
         elif name == "create-event":
@@ -286,18 +369,31 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
                 calendar_ids=arguments.get('calendarIds', ['primary'])
             )
 
+        elif name == "schedule-events":
+            result = gcal.schedule_events(
+                events=arguments['events'],
+                time_min=arguments['timeMin'],
+                time_max=arguments['timeMax'],
+                calendar_id=arguments.get('calendarId', 'primary'),
+                timezone=arguments.get('timezone', 'UTC'),
+                work_start_hour=arguments.get('workStartHour'),
+                work_end_hour=arguments.get('workEndHour'),
+                slot_minutes=arguments.get('slotMinutes', 15),
+                dry_run=arguments.get('dryRun', False)
+            )
+
         else:
             raise ValueError(f"Unknown tool: {name}")
 
         return [TextContent(
             type="text",
-            text=json.dumps(result, indent=2)
+            text=encode_result(result, fields=fields, max_chars=TOOL_OUTPUT_BUDGETS.get(name))
         )]
 
     except Exception as e:
         return [TextContent(
             type="text",
-            text=json.dumps({"error": str(e)}, indent=2)
+            text=encode_error(e)
         )]
 
 
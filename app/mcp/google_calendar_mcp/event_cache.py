@@ -0,0 +1,83 @@
+"""
+In-process event cache for a single calendar.
+
+The cache is filled by one full `events.list` sync over a bounded window
+around now and then kept current with Calendar incremental sync
+(`syncToken`), so repeated range queries inside the window are answered
+locally and only changed events are fetched.
+"""
+
+import time
+from datetime import date, datetime, time as dt_time, timezone as dt_timezone, tzinfo
+from typing import Iterable, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from app.mcp.google_calendar_mcp.scheduling import parse_rfc3339
+
+
+def zone(name: Optional[str], default: tzinfo = dt_timezone.utc) -> tzinfo:
+    """ZoneInfo for an IANA name, or `default` when it is missing or unknown."""
+    if not name:
+        return default
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return default
+
+
+def event_bound(boundary: dict, tz: tzinfo = dt_timezone.utc) -> datetime:
+    """Return an event start/end as an aware datetime; all-day dates are midnight in `tz` (the calendar's zone)."""
+    if 'dateTime' in boundary:
+        return parse_rfc3339(boundary['dateTime'])
+    return datetime.combine(date.fromisoformat(boundary['date']), dt_time(), tzinfo=zone(boundary.get('timeZone'), tz))
+
+
+class CalendarEventCache:
+    """Events of one calendar keyed by id, plus the sync token to resume from."""
+
+    def __init__(self, calendar_id: str):
+        self.calendar_id = calendar_id
+        self.events: dict[str, dict] = {}
+        self.sync_token: Optional[str] = None
+        self.synced_at: float = 0.0
+        # [start, end) of the initial full sync; only ranges inside it are complete
+        self.window: Optional[tuple[datetime, datetime]] = None
+        # The calendar's time zone, which anchors all-day events
+        self.time_zone: tzinfo = dt_timezone.utc
+
+    def reset(self) -> None:
+        self.events.clear()
+        self.sync_token = None
+        self.synced_at = 0.0
+        self.window = None
+
+    def covers(self, time_min: datetime, time_max: datetime) -> bool:
+        return self.window is not None and self.window[0] <= time_min and time_max <= self.window[1]
+
+    def apply(self, items: Iterable[dict]) -> int:
+        """Merge a page of events from a sync response; returns how many changed."""
+        changed = 0
+        for item in items:
+            changed += 1
+            if item.get('status') == 'cancelled':
+                self.events.pop(item['id'], None)
+            elif 'start' in item and 'end' in item:
+                self.events[item['id']] = item
+        return changed
+
+    def mark_synced(self, sync_token: Optional[str]) -> None:
+        self.sync_token = sync_token
+        self.synced_at = time.monotonic()
+
+    def is_fresh(self, max_age_seconds: float) -> bool:
+        return self.sync_token is not None and time.monotonic() - self.synced_at < max_age_seconds
+
+    def in_range(self, time_min: datetime, time_max: datetime) -> list[dict]:
+        """Events overlapping [time_min, time_max), ordered by start time."""
+        selected = [
+            (event_bound(event['start'], self.time_zone), event)
+            for event in self.events.values()
+            if event_bound(event['start'], self.time_zone) < time_max and event_bound(event['end'], self.time_zone) > time_min
+        ]
+        selected.sort(key=lambda pair: pair[0])
+        return [event for _, event in selected]
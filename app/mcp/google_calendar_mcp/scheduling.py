@@ -0,0 +1,109 @@
+"""
+Slot finding for bulk scheduling.
+
+Pure functions over (start, end) datetime intervals, used by
+GoogleCalendarService.schedule_events. Busy intervals are merged with a
+sweep over start-sorted intervals, then free gaps are scanned in order.
+"""
+
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from typing import Iterable, Optional
+from zoneinfo import ZoneInfo
+
+Interval = tuple[datetime, datetime]
+
+
+def parse_rfc3339(value: str) -> datetime:
+    """Parse an RFC 3339 timestamp into an aware datetime (naive values are taken as UTC)."""
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dt_timezone.utc)
+    return parsed
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> list[Interval]:
+    """Merge overlapping or touching intervals into a sorted, disjoint list."""
+    merged: list[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _at_hour(day, hour: int, tz) -> datetime:
+    """Local ``hour`` o'clock on ``day``; hour 24 is the next day's midnight."""
+    return datetime.combine(day + timedelta(days=hour // 24), time(hour % 24), tzinfo=tz)
+
+
+def validate_working_hours(start_hour: int, end_hour: int) -> None:
+    if not 0 <= start_hour < end_hour <= 24:
+        raise ValueError(
+            f"Working hours must satisfy 0 <= workStartHour < workEndHour <= 24, got {start_hour} and {end_hour}"
+        )
+
+
+def working_hours_blocks(
+    window_start: datetime,
+    window_end: datetime,
+    start_hour: int,
+    end_hour: int,
+    tz_name: str
+) -> list[Interval]:
+    """Return the time outside working hours within the window as busy intervals."""
+    validate_working_hours(start_hour, end_hour)
+    tz = ZoneInfo(tz_name)
+    first_day = window_start.astimezone(tz).date()
+    last_day = window_end.astimezone(tz).date()
+    blocks: list[Interval] = []
+    day = first_day
+    while day <= last_day:
+        previous_close = _at_hour(day - timedelta(days=1), end_hour, tz)
+        opening = _at_hour(day, start_hour, tz)
+        if previous_close < opening:
+            blocks.append((previous_close, opening))
+        day += timedelta(days=1)
+    last_close = _at_hour(last_day, end_hour, tz)
+    if last_close < window_end:
+        blocks.append((last_close, window_end))
+    return blocks
+
+
+def _align(moment: datetime, window_start: datetime, step: timedelta) -> datetime:
+    """Round ``moment`` up to the next multiple of ``step`` counted from the window start."""
+    offset = moment - window_start
+    remainder = offset % step
+    return moment if not remainder else moment + (step - remainder)
+
+
+def find_slot(
+    busy: list[Interval],
+    window_start: datetime,
+    window_end: datetime,
+    duration: timedelta,
+    step: timedelta = timedelta(minutes=15),
+    earliest: Optional[datetime] = None,
+    latest: Optional[datetime] = None
+) -> Optional[Interval]:
+    """Find the first free slot of ``duration`` in a merged busy list.
+
+    ``busy`` must come from merge_intervals. Slots start on ``step``
+    boundaries from the window start and must fit inside
+    [max(window_start, earliest), min(window_end, latest)].
+    """
+    lower = max(window_start, earliest) if earliest else window_start
+    upper = min(window_end, latest) if latest else window_end
+    cursor = _align(lower, window_start, step)
+    for busy_start, busy_end in busy:
+        if busy_end <= cursor:
+            continue
+        if busy_start >= upper:
+            break
+        if busy_start - cursor >= duration:
+            return cursor, cursor + duration
+        cursor = _align(max(cursor, busy_end), window_start, step)
+    if upper - cursor >= duration:
+        return cursor, cursor + duration
+    return None
@@ -5,17 +5,24 @@ Pure Python class used by the MCP app entrypoint (see app.py).
 
 import os
 from pathlib import Path
-from typing import Any, Optional, cast
-import json
+from typing import Optional
 from datetime import datetime, timedelta
+from itertools import islice
+from zoneinfo import ZoneInfo
 
 from app.core.logger import logging
-from google.auth.transport.requests import Request
 from google.auth.credentials import Credentials as BaseCredentials
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from app.mcp.common.google_credentials import get_credential_manager
+from app.mcp.common.google_discovery import LazyGoogleService
+from app.mcp.google_calendar_mcp.event_cache import CalendarEventCache, zone
+from app.mcp.google_calendar_mcp.scheduling import (
+    find_slot,
+    merge_intervals,
+    parse_rfc3339,
+    validate_working_hours,
+    working_hours_blocks,
+)
 
 logger = logging.getLogger(__name__)
 SCOPES = [
@@ -26,14 +33,32 @@ SCOPES = [
 TOKEN_PATH = Path(__file__).parent / 'tokens' / 'token.json'
 CREDENTIALS_PATH = Path(__file__).parent / 'tokens' / 'credentials.json'
 
+# freebusy.query accepts at most 50 calendars; HTTP batches are capped at 50 calls
+FREEBUSY_MAX_ITEMS = 50
+HTTP_BATCH_LIMIT = 50
+# events.list page size; the API maximum is 2500
+EVENTS_PAGE_SIZE = 250
+# Serve cached events without an incremental sync for this many seconds
+EVENT_CACHE_MAX_AGE = float(os.environ.get("GCAL_EVENT_CACHE_MAX_AGE", "30"))
+# The cache's full sync covers this many days either side of now (recurring events are
+# expanded into instances, so an unbounded sync would walk the calendar's whole history)
+EVENT_CACHE_WINDOW = timedelta(days=float(os.environ.get("GCAL_EVENT_CACHE_WINDOW_DAYS", "183")))
+# Re-run the full sync once the window's end is closer than this
+EVENT_CACHE_WINDOW_MARGIN = timedelta(days=30)
+
 
 class GoogleCalendarService:
     """Google Calendar API wrapper"""
     
+    # Google API client, built on first use once credentials are loaded
+    service = LazyGoogleService('calendar', 'v3')
+    
     def __init__(self):
         # Use the base Credentials type to allow for different credential implementations
         self.creds: Optional[BaseCredentials] = None
-        self.service: Any = None
+        self.service = None
+        # Per-calendar event caches kept current with incremental sync
+        self.event_caches: dict[str, CalendarEventCache] = {}
         self.CREDENTIALS_PATH = CREDENTIALS_PATH
         self.TOKEN_PATH = TOKEN_PATH
         logger.info(f"Raw GOOGLE_CREDENTIALS_PATH from env: {self.CREDENTIALS_PATH}")
@@ -51,46 +76,18 @@ class GoogleCalendarService:
         return CREDENTIALS_PATH
         
     def authenticate(self) -> bool:
-        """Authenticate using OAuth 2.0"""
-        # Load existing credentials
-        if TOKEN_PATH.exists():
-            self.creds = Credentials.from_authorized_user_file(str(TOKEN_PATH), SCOPES)
-        
-        # Refresh or get new credentials
-        if not self.creds or not self.creds.valid:
-            if self.creds and getattr(self.creds, "expired", False) and getattr(self.creds, "refresh_token", None):
-                self.creds.refresh(Request())
-            else:
-                cred_path = self._get_credentials_path()
-                if not cred_path.exists():
-                    env_hint = os.environ.get("GOOGLE_CREDENTIALS_PATH")
-                    msg = [
-                        "Credentials file not found.",
-                        f"Looked for: {cred_path}",
-                    ]
-                    if env_hint:
-                        msg.append("GOOGLE_CREDENTIALS_PATH is set but the file was not found at that path.")
-                    msg.append(
-                        "Set GOOGLE_CREDENTIALS_PATH to your OAuth client secrets JSON path, "
-                        f"or place a 'credentials.json' next to this server at: {CREDENTIALS_PATH}"
-                    )
-                    raise FileNotFoundError("\n".join(msg))
+        """Authenticate using OAuth 2.0.
 
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    str(cred_path), SCOPES
-                )
-                # run_local_server may return different credential implementations; both conform to BaseCredentials
-                self.creds = flow.run_local_server(port=0)
-            
-            # Save credentials
-            TOKEN_PATH.parent.mkdir(parents=True, exist_ok=True)
-            # self.creds is guaranteed non-None here, but cast for pylance to access to_json safely
-            assert self.creds is not None
-            with open(TOKEN_PATH, 'w') as token:
-                token.write(cast(Any, self.creds).to_json())
-        
-        # Build service
-        self.service = build('calendar', 'v3', credentials=self.creds)
+        Credentials are cached per token file and refreshed in the background
+        before they expire (see app.mcp.common.google_credentials).
+        """
+        creds = get_credential_manager(TOKEN_PATH, SCOPES).get_credentials(
+            self._get_credentials_path(), CREDENTIALS_PATH
+        )
+        if creds is not self.creds:
+            self.creds = creds
+            # Drop any client bound to old credentials; it is rebuilt lazily
+            self.service = None
         return True
     
     
@@ -118,14 +115,84 @@ class GoogleCalendarService:
         except HttpError as e:
             raise Exception(f"Failed to list calendars: {e}")
     
+    def _iter_event_pages(self, **params):
+        """Yield events.list responses, following nextPageToken."""
+        page_token = None
+        while True:
+            response = self.service.events().list(pageToken=page_token, **params).execute()
+            yield response
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                return
+
+    def _iter_events(self, **params):
+        """Yield events across all pages of an events.list query."""
+        for page in self._iter_event_pages(**params):
+            yield from page.get('items', [])
+
+    def _sync_calendar(self, calendar_id: str) -> CalendarEventCache:
+        """Bring the cache for a calendar up to date.
+
+        The first call performs a full sync of EVENT_CACHE_WINDOW either side
+        of now; later calls send the stored syncToken and only receive changed
+        or deleted events. An expired token (HTTP 410), or a window that time
+        has nearly moved past, triggers a fresh full sync.
+        """
+        cache = self.event_caches.setdefault(calendar_id, CalendarEventCache(calendar_id))
+        now = datetime.now(ZoneInfo("UTC"))
+        if cache.window is not None and cache.window[1] - now < EVENT_CACHE_WINDOW_MARGIN:
+            cache.reset()
+        if cache.is_fresh(EVENT_CACHE_MAX_AGE):
+            return cache
+
+        params = {'calendarId': calendar_id, 'singleEvents': True, 'maxResults': EVENTS_PAGE_SIZE}
+        if cache.sync_token:
+            # timeMin/timeMax may not be combined with syncToken
+            params['syncToken'] = cache.sync_token
+        else:
+            cache.reset()
+            cache.window = (now - EVENT_CACHE_WINDOW, now + EVENT_CACHE_WINDOW)
+            params['timeMin'] = cache.window[0].isoformat()
+            params['timeMax'] = cache.window[1].isoformat()
+        changed = 0
+        sync_token = None
+        try:
+            for page in self._iter_event_pages(**params):
+                cache.time_zone = zone(page.get('timeZone'), cache.time_zone)
+                changed += cache.apply(page.get('items', []))
+                # Only the last page carries nextSyncToken
+                sync_token = page.get('nextSyncToken', sync_token)
+        except HttpError as e:
+            if getattr(e, 'resp', None) is not None and e.resp.status == 410:
+                logger.info(f"Sync token for {calendar_id} expired; running a full sync")
+                cache.reset()
+                return self._sync_calendar(calendar_id)
+            raise
+        cache.mark_synced(sync_token)
+        logger.debug(f"Synced calendar {calendar_id}: {changed} changed events, {len(cache.events)} cached")
+        return cache
+
+    def _invalidate_cache(self, calendar_id: str) -> None:
+        """Force an incremental sync on the next cached read after a write."""
+        cache = self.event_caches.get(calendar_id)
+        if cache is not None:
+            cache.synced_at = 0.0
+
     def list_events(
         self, 
         calendar_id: str = 'primary',
         max_results: int = 10,
         time_min: Optional[str] = None,
-        time_max: Optional[str] = None
+        time_max: Optional[str] = None,
+        use_cache: bool = True
     ) -> dict:
-        """List events from a calendar"""
+        """List events from a calendar.
+
+        By default events are served from the local calendar cache, which is
+        synced incrementally; ranges outside the cache's window and
+        ``use_cache=False`` query the API directly, walking every page up to
+        ``max_results``.
+        """
         try:
             assert self.service is not None
             # Default to next 7 days if no time range specified
@@ -135,16 +202,21 @@ class GoogleCalendarService:
                 future = datetime.utcnow() + timedelta(days=7)
                 time_max = future.isoformat() + 'Z'
             
-            events_result = self.service.events().list(
-                calendarId=calendar_id,
-                timeMin=time_min,
-                timeMax=time_max,
-                maxResults=max_results,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            events = events_result.get('items', [])
+            events = None
+            if use_cache:
+                cache = self._sync_calendar(calendar_id)
+                range_min, range_max = parse_rfc3339(time_min), parse_rfc3339(time_max)
+                if cache.covers(range_min, range_max):
+                    events = cache.in_range(range_min, range_max)[:max_results]
+            if events is None:
+                events = list(islice(self._iter_events(
+                    calendarId=calendar_id,
+                    timeMin=time_min,
+                    timeMax=time_max,
+                    maxResults=min(max_results, EVENTS_PAGE_SIZE),
+                    singleEvents=True,
+                    orderBy='startTime'
+                ), max_results))
             
             return {
                 'calendar_id': calendar_id,
@@ -205,6 +277,7 @@ class GoogleCalendarService:
                 calendarId=calendar_id,
                 body=event_body
             ).execute()
+            self._invalidate_cache(calendar_id)
             
             return {
                 'id': event['id'],
@@ -252,6 +325,7 @@ class GoogleCalendarService:
                 eventId=event_id,
                 body=event
             ).execute()
+            self._invalidate_cache(calendar_id)
             
             return {
                 'id': updated_event['id'],
@@ -270,6 +344,7 @@ class GoogleCalendarService:
                 calendarId=calendar_id,
                 eventId=event_id
             ).execute()
+            self._invalidate_cache(calendar_id)
             
             return {
                 'event_id': event_id,
@@ -287,15 +362,13 @@ class GoogleCalendarService:
         """Search for events"""
         try:
             assert self.service is not None
-            events_result = self.service.events().list(
+            events = list(islice(self._iter_events(
                 calendarId=calendar_id,
                 q=query,
-                maxResults=max_results,
+                maxResults=min(max_results, EVENTS_PAGE_SIZE),
                 singleEvents=True,
                 orderBy='startTime'
-            ).execute()
-            
-            events = events_result.get('items', [])
+            ), max_results))
             
             return {
                 'query': query,
@@ -344,4 +417,151 @@ class GoogleCalendarService:
             raise Exception(f"Failed to get free/busy info: {e}")
 
 
+    def _query_busy(self, time_min: str, time_max: str, calendar_ids: list[str]) -> tuple[dict, dict]:
+        """Return busy intervals and errors per calendar for the whole window"""
+        busy: dict = {}
+        errors: dict = {}
+        for start in range(0, len(calendar_ids), FREEBUSY_MAX_ITEMS):
+            chunk = calendar_ids[start:start + FREEBUSY_MAX_ITEMS]
+            result = self.service.freebusy().query(body={
+                'timeMin': time_min,
+                'timeMax': time_max,
+                'items': [{'id': cal_id} for cal_id in chunk]
+            }).execute()
+            for cal_id, info in result.get('calendars', {}).items():
+                if info.get('errors'):
+                    errors[cal_id] = [err.get('reason', 'unknown') for err in info['errors']]
+                busy[cal_id] = [
+                    (parse_rfc3339(period['start']), parse_rfc3339(period['end']))
+                    for period in info.get('busy', [])
+                ]
+        return busy, errors
+
+    def schedule_events(
+        self,
+        events: list[dict],
+        time_min: str,
+        time_max: str,
+        calendar_id: str = 'primary',
+        timezone: str = 'UTC',
+        work_start_hour: Optional[int] = None,
+        work_end_hour: Optional[int] = None,
+        slot_minutes: int = 15,
+        dry_run: bool = False
+    ) -> dict:
+        """Find non-conflicting slots for several events and create them.
+
+        Free/busy is fetched once for the organizer calendar and every
+        attendee over [time_min, time_max]. Events are placed greedily in the
+        given order at the earliest slot where the organizer, their attendees
+        and the events already placed are all free, then created through one
+        batch request. Each event accepts summary, durationMinutes and optional
+        attendees, description, location, earliestStart and latestEnd.
+        """
+        try:
+            assert self.service is not None
+            if (work_start_hour is None) != (work_end_hour is None):
+                raise ValueError("workStartHour and workEndHour must be given together")
+            if work_start_hour is not None and work_end_hour is not None:
+                validate_working_hours(work_start_hour, work_end_hour)
+            if slot_minutes < 1:
+                raise ValueError(f"slotMinutes must be at least 1, got {slot_minutes}")
+            window_start = parse_rfc3339(time_min)
+            window_end = parse_rfc3339(time_max)
+            step = timedelta(minutes=slot_minutes)
+
+            calendar_ids = [calendar_id]
+            for event in events:
+                for email in event.get('attendees', []):
+                    if email not in calendar_ids:
+                        calendar_ids.append(email)
+            busy_by_calendar, freebusy_errors = self._query_busy(time_min, time_max, calendar_ids)
+
+            base_busy = list(busy_by_calendar.get(calendar_id, []))
+            if work_start_hour is not None and work_end_hour is not None:
+                base_busy.extend(working_hours_blocks(window_start, window_end, work_start_hour, work_end_hour, timezone))
+
+            tz = ZoneInfo(timezone)
+            placed: list[tuple[dict, datetime, datetime]] = []
+            unscheduled = []
+            for event in events:
+                # The organizer attends every event, so each placed event blocks the rest
+                event_busy = base_busy + [(start, end) for _, start, end in placed]
+                for email in event.get('attendees', []):
+                    event_busy.extend(busy_by_calendar.get(email, []))
+                slot = find_slot(
+                    merge_intervals(event_busy),
+                    window_start,
+                    window_end,
+                    timedelta(minutes=event['durationMinutes']),
+                    step=step,
+                    earliest=parse_rfc3339(event['earliestStart']) if event.get('earliestStart') else None,
+                    latest=parse_rfc3339(event['latestEnd']) if event.get('latestEnd') else None
+                )
+                if slot is None:
+                    unscheduled.append({'summary': event.get('summary', ''), 'reason': 'No free slot in the requested window'})
+                else:
+                    placed.append((event, slot[0], slot[1]))
+
+            scheduled = [
+                {
+                    'summary': event.get('summary', ''),
+                    'start': start.astimezone(tz).isoformat(),
+                    'end': end.astimezone(tz).isoformat(),
+                    'attendees': event.get('attendees', [])
+                }
+                for event, start, end in placed
+            ]
+
+            if not dry_run and placed:
+                created: dict = {}
+                failed: dict = {}
+
+                def _callback(request_id, response, exception):
+                    if exception is not None:
+                        failed[request_id] = str(exception)
+                    else:
+                        created[request_id] = response
+
+                for start in range(0, len(placed), HTTP_BATCH_LIMIT):
+                    batch = self.service.new_batch_http_request(callback=_callback)
+                    for index in range(start, min(start + HTTP_BATCH_LIMIT, len(placed))):
+                        event, slot_start, slot_end = placed[index]
+                        event_body = {
+                            'summary': event.get('summary', ''),
+                            'description': event.get('description', ''),
+                            'start': {'dateTime': slot_start.astimezone(tz).isoformat(), 'timeZone': timezone},
+                            'end': {'dateTime': slot_end.astimezone(tz).isoformat(), 'timeZone': timezone},
+                        }
+                        if event.get('location'):
+                            event_body['location'] = event['location']
+                        if event.get('attendees'):
+                            event_body['attendees'] = [{'email': email} for email in event['attendees']]
+                        batch.add(
+                            self.service.events().insert(calendarId=calendar_id, body=event_body),
+                            request_id=str(index)
+                        )
+                    batch.execute()
+                self._invalidate_cache(calendar_id)
+
+                for index, entry in enumerate(scheduled):
+                    key = str(index)
+                    if key in created:
+                        entry['id'] = created[key].get('id')
+                        entry['htmlLink'] = created[key].get('htmlLink')
+                    else:
+                        entry['error'] = failed.get(key, 'Unknown error')
+
+            return {
+                'calendar_id': calendar_id,
+                'scheduledCount': len(scheduled),
+                'scheduled': scheduled,
+                'unscheduled': unscheduled,
+                'freeBusyErrors': freebusy_errors,
+                'dryRun': dry_run,
+                'message': 'Events scheduled successfully' if not unscheduled else 'Some events could not be scheduled'
+            }
+        except HttpError as e:
+            raise Exception(f"Failed to schedule events: {e}")
+
 # This module intentionally contains only the service class. The MCP server entrypoint lives in app.py.
\ No newline at end of file
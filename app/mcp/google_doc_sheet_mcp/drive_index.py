@@ -0,0 +1,103 @@
+"""
+In-process title index of the user's Google Docs and Sheets.
+
+The index is filled by one full Drive `files.list` and then kept current
+from the Drive `changes` feed, so "does a file with this title exist?"
+is answered locally instead of with a `files.list` search per request.
+"""
+
+import re
+import time
+from typing import Iterable, Optional
+
+DOCUMENT_MIME_TYPE = 'application/vnd.google-apps.document'
+SPREADSHEET_MIME_TYPE = 'application/vnd.google-apps.spreadsheet'
+INDEXED_MIME_TYPES = {
+    'document': DOCUMENT_MIME_TYPE,
+    'spreadsheet': SPREADSHEET_MIME_TYPE,
+}
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_title(title: str) -> str:
+    """Case-fold and collapse whitespace so lookups ignore cosmetic differences."""
+    return _WHITESPACE_RE.sub(' ', title).strip().casefold()
+
+
+class DriveFileIndex:
+    """Docs/Sheets files keyed by id and by normalized title, plus the changes page token."""
+
+    def __init__(self):
+        self.files: dict[str, dict] = {}
+        self.by_title: dict[str, set[str]] = {}
+        self.page_token: Optional[str] = None
+        self.synced_at: float = 0.0
+
+    def reset(self) -> None:
+        self.files.clear()
+        self.by_title.clear()
+        self.page_token = None
+        self.synced_at = 0.0
+
+    def upsert(self, file: dict) -> None:
+        if file.get('trashed') or file.get('mimeType') not in INDEXED_MIME_TYPES.values():
+            self.remove(file['id'])
+            return
+        self.remove(file['id'])
+        self.files[file['id']] = file
+        self.by_title.setdefault(normalize_title(file.get('name', '')), set()).add(file['id'])
+
+    def add_created(self, file_id: str, name: str, mime_type: str, url: str) -> None:
+        """Index a file this process just created, ahead of the changes feed."""
+        self.upsert({
+            'id': file_id,
+            'name': name,
+            'mimeType': mime_type,
+            'modifiedTime': time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime()),
+            'webViewLink': url
+        })
+
+    def remove(self, file_id: str) -> None:
+        previous = self.files.pop(file_id, None)
+        if previous is None:
+            return
+        key = normalize_title(previous.get('name', ''))
+        ids = self.by_title.get(key)
+        if ids is not None:
+            ids.discard(file_id)
+            if not ids:
+                del self.by_title[key]
+
+    def apply(self, changes: Iterable[dict]) -> int:
+        """Merge a page of Drive changes; returns how many were applied."""
+        applied = 0
+        for change in changes:
+            if change.get('changeType', 'file') != 'file':
+                continue
+            applied += 1
+            if change.get('removed') or 'file' not in change:
+                self.remove(change['fileId'])
+            else:
+                self.upsert(change['file'])
+        return applied
+
+    def mark_synced(self, page_token: Optional[str]) -> None:
+        self.page_token = page_token
+        self.synced_at = time.monotonic()
+
+    def is_fresh(self, max_age_seconds: float) -> bool:
+        return self.page_token is not None and time.monotonic() - self.synced_at < max_age_seconds
+
+    def lookup(self, title: str, mime_type: Optional[str] = None, exact: bool = True) -> list[dict]:
+        """Files whose title matches, most recently modified first."""
+        key = normalize_title(title)
+        if exact:
+            ids = self.by_title.get(key, set())
+        else:
+            ids = {file_id for name, file_ids in self.by_title.items() if key in name for file_id in file_ids}
+        matches = [self.files[file_id] for file_id in ids]
+        if mime_type:
+            matches = [file for file in matches if file.get('mimeType') == mime_type]
+        matches.sort(key=lambda file: file.get('modifiedTime', ''), reverse=True)
+        return matches
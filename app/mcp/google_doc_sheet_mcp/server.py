@@ -1,15 +1,16 @@
 import os
 import sys
+from difflib import SequenceMatcher
 from pathlib import Path
 from typing import Any, Optional
 
 from app.core.logger import logging
-from google.auth.transport.requests import Request
 from google.auth.credentials import Credentials as BaseCredentials
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from app.mcp.common.google_credentials import get_credential_manager
+from app.mcp.common.google_discovery import LazyGoogleService
+from app.mcp.google_doc_sheet_mcp.drive_index import DOCUMENT_MIME_TYPE, INDEXED_MIME_TYPES, SPREADSHEET_MIME_TYPE, DriveFileIndex
+from app.mcp.google_doc_sheet_mcp.sheet_writer import ChunkedSheetWriter, chunk_rows, column_letters, split_a1
 
 
 # OAuth 2.0 scopes for Google Docs and Drive
@@ -23,6 +24,11 @@ SCOPES = [
 
 TOKEN_PATH = Path(__file__).parent / 'tokens' / 'token.json'
 CREDENTIALS_PATH = Path(__file__).parent / 'tokens' / 'credentials.json'
+READ_OUTPUTS = ('rows', 'columns', 'csv', 'summary')
+DRIVE_PAGE_SIZE = 1000
+DRIVE_FILE_FIELDS = 'id,name,mimeType,modifiedTime,webViewLink,trashed'
+# Seconds a synced title index is trusted before polling the Drive changes feed
+DRIVE_INDEX_MAX_AGE = float(os.environ.get("GDRIVE_INDEX_MAX_AGE", "30"))
 
 logger.info(f"Using TOKEN_PATH: {TOKEN_PATH}, CREDENTIALS_PATH: {CREDENTIALS_PATH}")
 # Load environment variables from a local .env if present
@@ -49,16 +55,104 @@ def _load_env_file() -> None:
 
 _load_env_file()
 
+def _paragraph_text(paragraph: dict) -> str:
+    """Text of a paragraph, with list items prefixed by an indented bullet."""
+    text = ''.join(
+        element['textRun'].get('content', '')
+        for element in paragraph.get('elements', [])
+        if 'textRun' in element
+    )
+    bullet = paragraph.get('bullet')
+    if bullet is not None:
+        text = '  ' * bullet.get('nestingLevel', 0) + '- ' + text
+    return text
+
+
+def _table_text(table: dict) -> str:
+    """Text of a table, one line per row with cells separated by ' | '."""
+    rows = []
+    for row in table.get('tableRows', []):
+        cells = [
+            ''.join(_iter_blocks(cell.get('content', []))).strip().replace('\n', ' ')
+            for cell in row.get('tableCells', [])
+        ]
+        rows.append(' | '.join(cells))
+    return '\n'.join(rows) + '\n'
+
+
+def _iter_blocks(content: list):
+    """Yield the text of each structural element, recursing into tables and the TOC."""
+    for element in content:
+        if 'paragraph' in element:
+            yield _paragraph_text(element['paragraph'])
+        elif 'table' in element:
+            yield _table_text(element['table'])
+        elif 'tableOfContents' in element:
+            yield ''.join(_iter_blocks(element['tableOfContents'].get('content', [])))
+
+
+def _diff_requests(paragraphs: list[tuple[int, int, str]], target: str) -> list[dict]:
+    """Build the minimal paragraph-level batchUpdate requests turning a body into ``target``.
+
+    ``paragraphs`` are the body's top-level paragraphs as (startIndex,
+    endIndex, text). Hunks are emitted from the end of the document backwards
+    so earlier indices stay valid. The body's final newline cannot be
+    deleted, so hunks touching the last paragraph are anchored on the
+    preceding newline instead.
+    """
+    if not target.endswith('\n'):
+        target += '\n'
+    current_lines = [text for _, _, text in paragraphs]
+    target_lines = target.splitlines(keepends=True)
+    hunks = [
+        opcode for opcode in SequenceMatcher(None, current_lines, target_lines, autojunk=False).get_opcodes()
+        if opcode[0] != 'equal'
+    ]
+
+    requests: list[dict] = []
+    last = len(paragraphs)
+    for _, i1, i2, j1, j2 in reversed(hunks):
+        text = ''.join(target_lines[j1:j2])
+        if i2 < last:
+            start = paragraphs[i1][0]
+            if i1 < i2:
+                requests.append({'deleteContentRange': {'range': {'startIndex': start, 'endIndex': paragraphs[i2 - 1][1]}}})
+            if text:
+                requests.append({'insertText': {'location': {'index': start}, 'text': text}})
+        elif i1 > 0:
+            anchor = paragraphs[i1 - 1][1] - 1
+            if i1 < i2 and paragraphs[-1][1] - 1 > anchor:
+                requests.append({'deleteContentRange': {'range': {'startIndex': anchor, 'endIndex': paragraphs[-1][1] - 1}}})
+            if text:
+                requests.append({'insertText': {'location': {'index': anchor}, 'text': '\n' + text[:-1]}})
+        else:
+            start = paragraphs[0][0]
+            if i1 < i2 and paragraphs[-1][1] - 1 > start:
+                requests.append({'deleteContentRange': {'range': {'startIndex': start, 'endIndex': paragraphs[-1][1] - 1}}})
+            if text[:-1]:
+                requests.append({'insertText': {'location': {'index': start}, 'text': text[:-1]}})
+    return requests
+
+
+def _needs_chunking(values: list[list[Any]]) -> bool:
+    """True when the rows do not fit in a single Sheets request."""
+    chunks = chunk_rows(values)
+    next(chunks, None)
+    return next(chunks, None) is not None
+
+
 class GoogleDocsService:
     """Handles Google Docs API operations with OAuth authentication"""
     
+    # Google API clients, each built on first use once credentials are loaded
+    docs_service = LazyGoogleService('docs', 'v1')
+    drive_service = LazyGoogleService('drive', 'v3')
+    sheets_service = LazyGoogleService('sheets', 'v4')
+    
     def __init__(self):
         # Use the broad base credentials interface to satisfy all concrete types
         self.creds: Optional[BaseCredentials] = None
-        # Lazily constructed Google API clients; annotate as Any to appease type checker
-        self.docs_service: Any = None
-        self.drive_service: Any = None
-        self.sheets_service: Any = None
+        self.drive_index = DriveFileIndex()
 
     def _get_credentials_path(self) -> Path:
         """Resolve OAuth client secrets path.
@@ -77,50 +171,107 @@ class GoogleDocsService:
         """
         Authenticate user using OAuth 2.0 flow.
         Returns True if authentication successful.
+
+        Credentials are cached per token file and refreshed in the background
+        before they expire (see app.mcp.common.google_credentials).
         """
-        # Load existing credentials if available
-        if TOKEN_PATH.exists():
-            # from_authorized_user_file returns oauth2.credentials.Credentials which implements BaseCredentials
-            self.creds = Credentials.from_authorized_user_file(str(TOKEN_PATH), SCOPES)
-        
-        # Refresh or initiate OAuth flow
-        if not self.creds or not self.creds.valid:
-            if self.creds and getattr(self.creds, "expired", False) and getattr(self.creds, "refresh_token", None):
-                self.creds.refresh(Request())
-            else:
-                cred_path = self._get_credentials_path()
-                if not cred_path.exists():
-                    env_hint = os.environ.get("GOOGLE_CREDENTIALS_PATH")
-                    msg = [
-                        "Credentials file not found.",
-                        f"Looked forz: {cred_path}",
-                    ]
-                    if env_hint:
-                        msg.append("GOOGLE_CREDENTIALS_PATH is set but the file was not found at that path.")
-                    msg.append(
-                        "Set GOOGLE_CREDENTIALS_PATH to your OAuth client secrets JSON path, "
-                        f"or place a 'credentials.json' next to this server at: {CREDENTIALS_PATH}"
-                    )
-                    raise FileNotFoundError("\n".join(msg))
-
-                flow = InstalledAppFlow.from_client_secrets_file(str(cred_path), SCOPES)
-                self.creds = flow.run_local_server(port=0)
-            
-            # Save credentials for next time
-            TOKEN_PATH.parent.mkdir(parents=True, exist_ok=True)
-            if self.creds and hasattr(self.creds, "to_json"):
-                with open(TOKEN_PATH, 'w') as token:
-                    token.write(getattr(self.creds, "to_json")())
-            else:
-                # Some credential types may not support to_json; skip caching in that rare case
-                print("Warning: OAuth credentials could not be serialized; skipping token cache.")
-        
-        # Build services
-        self.docs_service = build('docs', 'v1', credentials=self.creds)
-        self.drive_service = build('drive', 'v3', credentials=self.creds)
-        self.sheets_service = build('sheets', 'v4', credentials=self.creds)
+        creds = get_credential_manager(TOKEN_PATH, SCOPES).get_credentials(
+            self._get_credentials_path(), CREDENTIALS_PATH
+        )
+        if creds is not self.creds:
+            self.creds = creds
+            # Drop any clients bound to old credentials; they are rebuilt lazily
+            self.docs_service = None
+            self.drive_service = None
+            self.sheets_service = None
+            # The title index belongs to whichever account the credentials are for
+            self.drive_index.reset()
         
         return True
+
+    def _sync_drive_index(self) -> DriveFileIndex:
+        """Bring the Docs/Sheets title index up to date.
+
+        The first call lists every Doc and Sheet once; later calls read only
+        the Drive changes feed since the stored page token. A rejected token
+        triggers a fresh full listing.
+        """
+        index = self.drive_index
+        if index.is_fresh(DRIVE_INDEX_MAX_AGE):
+            return index
+
+        if index.page_token is None:
+            # Take the start token before listing so changes made during the listing are replayed
+            page_token = self.drive_service.changes().getStartPageToken().execute()['startPageToken']
+            index.reset()
+            mime_filter = ' or '.join(f"mimeType='{mime}'" for mime in INDEXED_MIME_TYPES.values())
+            request = self.drive_service.files().list(
+                q=f"({mime_filter}) and trashed=false",
+                pageSize=DRIVE_PAGE_SIZE,
+                fields=f"nextPageToken, files({DRIVE_FILE_FIELDS})"
+            )
+            while request is not None:
+                response = request.execute()
+                for file in response.get('files', []):
+                    index.upsert(file)
+                request = self.drive_service.files().list_next(request, response)
+            index.mark_synced(page_token)
+            logger.debug(f"Indexed {len(index.files)} Drive files")
+            return index
+
+        page_token = index.page_token
+        changed = 0
+        try:
+            while True:
+                response = self.drive_service.changes().list(
+                    pageToken=page_token,
+                    pageSize=DRIVE_PAGE_SIZE,
+                    spaces='drive',
+                    includeRemoved=True,
+                    fields=f"nextPageToken, newStartPageToken, changes(changeType, fileId, removed, file({DRIVE_FILE_FIELDS}))"
+                ).execute()
+                changed += index.apply(response.get('changes', []))
+                if 'newStartPageToken' in response:
+                    page_token = response['newStartPageToken']
+                    break
+                page_token = response['nextPageToken']
+        except HttpError as e:
+            if getattr(e, 'resp', None) is not None and e.resp.status in (400, 404, 410):
+                logger.info(f"Drive changes token rejected ({e.resp.status}); rebuilding the title index")
+                index.reset()
+                return self._sync_drive_index()
+            raise
+        index.mark_synced(page_token)
+        logger.debug(f"Applied {changed} Drive changes, {len(index.files)} files indexed")
+        return index
+
+    def lookup_file(self, title: str, file_type: Optional[str] = None, exact: bool = True) -> dict:
+        """Find Docs/Sheets by title from the local Drive index.
+
+        Titles are compared case-insensitively with whitespace collapsed;
+        ``exact=False`` matches titles containing ``title``.
+        """
+        if file_type is not None and file_type not in INDEXED_MIME_TYPES:
+            raise ValueError(f"Unsupported file type: {file_type}")
+        try:
+            index = self._sync_drive_index()
+        except HttpError as e:
+            raise Exception(f"Failed to look up file: {e}")
+        kinds = {mime: kind for kind, mime in INDEXED_MIME_TYPES.items()}
+        matches = index.lookup(title, INDEXED_MIME_TYPES.get(file_type), exact=exact)
+        return {
+            'count': len(matches),
+            'files': [
+                {
+                    'id': f['id'],
+                    'name': f['name'],
+                    'type': kinds[f['mimeType']],
+                    'modifiedTime': f.get('modifiedTime'),
+                    'url': f.get('webViewLink')
+                }
+                for f in matches
+            ]
+        }
     
     def create_document(self, title: str, content: str = "") -> dict:
         """Create a new Google Doc"""
@@ -141,44 +292,98 @@ class GoogleDocsService:
                     body={'requests': requests}
                 ).execute()
             
+            url = f"https://docs.google.com/document/d/{doc_id}/edit"
+            self.drive_index.add_created(doc_id, doc['title'], DOCUMENT_MIME_TYPE, url)
             return {
                 'documentId': doc_id,
                 'title': doc['title'],
-                'url': f"https://docs.google.com/document/d/{doc_id}/edit",
+                'url': url,
                 'message': 'Document created successfully'
             }
         except HttpError as e:
             raise Exception(f"Failed to create document: {e}")
     
-    def read_document(self, document_id: str) -> dict:
-        """Read content from a Google Doc"""
+    def read_document(
+        self,
+        document_id: str,
+        max_chars: Optional[int] = None,
+        start_paragraph: int = 0,
+        end_paragraph: Optional[int] = None,
+        start_offset: int = 0
+    ) -> dict:
+        """Read content from a Google Doc.
+
+        Text is gathered from paragraphs, lists, tables and the table of
+        contents and joined once. ``start_paragraph``/``end_paragraph`` select
+        a window of top-level blocks (a table counts as one block) and
+        ``max_chars`` stops extraction once the budget is filled. A block cut
+        by ``max_chars`` is reported as ``nextParagraph`` plus ``nextOffset``
+        (characters already returned from it), which resume with
+        ``start_paragraph``/``start_offset``.
+        """
         try:
-            doc = self.docs_service.documents().get(documentId=document_id).execute()
+            doc = self.docs_service.documents().get(
+                documentId=document_id,
+                fields='documentId,title,revisionId,body(content)'
+            ).execute()
             
-            # Extract text content
             content = doc.get('body', {}).get('content', [])
-            text = ""
+            fragments = []
+            size = 0
+            truncated = False
+            next_paragraph = None
+            next_offset = 0
             
-            for element in content:
-                if 'paragraph' in element:
-                    for text_element in element['paragraph'].get('elements', []):
-                        if 'textRun' in text_element:
-                            text += text_element['textRun'].get('content', '')
+            for index, block in enumerate(_iter_blocks(content)):
+                if index < start_paragraph:
+                    continue
+                offset = start_offset if index == start_paragraph else 0
+                block = block[offset:]
+                if end_paragraph is not None and index >= end_paragraph:
+                    next_paragraph = index
+                    break
+                if max_chars is not None and size + len(block) > max_chars:
+                    fragments.append(block[:max_chars - size])
+                    truncated = True
+                    # Resume inside this block rather than skipping the rest of it
+                    next_paragraph = index
+                    next_offset = offset + max_chars - size
+                    break
+                fragments.append(block)
+                size += len(block)
             
-            return {
+            result = {
                 'documentId': doc['documentId'],
                 'title': doc['title'],
-                'content': text.strip(),
+                'content': ''.join(fragments).strip(),
                 'revisionId': doc['revisionId']
             }
+            if truncated:
+                result['truncated'] = True
+            if next_paragraph is not None:
+                result['nextParagraph'] = next_paragraph
+            if next_offset:
+                result['nextOffset'] = next_offset
+            return result
         except HttpError as e:
             raise Exception(f"Failed to read document: {e}")
     
     def update_document(self, document_id: str, content: str, mode: str = 'append') -> dict:
-        """Update a Google Doc (append or replace)"""
+        """Update a Google Doc (append, replace or diff).
+
+        'diff' compares the current paragraphs with ``content`` and sends only
+        the changed paragraphs in one batchUpdate. Documents with tables or a
+        table of contents fall back to 'replace'.
+        """
         try:
             requests = []
             
+            if mode == 'diff':
+                diff_result = self._diff_update_document(document_id, content)
+                if diff_result is not None:
+                    return diff_result
+                mode = 'replace'
+            
             if mode == 'replace':
                 # Get document to find end index
                 doc = self.docs_service.documents().get(documentId=document_id).execute()
@@ -219,6 +424,44 @@ class GoogleDocsService:
         except HttpError as e:
             raise Exception(f"Failed to update document: {e}")
     
+    def _diff_update_document(self, document_id: str, content: str) -> Optional[dict]:
+        """Apply ``content`` as a paragraph-level diff; None if the body layout is unsupported"""
+        doc = self.docs_service.documents().get(
+            documentId=document_id,
+            fields='revisionId,body(content(startIndex,endIndex,paragraph,table,tableOfContents))'
+        ).execute()
+        
+        paragraphs = []
+        for element in doc.get('body', {}).get('content', []):
+            if 'table' in element or 'tableOfContents' in element:
+                return None
+            if 'paragraph' in element:
+                paragraphs.append((
+                    element['startIndex'],
+                    element['endIndex'],
+                    _paragraph_text({'elements': element['paragraph'].get('elements', [])})
+                ))
+        if not paragraphs:
+            return None
+        
+        requests = _diff_requests(paragraphs, content)
+        if requests:
+            self.docs_service.documents().batchUpdate(
+                documentId=document_id,
+                body={
+                    'requests': requests,
+                    # Fail instead of corrupting the doc if it changed since we read it
+                    'writeControl': {'requiredRevisionId': doc['revisionId']}
+                }
+            ).execute()
+        
+        return {
+            'documentId': document_id,
+            'message': 'Document updated with minimal edits' if requests else 'Document already up to date',
+            'requestCount': len(requests),
+            'url': f"https://docs.google.com/document/d/{document_id}/edit"
+        }
+    
     def search_documents(self, query: str, max_results: int = 10) -> dict:
         """Search for Google Docs by name"""
         try:
@@ -292,11 +535,23 @@ class GoogleDocsService:
             spreadsheet = self.sheets_service.spreadsheets().create(body=spreadsheet_body, fields='spreadsheetId,sheets(properties(sheetId,title))').execute()
             spreadsheet_id = spreadsheet['spreadsheetId']
 
-            # Rename the default first sheet if needed
+            # Rename the default first sheet if needed, and size its grid for large tables
             first_sheet_props = spreadsheet.get('sheets', [{}])[0].get('properties', {})
             first_sheet_id = first_sheet_props.get('sheetId')
             current_title = first_sheet_props.get('title')
-            if first_sheet_id is not None and sheet_name and sheet_name != current_title:
+            chunked = bool(values) and _needs_chunking(values)
+            properties: dict = {}
+            fields = []
+            if sheet_name and sheet_name != current_title:
+                properties['title'] = sheet_name
+                fields.append('title')
+            if chunked:
+                properties['gridProperties'] = {
+                    'rowCount': len(values),
+                    'columnCount': max(len(row) for row in values) or 1
+                }
+                fields.append('gridProperties(rowCount,columnCount)')
+            if first_sheet_id is not None and fields:
                 self.sheets_service.spreadsheets().batchUpdate(
                     spreadsheetId=spreadsheet_id,
                     body={
@@ -305,9 +560,9 @@ class GoogleDocsService:
                                 'updateSheetProperties': {
                                     'properties': {
                                         'sheetId': first_sheet_id,
-                                        'title': sheet_name
+                                        **properties
                                     },
-                                    'fields': 'title'
+                                    'fields': ','.join(fields)
                                 }
                             }
                         ]
@@ -315,7 +570,10 @@ class GoogleDocsService:
                 ).execute()
 
             # Write initial values if provided
-            if values:
+            write_report = None
+            if chunked:
+                write_report = self._sheet_writer().write(spreadsheet_id, f"{sheet_name}!A1", values)
+            elif values:
                 self.sheets_service.spreadsheets().values().update(
                     spreadsheetId=spreadsheet_id,
                     range=f"{sheet_name}!A1",
@@ -323,55 +581,182 @@ class GoogleDocsService:
                     body={'values': values}
                 ).execute()
 
-            return {
+            url = f"https://docs.google.com/spreadsheets/d/{spreadsheet_id}/edit"
+            self.drive_index.add_created(spreadsheet_id, title, SPREADSHEET_MIME_TYPE, url)
+            result = {
                 'spreadsheetId': spreadsheet_id,
                 'title': title,
                 'sheetName': sheet_name,
-                'url': f"https://docs.google.com/spreadsheets/d/{spreadsheet_id}/edit",
+                'url': url,
                 'message': 'Spreadsheet created successfully'
             }
+            if write_report is not None:
+                result.update(write_report)
+                if write_report['failedChunks']:
+                    result['message'] = 'Spreadsheet created; some rows failed to write'
+            return result
         except HttpError as e:
             raise Exception(f"Failed to create sheet: {e}")
 
-    def read_sheet(self, spreadsheet_id: str, range_a1: str) -> dict:
-        """Read values from a Google Sheet range (A1 notation)."""
+    def read_sheet(
+        self,
+        spreadsheet_id: str,
+        range_a1: str,
+        output: str = 'rows',
+        columns: Optional[list[str]] = None,
+        filters: Optional[list[dict]] = None,
+        header: bool = True,
+        max_rows: Optional[int] = None
+    ) -> dict:
+        """Read values from a Google Sheet range (A1 notation).
+
+        With the default 'rows' output and no projection/filters this returns
+        formatted values as nested rows. Otherwise the range is read column-major
+        with unformatted values into typed columns, optionally projected to
+        ``columns`` (header names or letters) and filtered by ``filters``, and
+        returned as 'rows', 'columns', 'csv' or a per-column 'summary'.
+        """
+        if output not in READ_OUTPUTS:
+            raise ValueError(f"Unsupported output: {output}")
         try:
+            if output == 'rows' and not columns and not filters and max_rows is None:
+                result = self.sheets_service.spreadsheets().values().get(
+                    spreadsheetId=spreadsheet_id,
+                    range=range_a1
+                ).execute()
+                values = result.get('values', [])
+                return {
+                    'spreadsheetId': spreadsheet_id,
+                    'range': result.get('range', range_a1),
+                    'majorDimension': result.get('majorDimension', 'ROWS'),
+                    'values': values
+                }
+
             result = self.sheets_service.spreadsheets().values().get(
                 spreadsheetId=spreadsheet_id,
-                range=range_a1
+                range=range_a1,
+                majorDimension='COLUMNS',
+                valueRenderOption='UNFORMATTED_VALUE',
+                dateTimeRenderOption='FORMATTED_STRING'
             ).execute()
-            values = result.get('values', [])
-            return {
-                'spreadsheetId': spreadsheet_id,
-                'range': result.get('range', range_a1),
-                'majorDimension': result.get('majorDimension', 'ROWS'),
-                'values': values
-            }
         except HttpError as e:
             raise Exception(f"Failed to read sheet: {e}")
 
-    def update_sheet(self, spreadsheet_id: str, range_a1: str, values: list[list[Any]], mode: str = 'overwrite', input_mode: str = 'USER_ENTERED') -> dict:
+        _, first_column, _ = split_a1(result.get('range', range_a1))
+        # numpy is only needed once a sheet is actually read
+        from app.mcp.google_doc_sheet_mcp.sheet_reader import SheetTable
+
+        table = SheetTable.from_columns(result.get('values', []), header=header, first_column=first_column)
+        if filters:
+            table = table.filter(filters, first_column)
+        if columns:
+            table = table.project(columns, first_column)
+
+        response = {
+            'spreadsheetId': spreadsheet_id,
+            'range': result.get('range', range_a1),
+            'output': output,
+            'matchedRows': table.row_count
+        }
+        if output == 'summary':
+            response.update(table.summary())
+            return response
+
+        if max_rows is not None and table.row_count > max_rows:
+            table = table.take(slice(0, max_rows))
+            response['truncated'] = True
+        if output == 'columns':
+            response.update(table.to_columns())
+        elif output == 'csv':
+            response['csv'] = table.to_csv()
+        else:
+            data = table.to_columns()['columns']
+            response['values'] = [table.names] + [list(row) for row in zip(*data.values())]
+        return response
+
+    def _sheet_writer(self) -> ChunkedSheetWriter:
+        def _log_progress(written: int, total: int) -> None:
+            logger.info(f"Sheet write progress: {written}/{total} rows")
+        return ChunkedSheetWriter(self.sheets_service, progress=_log_progress)
+
+    def _ensure_grid(self, spreadsheet_id: str, sheet_name: str, rows: int, columns: int) -> None:
+        """Grow a sheet's grid so values.batchUpdate can write up to (rows, columns)."""
+        spreadsheet = self.sheets_service.spreadsheets().get(
+            spreadsheetId=spreadsheet_id,
+            fields='sheets(properties(sheetId,title,gridProperties(rowCount,columnCount)))'
+        ).execute()
+        sheets = spreadsheet.get('sheets', [])
+        title = sheet_name.strip("'")
+        props = next(
+            (sheet['properties'] for sheet in sheets if sheet['properties'].get('title') == title),
+            sheets[0]['properties'] if sheets and not title else None
+        )
+        if props is None:
+            return
+        grid = props.get('gridProperties', {})
+        if grid.get('rowCount', 0) >= rows and grid.get('columnCount', 0) >= columns:
+            return
+        self.sheets_service.spreadsheets().batchUpdate(
+            spreadsheetId=spreadsheet_id,
+            body={
+                'requests': [
+                    {
+                        'updateSheetProperties': {
+                            'properties': {
+                                'sheetId': props['sheetId'],
+                                'gridProperties': {
+                                    'rowCount': max(grid.get('rowCount', 0), rows),
+                                    'columnCount': max(grid.get('columnCount', 0), columns)
+                                }
+                            },
+                            'fields': 'gridProperties(rowCount,columnCount)'
+                        }
+                    }
+                ]
+            }
+        ).execute()
+
+    def update_sheet(
+        self,
+        spreadsheet_id: str,
+        range_a1: str,
+        values: list[list[Any]],
+        mode: str = 'overwrite',
+        input_mode: str = 'USER_ENTERED',
+        start_row: int = 0
+    ) -> dict:
         """Update values in a Google Sheet.
 
         - mode 'overwrite' uses values.update to replace cells in the range
         - mode 'append' uses values.append to add rows after the table
+
+        Tables too large for one request are written in row chunks
+        (values.batchUpdate for overwrite, sequential appends for append).
+        Failed chunks are reported with resumeFromRow, which can be passed
+        back as ``start_row`` to resume.
         """
         try:
+            if _needs_chunking(values[start_row:]):
+                return self._update_sheet_chunked(spreadsheet_id, range_a1, values, mode, input_mode, start_row)
+
             if mode == 'append':
                 result = self.sheets_service.spreadsheets().values().append(
                     spreadsheetId=spreadsheet_id,
                     range=range_a1,
                     valueInputOption=input_mode,
                     insertDataOption='INSERT_ROWS',
-                    body={'values': values}
+                    body={'values': values[start_row:]}
                 ).execute()
                 updated = result.get('updates', {}).get('updatedRows')
             else:
+                if start_row:
+                    sheet, col, row = split_a1(range_a1)
+                    range_a1 = f"{sheet + '!' if sheet else ''}{column_letters(col)}{row + start_row + 1}"
                 result = self.sheets_service.spreadsheets().values().update(
                     spreadsheetId=spreadsheet_id,
                     range=range_a1,
                     valueInputOption=input_mode,
-                    body={'values': values}
+                    body={'values': values[start_row:]}
                 ).execute()
                 updated = result.get('updatedRows')
 
@@ -384,6 +769,53 @@ class GoogleDocsService:
         except HttpError as e:
             raise Exception(f"Failed to update sheet: {e}")
 
+    def _update_sheet_chunked(
+        self,
+        spreadsheet_id: str,
+        range_a1: str,
+        values: list[list[Any]],
+        mode: str,
+        input_mode: str,
+        start_row: int
+    ) -> dict:
+        if mode == 'append':
+            # Appends must stay ordered, so chunks go out one after another
+            updated = 0
+            failed = []
+            for start, end, _ in chunk_rows(values[start_row:]):
+                start += start_row
+                end += start_row
+                try:
+                    result = self.sheets_service.spreadsheets().values().append(
+                        spreadsheetId=spreadsheet_id,
+                        range=range_a1,
+                        valueInputOption=input_mode,
+                        insertDataOption='INSERT_ROWS',
+                        body={'values': values[start:end]}
+                    ).execute()
+                except HttpError as e:
+                    # Later chunks would land out of order, so stop at the first failure
+                    failed.append({'startRow': start, 'endRow': end, 'error': str(e)})
+                    break
+                updated += result.get('updates', {}).get('updatedRows', 0)
+                logger.info(f"Sheet append progress: {end}/{len(values)} rows")
+            report = {'totalRows': len(values), 'writtenRows': updated, 'failedChunks': failed}
+            if failed:
+                report['resumeFromRow'] = failed[0]['startRow']
+        else:
+            sheet, col, row = split_a1(range_a1)
+            width = max((len(r) for r in values), default=1)
+            self._ensure_grid(spreadsheet_id, sheet, row + len(values), col + width)
+            report = self._sheet_writer().write(spreadsheet_id, range_a1, values, input_mode, start_row)
+
+        return {
+            'spreadsheetId': spreadsheet_id,
+            'range': range_a1,
+            'mode': mode,
+            'updatedRows': report['writtenRows'],
+            **report
+        }
+
     def search_sheets(self, query: str, max_results: int = 10) -> dict:
         """Search for Google Sheets by name using Drive API."""
         try:
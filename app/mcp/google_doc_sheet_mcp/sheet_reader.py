@@ -0,0 +1,216 @@
+"""
+Columnar, typed views of Google Sheets values.
+
+Sheets are fetched column-major with UNFORMATTED_VALUE so numbers and
+booleans arrive as JSON numbers/booleans. Each column is turned into one
+NumPy array (float64, int64, bool or object), so projection and row
+filtering work on whole columns. The result can be returned as typed
+columns, CSV text or a per-column summary, all of which are far smaller
+than nested row lists once serialized for the model.
+"""
+
+import csv
+import io
+from typing import Any, Iterable, Optional
+
+import numpy as np
+
+from app.mcp.google_doc_sheet_mcp.sheet_writer import column_index, column_letters
+
+FILTER_OPS = ('eq', 'ne', 'gt', 'gte', 'lt', 'lte', 'contains', 'empty', 'notEmpty')
+SUMMARY_TOP_VALUES = 5
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def typed_column(cells: list[Any], length: int) -> np.ndarray:
+    """Build a typed array from one column of cells, padded to ``length``.
+
+    Empty cells become NaN in numeric columns and None elsewhere.
+    """
+    cells = list(cells[:length]) + [''] * (length - len(cells))
+    present = [cell for cell in cells if cell != '']
+    if present and all(_is_number(cell) for cell in present):
+        if len(present) == length and all(isinstance(cell, int) for cell in present):
+            return np.array(cells, dtype=np.int64)
+        return np.array([np.nan if cell == '' else cell for cell in cells], dtype=np.float64)
+    if present and len(present) == length and all(isinstance(cell, bool) for cell in present):
+        return np.array(cells, dtype=bool)
+    return np.array([None if cell == '' else cell for cell in cells], dtype=object)
+
+
+def column_type(array: np.ndarray) -> str:
+    if array.dtype.kind == 'i':
+        return 'integer'
+    if array.dtype.kind == 'f':
+        return 'number'
+    if array.dtype.kind == 'b':
+        return 'boolean'
+    return 'text'
+
+
+def _missing(array: np.ndarray) -> np.ndarray:
+    if array.dtype.kind == 'f':
+        return np.isnan(array)
+    if array.dtype.kind == 'O':
+        return np.array([value is None for value in array], dtype=bool)
+    return np.zeros(len(array), dtype=bool)
+
+
+class SheetTable:
+    """A sheet range held as named, typed columns."""
+
+    def __init__(self, names: list[str], columns: list[np.ndarray]):
+        self.names = names
+        self.columns = columns
+
+    @classmethod
+    def from_columns(
+        cls,
+        raw_columns: list[list[Any]],
+        header: bool = True,
+        first_column: int = 0
+    ) -> 'SheetTable':
+        """Build a table from column-major values as returned by values.get."""
+        if header:
+            names = [
+                str(column[0]) if column and column[0] != '' else column_letters(first_column + i)
+                for i, column in enumerate(raw_columns)
+            ]
+            bodies = [column[1:] for column in raw_columns]
+        else:
+            names = [column_letters(first_column + i) for i in range(len(raw_columns))]
+            bodies = raw_columns
+        length = max((len(body) for body in bodies), default=0)
+        return cls(names, [typed_column(body, length) for body in bodies])
+
+    @property
+    def row_count(self) -> int:
+        return len(self.columns[0]) if self.columns else 0
+
+    def _resolve(self, column: str | int, first_column: int = 0) -> int:
+        """Find a column by header name, A1 letters or zero-based position."""
+        if isinstance(column, int):
+            return column
+        if column in self.names:
+            return self.names.index(column)
+        if column.isalpha() and column.isupper():
+            index = column_index(column) - first_column
+            if 0 <= index < len(self.columns):
+                return index
+        raise ValueError(f"Unknown column: {column}")
+
+    def project(self, columns: Iterable[str | int], first_column: int = 0) -> 'SheetTable':
+        indexes = [self._resolve(column, first_column) for column in columns]
+        return SheetTable([self.names[i] for i in indexes], [self.columns[i] for i in indexes])
+
+    def filter(self, filters: list[dict], first_column: int = 0) -> 'SheetTable':
+        """Keep rows matching every filter ({column, op, value})."""
+        mask = np.ones(self.row_count, dtype=bool)
+        for spec in filters:
+            op = spec.get('op', 'eq')
+            if op not in FILTER_OPS:
+                raise ValueError(f"Unsupported filter op: {op}")
+            array = self.columns[self._resolve(spec['column'], first_column)]
+            mask &= _match(array, op, spec.get('value'))
+        return self.take(mask)
+
+    def take(self, rows: np.ndarray | slice) -> 'SheetTable':
+        return SheetTable(self.names, [column[rows] for column in self.columns])
+
+    def to_columns(self) -> dict:
+        return {
+            'columns': {name: _to_list(column) for name, column in zip(self.names, self.columns)},
+            'types': {name: column_type(column) for name, column in zip(self.names, self.columns)},
+            'rowCount': self.row_count
+        }
+
+    def to_csv(self) -> str:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow(self.names)
+        writer.writerows(zip(*(_to_list(column, missing='') for column in self.columns)))
+        return buffer.getvalue()
+
+    def summary(self) -> dict:
+        columns = {}
+        for name, column in zip(self.names, self.columns):
+            missing = _missing(column)
+            present = column[~missing]
+            info: dict[str, Any] = {'type': column_type(column), 'count': int(present.size), 'missing': int(missing.sum())}
+            if column.dtype.kind in 'if' and present.size:
+                info.update({
+                    'min': present.min().item(),
+                    'max': present.max().item(),
+                    'mean': round(float(present.mean()), 6),
+                    'sum': present.sum().item()
+                })
+            elif present.size:
+                values, counts = np.unique(present.astype(str), return_counts=True)
+                order = np.argsort(-counts, kind='stable')[:SUMMARY_TOP_VALUES]
+                info['distinct'] = int(values.size)
+                info['top'] = {str(values[i]): int(counts[i]) for i in order}
+            columns[name] = info
+        return {'rowCount': self.row_count, 'columns': columns}
+
+
+def _match(array: np.ndarray, op: str, value: Any) -> np.ndarray:
+    missing = _missing(array)
+    if op == 'empty':
+        return missing
+    if op == 'notEmpty':
+        return ~missing
+    if op == 'contains':
+        needle = str(value).lower()
+        return np.array([item is not None and needle in str(item).lower() for item in array.tolist()], dtype=bool)
+
+    if array.dtype.kind in 'if':
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return np.full(len(array), op == 'ne', dtype=bool)
+        with np.errstate(invalid='ignore'):
+            result = {
+                'eq': array == value,
+                'ne': array != value,
+                'gt': array > value,
+                'gte': array >= value,
+                'lt': array < value,
+                'lte': array <= value,
+            }[op]
+        return result & ~missing if op != 'ne' else result
+
+    if array.dtype.kind == 'b':
+        if isinstance(value, str):
+            value = value.strip().lower() == 'true'
+        # Ordering ops compare as integers (false < true)
+        ints, target = array.astype(np.int8), int(bool(value))
+        return {
+            'eq': ints == target,
+            'ne': ints != target,
+            'gt': ints > target,
+            'gte': ints >= target,
+            'lt': ints < target,
+            'lte': ints <= target,
+        }[op]
+
+    # Text columns compare case-sensitively as strings
+    text = np.array(['' if item is None else str(item) for item in array.tolist()], dtype=object)
+    value = '' if value is None else str(value)
+    if op == 'eq':
+        return (text == value) & ~missing
+    if op == 'ne':
+        return text != value
+    compare = {'gt': np.greater, 'gte': np.greater_equal, 'lt': np.less, 'lte': np.less_equal}[op]
+    return compare(text.astype(str), value) & ~missing
+
+
+def _to_list(array: np.ndarray, missing: Optional[Any] = None) -> list[Any]:
+    """Convert an array to JSON-ready Python values, mapping NaN/None to ``missing``."""
+    if array.dtype.kind == 'f':
+        return [missing if value != value else (int(value) if value.is_integer() else value) for value in array.tolist()]
+    if array.dtype.kind == 'O':
+        return [missing if value is None else value for value in array.tolist()]
+    return array.tolist()
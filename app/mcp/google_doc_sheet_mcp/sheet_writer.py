@@ -0,0 +1,177 @@
+"""
+Chunked writes of large 2D value arrays to Google Sheets.
+
+Rows are split into chunks that stay under the Sheets API payload limits,
+chunks are grouped into `values.batchUpdate` calls, and a group that fails
+is retried one chunk at a time so a single bad request does not sink the
+whole table. Failed chunks are reported with their row offsets so the
+caller can resume with `start_row`.
+"""
+
+import re
+import time
+from typing import Any, Callable, Optional
+
+from app.core.logger import logging
+from googleapiclient.errors import HttpError
+
+logger = logging.getLogger(__name__)
+
+# Google recommends keeping request payloads under 2 MB
+CHUNK_MAX_BYTES = 512 * 1024
+CHUNK_MAX_ROWS = 5000
+BATCH_MAX_BYTES = 2 * 1024 * 1024
+MAX_RETRIES = 3
+RETRY_BASE_DELAY = 1.0
+
+_CELL_RE = re.compile(r'^([A-Za-z]*)(\d*)')
+
+
+def column_index(letters: str) -> int:
+    """Convert column letters to a zero-based index ('A' -> 0, 'AA' -> 26)."""
+    index = 0
+    for char in letters.upper():
+        index = index * 26 + (ord(char) - ord('A') + 1)
+    return index - 1
+
+
+def column_letters(index: int) -> str:
+    """Convert a zero-based column index to letters (0 -> 'A')."""
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+def split_a1(range_a1: str) -> tuple[str, int, int]:
+    """Return (sheet name, zero-based column, zero-based row) of a range's top-left cell."""
+    sheet, _, cells = range_a1.rpartition('!')
+    if not sheet:
+        # A bare name such as 'Sheet1' or 'Tab' refers to the whole sheet; 'B2', 'A1:C9', 'A:C'
+        # and 'B:B' are cells. Bare letters need a row or a colon to be cells; a sheet whose name
+        # looks like a cell ('Q1') must be written as "'Q1'!A1", as the Sheets API itself requires.
+        if not re.fullmatch(r'[A-Za-z]{1,3}\d+|[A-Za-z]{1,3}\d*:[A-Za-z]{1,3}\d*', range_a1):
+            return range_a1, 0, 0
+        sheet, cells = '', range_a1
+    letters, digits = _CELL_RE.match(cells.split(':')[0]).groups()
+    col = column_index(letters) if letters else 0
+    row = int(digits) - 1 if digits else 0
+    return sheet, col, row
+
+
+def _row_bytes(row: list[Any]) -> int:
+    """Rough JSON size of a row: each value plus quotes and a separator."""
+    return sum(len(str(value)) + 3 for value in row) + 2
+
+
+def chunk_rows(values: list[list[Any]], max_rows: int = CHUNK_MAX_ROWS, max_bytes: int = CHUNK_MAX_BYTES):
+    """Yield (start, end, size) row slices that respect the row and byte limits."""
+    start = 0
+    size = 0
+    for index, row in enumerate(values):
+        row_size = _row_bytes(row)
+        if index > start and (index - start >= max_rows or size + row_size > max_bytes):
+            yield start, index, size
+            start, size = index, 0
+        size += row_size
+    if start < len(values):
+        yield start, len(values), size
+
+
+class ChunkedSheetWriter:
+    """Writes a 2D array to a sheet in bounded, individually retried chunks."""
+
+    def __init__(
+        self,
+        sheets_service: Any,
+        progress: Optional[Callable[[int, int], None]] = None,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self.sheets_service = sheets_service
+        self.progress = progress
+        self.sleep = sleep
+
+    def _chunk_range(self, sheet: str, col: int, row: int, width: int, height: int) -> str:
+        start = f"{column_letters(col)}{row + 1}"
+        end = f"{column_letters(col + max(width, 1) - 1)}{row + height}"
+        prefix = f"{sheet}!" if sheet else ''
+        return f"{prefix}{start}:{end}"
+
+    def _batch_update(self, spreadsheet_id: str, data: list[dict], input_mode: str) -> None:
+        self.sheets_service.spreadsheets().values().batchUpdate(
+            spreadsheetId=spreadsheet_id,
+            body={'valueInputOption': input_mode, 'data': data}
+        ).execute()
+
+    def _write_with_retry(self, spreadsheet_id: str, entry: dict, input_mode: str) -> Optional[str]:
+        """Write one chunk, retrying with exponential backoff; returns an error message on failure."""
+        for attempt in range(MAX_RETRIES):
+            try:
+                self._batch_update(spreadsheet_id, [entry], input_mode)
+                return None
+            except HttpError as e:
+                error = str(e)
+                logger.warning(f"Chunk {entry['range']} failed (attempt {attempt + 1}/{MAX_RETRIES}): {e}")
+                if attempt + 1 < MAX_RETRIES:
+                    self.sleep(RETRY_BASE_DELAY * 2 ** attempt)
+        return error
+
+    def write(
+        self,
+        spreadsheet_id: str,
+        range_a1: str,
+        values: list[list[Any]],
+        input_mode: str = 'USER_ENTERED',
+        start_row: int = 0
+    ) -> dict:
+        """Write ``values[start_row:]`` at their offsets below the range's top-left cell."""
+        sheet, col, row = split_a1(range_a1)
+        total = len(values)
+        written = start_row
+        failed: list[dict] = []
+
+        group: list[tuple[int, int, dict]] = []
+        group_size = 0
+
+        def _flush() -> None:
+            nonlocal written, group_size
+            if not group:
+                return
+            try:
+                self._batch_update(spreadsheet_id, [entry for _, _, entry in group], input_mode)
+                written += sum(end - start for start, end, _ in group)
+            except HttpError as e:
+                logger.warning(f"Batch of {len(group)} chunks failed, retrying individually: {e}")
+                for start, end, entry in group:
+                    error = self._write_with_retry(spreadsheet_id, entry, input_mode)
+                    if error is None:
+                        written += end - start
+                    else:
+                        failed.append({'startRow': start, 'endRow': end, 'range': entry['range'], 'error': error})
+            if self.progress:
+                self.progress(written, total)
+            group.clear()
+            group_size = 0
+
+        for start, end, size in chunk_rows(values[start_row:]):
+            start += start_row
+            end += start_row
+            chunk = values[start:end]
+            width = max((len(r) for r in chunk), default=1)
+            entry = {'range': self._chunk_range(sheet, col, row + start, width, end - start), 'values': chunk}
+            if group and group_size + size > BATCH_MAX_BYTES:
+                _flush()
+            group.append((start, end, entry))
+            group_size += size
+        _flush()
+
+        result = {
+            'totalRows': total,
+            'writtenRows': written - start_row,
+            'failedChunks': failed,
+        }
+        if failed:
+            result['resumeFromRow'] = min(chunk['startRow'] for chunk in failed)
+        return result
@@ -1,21 +1,24 @@
 import asyncio
-import json
 from typing import Any
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
+from app.mcp.common.tool_output import add_output_options, encode_error, encode_result
 from app.mcp.google_doc_sheet_mcp.server import GoogleDocsService
     
 # Initialize MCP server and Google Docs/Sheets service
 app = Server("google-docs-mcp")
 gdocs = GoogleDocsService()
 
+# Per-tool output budgets (characters); other tools use the shared default
+TOOL_OUTPUT_BUDGETS = {"read-document": 60000, "read-sheet": 60000}
+
 
 @app.list_tools()
 async def list_tools() -> list[Tool]:
     """List available Google Docs & Sheets tools"""
-    return [
+    return add_output_options([
         Tool(
             name="create-document",
             description="Create a new Google Doc",
@@ -43,6 +46,26 @@ async def list_tools() -> list[Tool]:
                     "documentId": {
                         "type": "string",
                         "description": "The ID of the document to read"
+                    },
+                    "maxChars": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "description": "Stop reading after this many characters (optional)"
+                    },
+                    "startParagraph": {
+                        "type": "integer",
+                        "description": "Index of the first top-level block to return",
+                        "default": 0
+                    },
+                    "endParagraph": {
+                        "type": "integer",
+                        "description": "Index of the block to stop before (optional)"
+                    },
+                    "startOffset": {
+                        "type": "integer",
+                        "minimum": 0,
+                        "description": "Characters to skip in the first block; pass nextOffset from a truncated read together with nextParagraph",
+                        "default": 0
                     }
                 },
                 "required": ["documentId"]
@@ -64,14 +87,38 @@ async def list_tools() -> list[Tool]:
                     },
                     "mode": {
                         "type": "string",
-                        "enum": ["append", "replace"],
-                        "description": "Whether to append or replace content",
+                        "enum": ["append", "replace", "diff"],
+                        "description": "Whether to append, replace, or diff (only send changed paragraphs) content",
                         "default": "append"
                     }
                 },
                 "required": ["documentId", "content"]
             }
         ),
+        Tool(
+            name="lookup-file",
+            description="Find Google Docs or Sheets by exact title from a local Drive index (faster than search-documents/search-sheets)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "title": {
+                        "type": "string",
+                        "description": "Title to look up (case-insensitive)"
+                    },
+                    "type": {
+                        "type": "string",
+                        "enum": ["document", "spreadsheet"],
+                        "description": "Restrict to Docs or Sheets (optional)"
+                    },
+                    "exact": {
+                        "type": "boolean",
+                        "description": "Require the whole title to match; false matches titles containing it",
+                        "default": True
+                    }
+                },
+                "required": ["title"]
+            }
+        ),
         Tool(
             name="search-documents",
             description="Search for Google Docs by name",
@@ -127,12 +174,38 @@ async def list_tools() -> list[Tool]:
         ),
         Tool(
             name="read-sheet",
-            description="Read values from a Google Sheet range (A1)",
+            description="Read values from a Google Sheet range (A1), optionally as typed columns, CSV or a summary with column projection and row filters",
             inputSchema={
                 "type": "object",
                 "properties": {
                     "spreadsheetId": {"type": "string", "description": "Spreadsheet ID"},
-                    "range": {"type": "string", "description": "A1 range, e.g., Sheet1!A1:C10"}
+                    "range": {"type": "string", "description": "A1 range, e.g., Sheet1!A1:C10"},
+                    "output": {
+                        "type": "string",
+                        "enum": ["rows", "columns", "csv", "summary"],
+                        "description": "rows: nested rows; columns: typed columns; csv: CSV text; summary: per-column stats",
+                        "default": "rows"
+                    },
+                    "columns": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Only return these columns (header names or letters)"
+                    },
+                    "filters": {
+                        "type": "array",
+                        "description": "Keep rows matching all filters",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "column": {"type": "string", "description": "Header name or column letters"},
+                                "op": {"type": "string", "enum": ["eq", "ne", "gt", "gte", "lt", "lte", "contains", "empty", "notEmpty"], "default": "eq"},
+                                "value": {"description": "Value to compare against"}
+                            },
+                            "required": ["column"]
+                        }
+                    },
+                    "header": {"type": "boolean", "description": "Treat the first row as column names", "default": True},
+                    "maxRows": {"type": "integer", "description": "Return at most this many rows (optional)"}
                 },
                 "required": ["spreadsheetId", "range"]
             }
@@ -154,7 +227,8 @@ async def list_tools() -> list[Tool]:
                         }
                     },
                     "mode": {"type": "string", "enum": ["overwrite", "append"], "default": "overwrite"},
-                    "inputMode": {"type": "string", "enum": ["RAW", "USER_ENTERED"], "default": "USER_ENTERED"}
+                    "inputMode": {"type": "string", "enum": ["RAW", "USER_ENTERED"], "default": "USER_ENTERED"},
+                    "startRow": {"type": "integer", "description": "Resume a large write from this row index (see resumeFromRow)", "default": 0}
                 },
                 "required": ["spreadsheetId", "range", "values"]
             }
@@ -181,15 +255,18 @@ async def list_tools() -> list[Tool]:
                 }
             }
         )
-    ]
+    ])
 
 
 @app.call_tool()
 async def call_tool(name: str, arguments: Any) -> list[TextContent]:
     """Handle tool calls"""
+    # Output projection is shared by every tool and handled by the encoder
+    fields = arguments.pop('fields', None) if arguments else None
     
     # Ensure user is authenticated
-    if not gdocs.creds:
+    # Re-authenticate as well once the token has expired without being refreshed
+    if not gdocs.creds or not gdocs.creds.valid:
         gdocs.authenticate()
     
     try:
@@ -199,13 +276,25 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
                 content=arguments.get('content', '')
             )
         elif name == "read-document":
-            result = gdocs.read_document(arguments['documentId'])
+            result = gdocs.read_document(
+                document_id=arguments['documentId'],
+                max_chars=arguments.get('maxChars'),
+                start_paragraph=arguments.get('startParagraph', 0),
+                end_paragraph=arguments.get('endParagraph'),
+                start_offset=arguments.get('startOffset', 0)
+            )
         elif name == "update-document":
             result = gdocs.update_document(
                 document_id=arguments['documentId'],
                 content=arguments['content'],
                 mode=arguments.get('mode', 'append')
             )
+        elif name == "lookup-file":
+            result = gdocs.lookup_file(
+                title=arguments['title'],
+                file_type=arguments.get('type'),
+                exact=arguments.get('exact', True)
+            )
         elif name == "search-documents":
             result = gdocs.search_documents(
                 query=arguments['query'],
@@ -224,7 +313,12 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
         elif name == "read-sheet":
             result = gdocs.read_sheet(
                 spreadsheet_id=arguments['spreadsheetId'],
-                range_a1=arguments['range']
+                range_a1=arguments['range'],
+                output=arguments.get('output', 'rows'),
+                columns=arguments.get('columns'),
+                filters=arguments.get('filters'),
+                header=arguments.get('header', True),
+                max_rows=arguments.get('maxRows')
             )
         elif name == "update-sheet":
             result = gdocs.update_sheet(
@@ -232,7 +326,8 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
                 range_a1=arguments['range'],
                 values=arguments['values'],
                 mode=arguments.get('mode', 'overwrite'),
-                input_mode=arguments.get('inputMode', 'USER_ENTERED')
+                input_mode=arguments.get('inputMode', 'USER_ENTERED'),
+                start_row=arguments.get('startRow', 0)
             )
         elif name == "search-sheets":
             result = gdocs.search_sheets(
@@ -248,13 +343,13 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
         
         return [TextContent(
             type="text",
-            text=json.dumps(result, indent=2)
+            text=encode_result(result, fields=fields, max_chars=TOOL_OUTPUT_BUDGETS.get(name))
         )]
     
     except Exception as e:
         return [TextContent(
             type="text",
-            text=json.dumps({"error": str(e)}, indent=2)
+            text=encode_error(e)
         )]
 
 
@@ -1,21 +1,24 @@
 import asyncio
-import json
 from typing import Any
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
+from app.mcp.common.tool_output import add_output_options, encode_error, encode_result
 from app.mcp.slack_mcp.server import SlackService
     
 # Initialize MCP server and Slack service
 app = Server("slack-mcp")
 slack = SlackService()
 
+# Per-tool output budgets (characters); other tools use the shared default
+TOOL_OUTPUT_BUDGETS = {"get-channel-history": 30000, "get-thread-replies": 30000}
+
 
 @app.list_tools()
 async def list_tools() -> list[Tool]:
     """List available Slack tools - all operations use user token (xoxp-)"""
-    return [
+    return add_output_options([
         Tool(
             name="send-message",
             description="Send a message as the authenticated user to a Slack channel or user",
@@ -385,12 +388,14 @@ async def list_tools() -> list[Tool]:
                 "required": ["channel", "purpose"]
             }
         )
-    ]
+    ])
 
 
 @app.call_tool()
 async def call_tool(name: str, arguments: Any) -> list[TextContent]:
     """Handle tool calls - all operations use user token"""
+    # Output projection is shared by every tool and handled by the encoder
+    fields = arguments.pop('fields', None) if arguments else None
     
     # Ensure user is authenticated
     if not slack.client:
@@ -500,13 +505,13 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
         
         return [TextContent(
             type="text",
-            text=json.dumps(result, indent=2)
+            text=encode_result(result, fields=fields, max_chars=TOOL_OUTPUT_BUDGETS.get(name))
         )]
     
     except Exception as e:
         return [TextContent(
             type="text",
-            text=json.dumps({"error": str(e)}, indent=2)
+            text=encode_error(e)
         )]
 
 
@@ -0,0 +1,44 @@
+import logging
+from typing import Any
+
+from mcp_use.client.middleware import Middleware, MiddlewareContext, NextFunctionT
+
+from app.core.telemetry import span
+
+logger = logging.getLogger(__name__)
+
+
+def connector_ids(config: dict) -> dict[str, str]:
+    """Map mcp_use connector identifiers back to the server names in the config."""
+    ids = {}
+    for name, server in config.get("mcpServers", {}).items():
+        if "command" in server:
+            ids[f"stdio:{server['command']} {' '.join(server.get('args', []))}"] = name
+        elif "url" in server:
+            ids[server["url"]] = name
+    return ids
+
+
+class TracingMiddleware(Middleware):
+    """Record a span for every MCP tool call, labelled with server and tool."""
+
+    def __init__(self, server_names: dict[str, str]):
+        self.server_names = server_names
+
+    def _server(self, context: MiddlewareContext) -> str:
+        connection_id = context.connection_id
+        if connection_id in self.server_names:
+            return self.server_names[connection_id]
+        # HTTP connectors identify themselves with a prefix before the URL
+        return next((name for key, name in self.server_names.items() if key in connection_id), connection_id)
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: NextFunctionT) -> Any:
+        with span("mcp.tool_call", server=self._server(context), tool=context.params.name) as current:
+            result = await call_next(context)
+            if getattr(result, "isError", False):
+                current.set_attribute("status", "error")
+            return result
+
+    async def on_list_tools(self, context: MiddlewareContext, call_next: NextFunctionT) -> Any:
+        with span("mcp.list_tools", server=self._server(context)):
+            return await call_next(context)
@@ -1,10 +1,15 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
+import json
+from functools import cached_property
+from app.ai.llm import chat_model
 from app.api.schemas.mcp_schema import ExpanderResponseSchema
 from app.core.config import settings
 from app.core.logger import get_logger
+from app.core.telemetry import span
+from app.services.usage_service import tag_usage
 
 from app.mcp.client import get_mcp_client
-from app.mcp.agent import MCPAgent
+from app.mcp.agent import get_agent_for_tool_type
+from app.mcp.direct_dispatch import try_direct_dispatch
 
 logger = get_logger(__name__)
 
@@ -15,24 +20,49 @@ class ExecutionAgentService:
             raise ValueError("GOOGLE_API_KEY is not set in the configuration.")
         self.api_key = api_key
 
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
+    @cached_property
+    def llm(self):
+        # Built on first use; the service is created when agent_router is imported
+        return chat_model(
+            "gemini-2.5-flash",
             temperature=0,
             max_tokens=None,
             timeout=500,
             max_retries=4,
         )
-        
 
     async def run_agent(self, messageRequest: ExpanderResponseSchema, userprompt: str|None):
         """
         Run the agent using ChatGoogleGenerativeAI.bind_tools().
+
+        Payloads that fully specify a single tool call (see app.mcp.direct_dispatch)
+        are sent straight to the MCP tool unless there is a user instruction to
+        apply; everything else goes through the agent.
         """
 
+        tag_usage(agent="execution")
         client = await get_mcp_client()
         if client is not None:
-            llm = self.llm
-            agent = MCPAgent(llm=llm, client=client)
+            if settings.MCP_DIRECT_DISPATCH:
+                try:
+                    dispatched = await try_direct_dispatch(
+                        client, messageRequest.toolType, messageRequest.response, user_prompt=userprompt
+                    )
+                except Exception as e:
+                    # Raised before the tool was called, so the agent cannot repeat a side effect
+                    logger.warning(f"Direct dispatch failed, falling back to the agent: {e}")
+                    dispatched = None
+                if dispatched is not None:
+                    result = dispatched["result"]
+                    if isinstance(result, dict) and "error" in result:
+                        message = f"{dispatched['tool']} failed: {result['error']}"
+                    else:
+                        message = result if isinstance(result, str) else json.dumps(result)
+                    logger.info(message)
+                    return {"message": message, "mode": "direct", "tool": dispatched["tool"]}
+
+            # Only expose the servers/tools this toolType needs
+            agent = await get_agent_for_tool_type(client, messageRequest.toolType, llm=self.llm)
 
             # Construct a detailed prompt from the messageRequest object
             context_prompt = (
@@ -49,10 +79,22 @@ class ExecutionAgentService:
                 full_prompt = context_prompt
 
             # Pass the combined and detailed prompt to the agent
-            result = await agent.run(full_prompt)
+            with span("agent.run", agent="execution"):
+                result = await agent.run(full_prompt, manage_connector=False)
             
-            logger.info(result)
+            logger.info("Execution agent result", extra={"result": result})
             return {"message": result}
 
         else:
-            return {"message": "don't have tools!"}
\ No newline at end of file
+            return {"message": "don't have tools!"}
+
+
+# --- Shared instance: its llm (and so the cached route agents) is reused across requests ---
+_service_instance: ExecutionAgentService | None = None
+
+def get_execution_agent_service() -> ExecutionAgentService:
+    """Return the process-wide ExecutionAgentService, creating it on first use."""
+    global _service_instance
+    if _service_instance is None:
+        _service_instance = ExecutionAgentService()
+    return _service_instance
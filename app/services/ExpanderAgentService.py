@@ -1,23 +1,32 @@
 import json
-from langchain_google_genai import ChatGoogleGenerativeAI
+from functools import lru_cache
+from app.ai.llm import chat_model
 from app.api.schemas.mcp_schema import ExpanderResponseSchema
 
 from app.core.logger import get_logger
+from app.core.telemetry import span
+from app.services.usage_service import tag_usage
 from typing import Tuple
 
 
 logging = get_logger(__name__)
 
-agent = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash",
-    temperature=0,
-    max_tokens=None,
-    timeout=300,
-    max_retries=2,
-)
+
+@lru_cache(maxsize=None)
+def _agent():
+    """The expander's chat model, built on first use rather than at import."""
+    return chat_model(
+        "gemini-2.5-flash",
+        temperature=0,
+        max_tokens=None,
+        timeout=300,
+        max_retries=2,
+    )
+
 
 async def run_expander_agent(task: str) -> Tuple[ExpanderResponseSchema, str]:
     logging.info("Running expander agent with task")
+    tag_usage(agent="expander")
     system_prompt = (
         "You are a helpful AI assistant. Review the incoming tasks and determine if each can be handled by the available tools: [create_notion_page, create_google_doc, create_google_sheet, create_google_calendar, create_gmail, create_slack_message].\n"
         "Tools and expected types: \n"
@@ -54,11 +63,12 @@ async def run_expander_agent(task: str) -> Tuple[ExpanderResponseSchema, str]:
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": task}
     ]
-    logging.info(f"Expander Agent Message: {messages}")
+    # The system prompt is static; only the task varies per call
+    logging.debug("Expander Agent task", extra={"task": task})
 
-    response = await agent.ainvoke(messages)
+    response = await _agent().ainvoke(messages)
     output = getattr(response, "content")
-    logging.info(f"Expander Agent Output no dict: {output}, Task expander: {task}")
+    logging.debug("Expander Agent raw output", extra={"output": output, "task": task})
 
     # Remove code block markers if present
     cleaned = output.strip()
@@ -71,10 +81,11 @@ async def run_expander_agent(task: str) -> Tuple[ExpanderResponseSchema, str]:
 
     # Try to parse as JSON
     try:
-        parsed = json.loads(cleaned)
+        with span("json.parse", chars=len(cleaned)):
+            parsed = json.loads(cleaned)
     except Exception as e:
-        logging.error(f"Failed to parse LLM output as JSON: {e}, output: {cleaned}")
+        logging.error(f"Failed to parse LLM output as JSON: {e}", extra={"output": cleaned})
         raise
 
-    logging.info(f"Expander Agent Output (parsed): {parsed}, Task expander: {task}")
+    logging.info("Expander Agent output (parsed)", extra={"output": parsed, "task": task})
     return parsed, task
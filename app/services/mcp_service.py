@@ -1,17 +1,59 @@
 import logging
 import asyncio
+import json
 import time
+from typing import Optional
 from app.api.schemas.mcp_schema import (
     ChatRequest, ChatResponse,
 )
 from app.mcp.client import get_mcp_client
-from app.mcp.agent import get_or_create_agent
-from langchain_google_genai import ChatGoogleGenerativeAI
+from app.mcp.agent import get_agent_for_tool_type
+from app.core.telemetry import span
+from app.services.usage_service import tag_usage
+from mcp_use import MCPClient
+from app.ai.llm import chat_model
 
 logger = logging.getLogger(__name__)
 
-def _build_instruction(request: ChatRequest) -> str:
-    """Construct an instruction string for the MCP agent based on request.type."""
+DOC_TYPES = {"google-docs", "google-doc", "gdoc", "doc"}
+SHEET_TYPES = {"google-sheets", "google-sheet", "gsheet", "sheet"}
+DOC_SHEET_SERVER = "google-doc-sheet"
+LOOKUP_TIMEOUT_SECONDS = 10
+
+
+async def _lookup_existing(client: MCPClient, request: ChatRequest) -> Optional[dict]:
+    """Resolve a Doc/Sheet title to an existing file via the server's Drive index.
+
+    Returns {"found": bool, "file": {...}} or None when the lookup is not
+    applicable or fails, in which case the agent searches on its own.
+    """
+    t = (request.type or "").lower()
+    file_type = "document" if t in DOC_TYPES else "spreadsheet" if t in SHEET_TYPES else None
+    if file_type is None:
+        return None
+    try:
+        session = client.get_session(DOC_SHEET_SERVER)
+        result = await asyncio.wait_for(
+            session.call_tool("lookup-file", {"title": request.title, "type": file_type}),
+            timeout=LOOKUP_TIMEOUT_SECONDS,
+        )
+        payload = json.loads(result.content[0].text)
+    except Exception as e:
+        logger.warning(f"Title lookup failed, leaving it to the agent: {e}")
+        return None
+    if "error" in payload:
+        logger.warning(f"Title lookup failed, leaving it to the agent: {payload['error']}")
+        return None
+    files = payload.get("files", [])
+    return {"found": bool(files), "file": files[0] if files else None}
+
+
+def _build_instruction(request: ChatRequest, existing: Optional[dict] = None) -> str:
+    """Construct an instruction string for the MCP agent based on request.type.
+
+    ``existing`` is the result of `_lookup_existing`; when present the agent is
+    told whether to update or create instead of searching Drive itself.
+    """
     t = (request.type or "").lower()
     title = request.title
     contents = request.contents
@@ -24,7 +66,24 @@ def _build_instruction(request: ChatRequest) -> str:
             "Use the available Notion tools to perform this. If a page with the given title exists, update it; otherwise create it. "
             "Return ONLY the newly created or updated Notion page URL/link in your final answer."
         )
-    elif t in {"google-docs", "google-doc", "gdoc", "doc"}:
+    elif t in DOC_TYPES and existing is not None:
+        if existing["found"]:
+            return (
+                f"Task: Update an existing Google Doc.\n"
+                f"Title: {title}\n"
+                f"Document ID: {existing['file']['id']}\n"
+                f"Contents: {contents}\n\n"
+                "The document already exists; do not search for it. Append the contents with update-document using this document ID. "
+                "Return ONLY the Google Doc URL in your final answer."
+            )
+        return (
+            f"Task: Create a Google Doc.\n"
+            f"Title: {title}\n"
+            f"Contents: {contents}\n\n"
+            "No document with this title exists; do not search for it. Create it with create-document, including the contents. "
+            "Return ONLY the Google Doc URL in your final answer."
+        )
+    elif t in DOC_TYPES:
         return (
             f"Task: Create or update a Google Doc.\n"
             f"Title: {title}\n"
@@ -33,7 +92,29 @@ def _build_instruction(request: ChatRequest) -> str:
             "otherwise create a new document with that title and insert the contents. "
             "Return ONLY the Google Doc URL in your final answer."
         )
-    elif t in {"google-sheets", "google-sheet", "gsheet", "sheet"}:
+    elif t in SHEET_TYPES and existing is not None:
+        table_hint = (
+            "If contents describe a table, parse it into rows and write starting at A1; if it's plain text, write it to A1. "
+        )
+        if existing["found"]:
+            return (
+                f"Task: Update an existing Google Sheet.\n"
+                f"Title: {title}\n"
+                f"Spreadsheet ID: {existing['file']['id']}\n"
+                f"Contents: {contents}\n\n"
+                "The spreadsheet already exists; do not search for it. Update its first sheet with update-sheet using this spreadsheet ID. "
+                + table_hint +
+                "Return ONLY the spreadsheet URL in your final answer."
+            )
+        return (
+            f"Task: Create a Google Sheet.\n"
+            f"Title: {title}\n"
+            f"Contents: {contents}\n\n"
+            "No spreadsheet with this title exists; do not search for it. Create it with create-sheet. "
+            + table_hint +
+            "Return ONLY the spreadsheet URL in your final answer."
+        )
+    elif t in SHEET_TYPES:
         return (
             f"Task: Create or update a Google Sheet.\n"
             f"Title: {title}\n"
@@ -59,6 +140,7 @@ async def process_chat_request_non_stream(request: ChatRequest, timeout_seconds:
 
     # Build an instruction tailored to the requested provider
     usable_request = _build_instruction(request)
+    tag_usage(agent="mcp")
     try:
         # Treat enable_notion as a general "enable MCP" flag for all providers
         supported = {"notion", "notion-page", "notion_doc", "google-docs", "google-doc", "gdoc", "doc", "google-sheets", "google-sheet", "gsheet", "sheet"}
@@ -66,10 +148,16 @@ async def process_chat_request_non_stream(request: ChatRequest, timeout_seconds:
         if use_mcp:
             logger.info("🧠 Starting full MCP agent mode (non-stream)...")
             client = await get_mcp_client()
-            agent = get_or_create_agent(client)
+            # Only expose the servers/tools this request type needs
+            agent = await get_agent_for_tool_type(client, request.type)
+            # Resolve Doc/Sheet titles up front so the agent skips its own Drive search
+            existing = await _lookup_existing(client, request)
+            if existing is not None:
+                usable_request = _build_instruction(request, existing)
 
             async def _run():
-                return await agent.run(usable_request)
+                with span("agent.run", agent="mcp"):
+                    return await agent.run(usable_request, manage_connector=False)
 
             # Guard against indefinite hangs
             final_answer = await asyncio.wait_for(_run(), timeout=timeout_seconds)
@@ -80,8 +168,8 @@ async def process_chat_request_non_stream(request: ChatRequest, timeout_seconds:
             return ChatResponse(answer=str(final_answer or ""), mode="mcp_agent", latency_ms=latency_ms)
         else:
             logger.info("💬 Using basic LLM mode (non-stream)")
-            llm = ChatGoogleGenerativeAI(
-                model="gemini-2.5-flash",
+            llm = chat_model(
+                "gemini-2.5-flash",
                 temperature=0.7,
             )
             response = await llm.ainvoke(usable_request)
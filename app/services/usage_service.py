@@ -0,0 +1,181 @@
+"""
+LLM token and cost accounting per agent, model and caller.
+
+Every LLM call seen by `app.ai.callbacks` is added to in-memory aggregates
+keyed by (agent, model, user). A background task writes the aggregates
+collected since the previous flush to the usage table in one batched insert,
+so the request path never waits on the database.
+"""
+
+import asyncio
+import logging
+import threading
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from app.core.config import settings
+from app.infrastructure.database.repository import Repository
+
+logger = logging.getLogger(__name__)
+
+# USD per 1M tokens as (input, output); models not listed are counted at zero cost
+MODEL_PRICES: dict[str, tuple[float, float]] = {
+    "gemini-2.5-flash": (0.30, 2.50),
+    "sonar": (1.00, 1.00),
+}
+UNKNOWN_AGENT = "unknown"
+ANONYMOUS_USER = "anonymous"
+GROUP_FIELDS = ("agent", "model", "user")
+
+# Tags (agent, user) for LLM calls made in the current request
+_usage_tags: ContextVar[dict] = ContextVar("usage_tags", default={})
+
+
+def tag_usage(**tags: str) -> None:
+    """Attribute the LLM calls made from here on in this request, e.g. tag_usage(agent="expander")."""
+    _usage_tags.set({**_usage_tags.get(), **tags})
+
+
+def cost_of(model: str, input_tokens: int, output_tokens: int) -> float:
+    input_price, output_price = MODEL_PRICES.get(model, (0.0, 0.0))
+    return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _add(bucket: dict, key: tuple, input_tokens: int, output_tokens: int, cost: float) -> None:
+    entry = bucket.get(key)
+    if entry is None:
+        entry = bucket[key] = [0, 0, 0, 0.0]
+    entry[0] += 1
+    entry[1] += input_tokens
+    entry[2] += output_tokens
+    entry[3] += cost
+
+
+class UsageLedger:
+    """In-memory usage aggregates with periodic batched flushes to the database."""
+
+    def __init__(self, table: str, flush_interval: float):
+        self.repository = Repository(table)
+        self.flush_interval = flush_interval
+        self.started_at = _now()
+        self._lock = threading.Lock()
+        # (agent, model, user) -> [calls, input_tokens, output_tokens, cost_usd]
+        self._totals: dict[tuple, list] = {}
+        self._pending: dict[tuple, list] = {}
+        self._window_start = self.started_at
+        # Spend per user for the current UTC day, for budget checks
+        self._day = self.started_at.date()
+        self._daily: dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, model: str, input_tokens: int, output_tokens: int) -> None:
+        # Gemini reports models as "models/gemini-2.5-flash"
+        model = model.rsplit("/", 1)[-1]
+        tags = _usage_tags.get()
+        user = tags.get("user") or ANONYMOUS_USER
+        key = (tags.get("agent") or UNKNOWN_AGENT, model, user)
+        cost = cost_of(model, input_tokens, output_tokens)
+        today = _now().date()
+        with self._lock:
+            _add(self._totals, key, input_tokens, output_tokens, cost)
+            _add(self._pending, key, input_tokens, output_tokens, cost)
+            if today != self._day:
+                self._day = today
+                self._daily.clear()
+            self._daily[user] = self._daily.get(user, 0.0) + cost
+
+    def spent_today(self, user: str) -> float:
+        with self._lock:
+            return self._daily.get(user, 0.0) if self._day == _now().date() else 0.0
+
+    def summary(self, group_by: Iterable[str] = GROUP_FIELDS, user: Optional[str] = None) -> list[dict]:
+        """Totals since process start, grouped by any of agent/model/user, most expensive first."""
+        indexes = [GROUP_FIELDS.index(field) for field in group_by]
+        groups: dict[tuple, list] = {}
+        with self._lock:
+            items = list(self._totals.items())
+        for key, (calls, input_tokens, output_tokens, cost) in items:
+            if user is not None and key[2] != user:
+                continue
+            group = tuple(key[i] for i in indexes)
+            entry = groups.setdefault(group, [0, 0, 0, 0.0])
+            entry[0] += calls
+            entry[1] += input_tokens
+            entry[2] += output_tokens
+            entry[3] += cost
+        rows = [
+            {
+                **{GROUP_FIELDS[i]: value for i, value in zip(indexes, group)},
+                "calls": calls,
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "cost_usd": round(cost, 6),
+            }
+            for group, (calls, input_tokens, output_tokens, cost) in groups.items()
+        ]
+        return sorted(rows, key=lambda row: row["cost_usd"], reverse=True)
+
+    def flush(self) -> int:
+        """Write the usage collected since the last flush; on failure it is kept for the next one."""
+        window_end = _now()
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            window_start, self._window_start = self._window_start, window_end
+        if not pending:
+            return 0
+        rows = [
+            {
+                "window_start": window_start,
+                "window_end": window_end,
+                "agent_name": agent,
+                "model": model,
+                "user_id": user,
+                "calls": calls,
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "cost_usd": round(cost, 6),
+            }
+            for (agent, model, user), (calls, input_tokens, output_tokens, cost) in pending.items()
+        ]
+        try:
+            return self.repository.create_many(rows)
+        except Exception as e:
+            logger.warning(f"⚠️ Usage flush failed, retrying next interval: {e}")
+            with self._lock:
+                for key, (calls, input_tokens, output_tokens, cost) in pending.items():
+                    entry = self._pending.setdefault(key, [0, 0, 0, 0.0])
+                    entry[0] += calls
+                    entry[1] += input_tokens
+                    entry[2] += output_tokens
+                    entry[3] += cost
+                self._window_start = window_start
+            return 0
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            written = await asyncio.to_thread(self.flush)
+            if written:
+                logger.info(f"📊 Flushed {written} usage rows")
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.to_thread(self.flush)
+
+
+usage_ledger = UsageLedger(settings.USAGE_TABLE, settings.USAGE_FLUSH_INTERVAL)
@@ -0,0 +1,222 @@
+"""
+Replay benchmark for the agent endpoints, fully offline.
+
+Recorded request bodies are replayed in-process against the FastAPI app
+(httpx ASGITransport), with Gemini/Perplexity, DuckDuckGo and the MCP servers
+replaced by the app's fakes (FAKE_LLM / FAKE_MCP) that sleep for a sampled
+latency.
+Each agent is run as its own phase and reported with throughput, latency
+percentiles and event-loop lag, so blocking calls on the loop show up as lag.
+
+Usage (from the repository root):
+
+    python -m benchmarks.replay examples/*.request.json \\
+        --requests 200 --concurrency 16 --llm-latency lognormal:0.8,0.4
+
+A recording is either a request body (endpoint inferred: `agent_name` ->
+/ai/invoke, `tasks` -> /agent/expander-agent/) or {"path": ..., "body": ...};
+`.jsonl` files hold one recording per line.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional
+
+# Settings that must exist for the app to import; the fakes never use them
+PLACEHOLDER_ENV = {
+    "GOOGLE_API_KEY": "benchmark",
+    "PPLX_API_KEY": "benchmark",
+    "GOOGLE_CREDENTIALS_PATH": "benchmark-credentials.json",
+    "GOOGLE_TOKEN_PATH": "benchmark-token.json",
+    "DB_DATABASE": "benchmark",
+    "DB_USERNAME": "benchmark",
+    "DB_PASSWORD": "benchmark",
+    "SLACK_BOT_TOKEN": "benchmark",
+}
+LAG_INTERVAL = 0.01
+
+
+# --- Recordings ---
+
+def _recording(item: dict) -> tuple[str, str, dict]:
+    """Return (phase label, path, body) for one recorded request."""
+    if "path" in item and "body" in item:
+        path, body = item["path"], item["body"]
+    elif "agent_name" in item:
+        path, body = "/ai/invoke", item
+    elif "tasks" in item:
+        path, body = "/agent/expander-agent/", item
+    else:
+        raise ValueError(f"Cannot infer the endpoint for recording with keys {sorted(item)}")
+    label = body.get("agent_name") if path == "/ai/invoke" else path.strip("/").replace("/", ":")
+    return label or path, path, body
+
+
+def load_recordings(paths: list[str]) -> dict[str, list[tuple[str, dict]]]:
+    phases: dict[str, list[tuple[str, dict]]] = defaultdict(list)
+    for path in paths:
+        text = Path(path).read_text(encoding="utf-8")
+        items = [json.loads(line) for line in text.splitlines() if line.strip()] if path.endswith(".jsonl") else [json.loads(text)]
+        for item in items:
+            label, endpoint, body = _recording(item)
+            phases[label].append((endpoint, body))
+    return dict(phases)
+
+
+# --- Fakes ---
+
+def configure_fakes(args: argparse.Namespace):
+    """Select the offline stand-ins through the app's settings, then import and return the ASGI app."""
+    for key, value in PLACEHOLDER_ENV.items():
+        os.environ.setdefault(key, value)
+    os.environ.update({
+        "FAKE_LLM": "true",
+        "FAKE_LLM_LATENCY": args.llm_latency,
+        "FAKE_SEARCH_LATENCY": args.search_latency,
+        "FAKE_MCP": "true",
+        "FAKE_MCP_LATENCY": args.mcp_latency,
+    })
+
+    from app.main import app as asgi_app
+    return asgi_app
+
+
+# --- Measurement ---
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    # Nearest-rank percentile
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+class LoopLagMonitor:
+    """Samples how late the event loop wakes a sleeping task; blocking calls show up as lag."""
+
+    def __init__(self, interval: float = LAG_INTERVAL):
+        self.interval = interval
+        self.samples: list[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - started - self.interval))
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+async def run_phase(client, recordings: list[tuple[str, dict]], requests: int, concurrency: int, warmup: int) -> dict:
+    for i in range(warmup):
+        path, body = recordings[i % len(recordings)]
+        await client.post(path, json=body)
+
+    latencies: list[float] = []
+    errors = 0
+    next_index = 0
+    monitor = LoopLagMonitor()
+
+    async def worker() -> None:
+        nonlocal next_index, errors
+        while next_index < requests:
+            path, body = recordings[next_index % len(recordings)]
+            next_index += 1
+            started = time.perf_counter()
+            try:
+                response = await client.post(path, json=body)
+                failed = response.status_code >= 400
+            except Exception:
+                failed = True
+            latencies.append(time.perf_counter() - started)
+            errors += failed
+
+    monitor.start()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    await monitor.stop()
+
+    lag = monitor.samples
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {f"p{q}": round(percentile(latencies, q) * 1000, 1) for q in (50, 95, 99)},
+        "loop_lag_ms": {
+            **{f"p{q}": round(percentile(lag, q) * 1000, 1) for q in (50, 95, 99)},
+            "max": round(max(lag, default=0.0) * 1000, 1),
+        },
+    }
+
+
+def print_report(results: dict[str, dict]) -> None:
+    header = f"{'agent':<24}{'reqs':>6}{'errs':>6}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'lag p99':>9}{'lag max':>9}"
+    print(header)
+    print("-" * len(header))
+    for label, r in results.items():
+        print(
+            f"{label:<24}{r['requests']:>6}{r['errors']:>6}{r['throughput_rps']:>9.1f}"
+            f"{r['latency_ms']['p50']:>9.1f}{r['latency_ms']['p95']:>9.1f}{r['latency_ms']['p99']:>9.1f}"
+            f"{r['loop_lag_ms']['p99']:>9.1f}{r['loop_lag_ms']['max']:>9.1f}"
+        )
+
+
+async def main(args: argparse.Namespace) -> dict[str, dict]:
+    import httpx
+
+    phases = load_recordings(args.recordings)
+    if args.agent:
+        phases = {label: recs for label, recs in phases.items() if label in args.agent}
+    asgi_app = configure_fakes(args)
+
+    results: dict[str, dict] = {}
+    transport = httpx.ASGITransport(app=asgi_app)
+    # ASGITransport skips lifespan events; run startup/shutdown (fake MCP servers) explicitly
+    async with asgi_app.router.lifespan_context(asgi_app), \
+            httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        for label, recordings in phases.items():
+            print(f"Running {label}: {args.requests} requests, concurrency {args.concurrency}", file=sys.stderr)
+            results[label] = await run_phase(client, recordings, args.requests, args.concurrency, args.warmup)
+    return results
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("recordings", nargs="+", help="Recorded request bodies (.json) or recordings (.jsonl)")
+    parser.add_argument("--requests", type=int, default=100, help="Measured requests per agent")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight per agent")
+    parser.add_argument("--warmup", type=int, default=3, help="Unmeasured requests before each phase")
+    parser.add_argument("--agent", action="append", help="Only run these agents (repeatable)")
+    parser.add_argument("--llm-latency", default="lognormal:0.8,0.4", help="Fake LLM latency distribution")
+    parser.add_argument("--mcp-latency", default="uniform:0.05,0.3", help="Fake MCP tool latency distribution")
+    parser.add_argument("--search-latency", default="uniform:0.2,0.6", help="Fake web search latency distribution")
+    parser.add_argument("--json", dest="json_path", help="Also write the results as JSON to this path")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    report = asyncio.run(main(arguments))
+    print_report(report)
+    if arguments.json_path:
+        Path(arguments.json_path).write_text(json.dumps(report, indent=2), encoding="utf-8")
@@ -0,0 +1,181 @@
+"""
+Cold-start benchmark for the API and the MCP stdio servers.
+
+Every run is a fresh interpreter, so nothing is warm in `sys.modules`:
+
+- `import`: `python -X importtime -c "import <module>"` for `app.main` and for
+  each MCP server module; wall time of the whole process plus the import time
+  reported by CPython, and the packages that account for most of it.
+- `handshake` (MCP servers only): spawn the server over stdio the way the app
+  does and time until `initialize` and `tools/list` have answered.
+
+Usage (from the repository root):
+
+    python -m benchmarks.startup --runs 5 --top 15
+    python -m benchmarks.startup --server gmail-mcp --json startup.json
+
+Servers come from `app/mcp/config/mcp_config.json`; only their `-m` module is
+used, with the current interpreter as the command.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+from benchmarks.replay import PLACEHOLDER_ENV, percentile
+
+ROOT = Path(__file__).resolve().parent.parent
+MCP_CONFIG = ROOT / "app" / "mcp" / "config" / "mcp_config.json"
+API_MODULE = "app.main"
+
+
+def _env() -> dict[str, str]:
+    # Placeholders only fill settings that are missing; a real .env / environment wins
+    return {**PLACEHOLDER_ENV, **os.environ, "PYTHONPATH": str(ROOT)}
+
+
+def mcp_servers(config_path: Path = MCP_CONFIG) -> dict[str, str]:
+    """Map server name -> module for every `python -m <module>` server in the MCP config."""
+    servers = json.loads(config_path.read_text(encoding="utf-8")).get("mcpServers", {})
+    modules = {}
+    for name, server in servers.items():
+        args = server.get("args", [])
+        if "-m" in args and args.index("-m") + 1 < len(args):
+            modules[name] = args[args.index("-m") + 1]
+    return modules
+
+
+# --- Measurement ---
+
+def parse_importtime(stderr: str) -> tuple[float, Counter]:
+    """Total import time (ms) and self time (ms) per top-level package from `-X importtime` output."""
+    total = 0.0
+    packages: Counter = Counter()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # column header
+        # Nested imports are indented by two spaces per level after the separator's space
+        module = module.rstrip()[1:]
+        packages[module.strip().split(".")[0]] += int(self_us) / 1000
+        # Top-level imports' cumulative times add up to the total
+        if not module.startswith(" "):
+            total += int(cumulative_us) / 1000
+    return total, packages
+
+
+def measure_import(module: str) -> dict:
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=_env(), capture_output=True, text=True,
+    )
+    wall = (time.perf_counter() - started) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr.strip().splitlines()[-1]}")
+    total, packages = parse_importtime(proc.stderr)
+    return {"wall_ms": wall, "import_ms": total, "packages": packages}
+
+
+async def measure_handshake(module: str, timeout: float) -> dict:
+    """Time from spawning the server to answered `initialize` and `tools/list` requests."""
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    params = StdioServerParameters(command=sys.executable, args=["-m", module], env=_env(), cwd=str(ROOT))
+    started = time.perf_counter()
+    async with stdio_client(params) as (read, write), ClientSession(read, write) as session:
+        await asyncio.wait_for(session.initialize(), timeout)
+        initialized = time.perf_counter()
+        tools = await asyncio.wait_for(session.list_tools(), timeout)
+        listed = time.perf_counter()
+    return {
+        "initialize_ms": (initialized - started) * 1000,
+        "tools_ms": (listed - started) * 1000,
+        "tools": len(tools.tools),
+    }
+
+
+def _summary(values: list[float]) -> dict:
+    return {"p50": percentile(values, 50), "max": max(values) if values else 0.0}
+
+
+def benchmark(label: str, module: str, runs: int, top: int, handshake: bool, timeout: float) -> dict:
+    imports = [measure_import(module) for _ in range(runs)]
+    packages: Counter = Counter()
+    for run in imports:
+        packages.update(run["packages"])
+    result = {
+        "module": module,
+        "runs": runs,
+        "wall_ms": _summary([run["wall_ms"] for run in imports]),
+        "import_ms": _summary([run["import_ms"] for run in imports]),
+        # Mean self time per run, heaviest first
+        "packages_ms": {name: round(ms / runs, 1) for name, ms in packages.most_common(top)},
+    }
+    if handshake:
+        handshakes = [asyncio.run(measure_handshake(module, timeout)) for _ in range(runs)]
+        result["initialize_ms"] = _summary([h["initialize_ms"] for h in handshakes])
+        result["tools_ms"] = _summary([h["tools_ms"] for h in handshakes])
+        result["tools"] = handshakes[-1]["tools"]
+    print(f"Measured {label} ({module})", file=sys.stderr)
+    return result
+
+
+def print_report(results: dict[str, dict]) -> None:
+    header = f"{'target':<20}{'wall p50':>10}{'wall max':>10}{'import p50':>12}{'init p50':>10}{'tools p50':>11}{'tools':>7}"
+    print(header)
+    print("-" * len(header))
+    for label, r in results.items():
+        init = f"{r['initialize_ms']['p50']:>10.0f}" if "initialize_ms" in r else f"{'-':>10}"
+        tools = f"{r['tools_ms']['p50']:>11.0f}{r['tools']:>7}" if "tools_ms" in r else f"{'-':>11}{'-':>7}"
+        print(f"{label:<20}{r['wall_ms']['p50']:>10.0f}{r['wall_ms']['max']:>10.0f}{r['import_ms']['p50']:>12.0f}{init}{tools}")
+    for label, r in results.items():
+        print(f"\n{label}: heaviest packages (self import ms per run)")
+        for name, ms in r["packages_ms"].items():
+            print(f"  {name:<32}{ms:>8.1f}")
+
+
+def main(args: argparse.Namespace) -> dict[str, dict]:
+    servers = mcp_servers(Path(args.config))
+    if args.server:
+        unknown = set(args.server) - set(servers)
+        if unknown:
+            raise SystemExit(f"Unknown MCP server(s) {sorted(unknown)}; configured: {sorted(servers)}")
+        servers = {name: servers[name] for name in args.server}
+    results: dict[str, dict] = {}
+    if not args.no_api:
+        results["api"] = benchmark("api", API_MODULE, args.runs, args.top, False, args.timeout)
+    for name, module in servers.items():
+        results[name] = benchmark(name, module, args.runs, args.top, not args.no_handshake, args.timeout)
+    return results
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes per target")
+    parser.add_argument("--top", type=int, default=15, help="Heaviest packages to list per target")
+    parser.add_argument("--server", action="append", help="Only these MCP servers (repeatable)")
+    parser.add_argument("--config", default=str(MCP_CONFIG), help="MCP config to read the servers from")
+    parser.add_argument("--no-api", action="store_true", help="Skip the API import")
+    parser.add_argument("--no-handshake", action="store_true", help="Only measure MCP server imports")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds to wait for each MCP request")
+    parser.add_argument("--json", dest="json_path", help="Also write the results as JSON to this path")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    report = main(arguments)
+    print_report(report)
+    if arguments.json_path:
+        Path(arguments.json_path).write_text(json.dumps(report, indent=2), encoding="utf-8")